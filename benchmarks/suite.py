@@ -0,0 +1,249 @@
+"""
+Набор бенчмарков хранилища, фильтров и загрузки на синтетических вакансиях.
+
+Запуск:
+    python -m benchmarks.suite --sizes 10000 100000 --output benchmarks/results.json
+    python -m benchmarks.suite --sizes 10000 --save-baseline        # сохранить базовую линию
+    python -m benchmarks.suite --sizes 10000 --threshold 1.3        # сравнить с базовой линией
+
+Код возврата 1 означает, что хотя бы один замер медленнее базовой линии больше чем в threshold раз.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.synthetic import generate_api_items, generate_raw_descriptions, generate_vacancies
+from src.api_handler import parse_vacancies
+from src.file_handler import JSONFileHandler
+from src.helpers import clean_html, clean_html_many
+from src.utils import sort_vacancies
+from src.vacancy import Vacancy
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+SINGLE_ADDS = 5  # add_vacancy переписывает файл целиком, поэтому замеряем несколько вызовов
+
+Case = Callable[[], Any]
+
+
+def measure(case: Case, setup: Optional[Callable[[], None]] = None, repeat: int = 3,
+            profile_memory: bool = True) -> Dict[str, float]:
+    """
+    Замеряет случай: лучшее время из repeat запусков и пиковое выделение памяти (отдельным запуском,
+    так как tracemalloc замедляет код).
+    :param case: Замеряемая функция.
+    :param setup: Подготовка перед каждым запуском (не входит во время).
+    :return: Словарь seconds и peak_bytes.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        case()
+        best = min(best, time.perf_counter() - started)
+
+    peak = 0
+    if profile_memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            case()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def storage_cases(size: int, directory: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Случаи для JSONFileHandler и сортировки на size вакансиях.
+    :return: Словарь имя случая -> {"case": функция, "setup": подготовка или None}.
+    """
+    vacancies = list(generate_vacancies(size))
+    ingest_file = directory / f"ingest-{size}.json"
+    store_file = directory / f"store-{size}.json"
+    JSONFileHandler(str(store_file)).add_vacancies([dict(v) for v in vacancies])
+    cleaned = JSONFileHandler(str(store_file)).filter_vacancies([])
+    extra = list(generate_vacancies(SINGLE_ADDS, seed=1))
+    for number, vacancy in enumerate(extra):
+        vacancy["id"] = f"extra-{number}"
+        vacancy["link"] = f"https://hh.ru/vacancy/extra{number}"
+    backup = directory / f"backup-{size}"
+    backup.mkdir()
+    for path in directory.glob(f"store-{size}.json*"):
+        shutil.copy2(path, backup / path.name)
+
+    def reset_ingest() -> None:
+        for path in directory.glob(f"ingest-{size}.json*"):
+            path.unlink()
+
+    def reset_store() -> None:
+        # copy2 сохраняет время изменения, поэтому файлы индексов остаются действительными
+        for path in backup.iterdir():
+            shutil.copy2(path, directory / path.name)
+
+    def add_single() -> None:
+        handler = JSONFileHandler(str(store_file))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for vacancy in extra:
+                handler.add_vacancy(dict(vacancy))
+
+    def delete_single() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            JSONFileHandler(str(store_file)).delete_vacancy(vacancies[size // 2]["id"])
+
+    return {
+        "bulk_ingest": {
+            "case": lambda: JSONFileHandler(str(ingest_file)).add_vacancies([dict(v) for v in vacancies]),
+            "setup": reset_ingest,
+        },
+        "add_vacancy": {"case": add_single, "setup": reset_store},
+        "delete_vacancy": {"case": delete_single, "setup": reset_store},
+        "filter_vacancies": {
+            "case": lambda: JSONFileHandler(str(store_file)).filter_vacancies(["python", "django"]),
+            "setup": None,
+        },
+        "filter_vacancies_by_salary": {
+            "case": lambda: JSONFileHandler(str(store_file)).filter_vacancies_by_salary((100000, 200000)),
+            "setup": None,
+        },
+        "sort_vacancies": {"case": lambda: sort_vacancies(cleaned), "setup": None},
+        "sort_vacancies_top20": {"case": lambda: sort_vacancies(cleaned, top_n=20), "setup": None},
+    }
+
+
+def text_cases(size: int) -> Dict[str, Dict[str, Any]]:
+    """Случаи для очистки HTML на size описаниях."""
+    descriptions = generate_raw_descriptions(size)
+    return {
+        "clean_html": {"case": lambda: [clean_html(text) for text in descriptions], "setup": None},
+        "clean_html_many": {"case": lambda: clean_html_many(descriptions), "setup": None},
+    }
+
+
+def vacancy_cases(size: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Случаи для построения Vacancy из size элементов ответа API: по одному объекту (описание очищается
+    второй раз в конструкторе) и пакетно через from_dicts и from_api_items.
+    """
+    items = generate_api_items(size)
+
+    def per_object() -> List[Dict[str, Any]]:
+        return [
+            Vacancy(record["title"], record["link"], record["salary"], record["description"], record["id"],
+                    salary_to=record.get("salary_to"), currency=record.get("currency"),
+                    gross=record.get("gross")).to_dict()
+            for record in parse_vacancies({"items": items})
+        ]
+
+    def from_dicts() -> List[Dict[str, Any]]:
+        vacancies, _ = Vacancy.from_dicts(parse_vacancies({"items": items}), clean=False)
+        return [vacancy.to_dict() for vacancy in vacancies]
+
+    def from_api_items() -> List[Dict[str, Any]]:
+        vacancies, _ = Vacancy.from_api_items(items)
+        return [vacancy.to_dict() for vacancy in vacancies]
+
+    return {
+        "vacancy_per_object": {"case": per_object, "setup": None},
+        "vacancy_from_dicts": {"case": from_dicts, "setup": None},
+        "vacancy_from_api_items": {"case": from_api_items, "setup": None},
+    }
+
+
+def run_suite(sizes: Sequence[int], cases: Optional[Sequence[str]] = None, repeat: int = 3,
+              profile_memory: bool = True) -> Dict[str, Any]:
+    """
+    Выполняет бенчмарки для каждого размера.
+    :param sizes: Числа вакансий.
+    :param cases: Имена случаев (None — все).
+    :return: Результаты в машиночитаемом виде: meta и список results.
+    """
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            all_cases = {**storage_cases(size, Path(tmp)), **text_cases(size), **vacancy_cases(size)}
+            for name, spec in all_cases.items():
+                if cases is not None and name not in cases:
+                    continue
+                measured = measure(spec["case"], spec["setup"], repeat, profile_memory)
+                results.append({"case": name, "size": size, **measured})
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 1.25) -> List[str]:
+    """
+    Сравнивает результаты с базовой линией.
+    :param threshold: Допустимое замедление (1.25 — на 25 %).
+    :return: Описания регрессий; пустой список, если их нет.
+    """
+    reference = {(item["case"], item["size"]): item for item in baseline.get("results", [])}
+    regressions = []
+    for item in results["results"]:
+        previous = reference.get((item["case"], item["size"]))
+        if previous is None or previous["seconds"] <= 0:
+            continue
+        ratio = item["seconds"] / previous["seconds"]
+        if ratio > threshold:
+            regressions.append(
+                f"{item['case']} (n={item['size']}): {previous['seconds']:.4f} с -> {item['seconds']:.4f} с "
+                f"(x{ratio:.2f})"
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки; возвращает код завершения."""
+    parser = argparse.ArgumentParser(description="Бенчмарки хранилища вакансий.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Числа вакансий.")
+    parser.add_argument("--cases", nargs="+", help="Запускать только эти случаи.")
+    parser.add_argument("--repeat", type=int, default=3, help="Число запусков для замера времени.")
+    parser.add_argument("--no-memory", action="store_true", help="Не замерять память (быстрее).")
+    parser.add_argument("--output", help="Файл для результатов в JSON.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Файл базовой линии.")
+    parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как базовую линию.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Допустимое замедление относительно базы.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.cases, args.repeat, not args.no_memory)
+    for item in results["results"]:
+        megabytes = item["peak_bytes"] / 2**20
+        print(f"{item['case']:<28} n={item['size']:<9} {item['seconds']:>10.4f} с {megabytes:>9.1f} МБ")
+
+    text = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    if args.save_baseline:
+        Path(args.baseline).write_text(text, encoding="utf-8")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.threshold)
+    for regression in regressions:
+        print(f"Регрессия: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
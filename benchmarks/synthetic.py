@@ -0,0 +1,106 @@
+import random
+from typing import Any, Dict, Iterator, List
+
+TITLES = [
+    "Python-разработчик",
+    "Backend-разработчик (Python/Django)",
+    "Аналитик данных",
+    "Инженер по тестированию",
+    "Java-разработчик",
+    "DevOps-инженер",
+    "Frontend-разработчик (React)",
+    "Системный администратор Linux",
+    "Data Scientist",
+    "Руководитель группы разработки",
+]
+
+SKILLS = [
+    "Python", "Django", "FastAPI", "PostgreSQL", "SQL", "Docker", "Kubernetes", "Linux", "Git", "Java",
+    "Spring", "React", "TypeScript", "Airflow", "Pandas", "ClickHouse", "Kafka", "Redis", "CI/CD", "REST API",
+]
+
+PHRASES = [
+    "Опыт коммерческой разработки от {years} лет",
+    "Уверенное знание {skill}",
+    "Опыт работы с {skill} и {skill2}",
+    "Понимание принципов ООП и паттернов проектирования",
+    "Готовность разбираться в чужом коде",
+    "Будет плюсом знание {skill}",
+    "Умение писать тесты и документацию",
+    "Высшее техническое образование",
+    "Удалённая работа или гибрид, офис в Москве",
+    "Английский язык на уровне чтения технической документации",
+]
+
+
+def _description(rng: random.Random, with_html: bool) -> str:
+    """Собирает описание вакансии из типичных фраз; часть ключевых слов подсвечена, как в ответах hh.ru."""
+    parts = []
+    for phrase in rng.sample(PHRASES, rng.randint(2, 5)):
+        skill, skill2 = rng.sample(SKILLS, 2)
+        if with_html:
+            skill = f"<highlighttext>{skill}</highlighttext>"
+        parts.append(phrase.format(years=rng.randint(1, 6), skill=skill, skill2=skill2))
+    if with_html and rng.random() < 0.3:
+        return "<p>" + "</p><p>".join(parts) + "</p>&nbsp;"
+    return ". ".join(parts) + "."
+
+
+def generate_vacancies(
+    count: int, seed: int = 0, missing_salary_share: float = 0.3, html_share: float = 0.5
+) -> Iterator[Dict[str, Any]]:
+    """
+    Генерирует синтетические вакансии в формате parse_vacancies.
+    Зарплаты распределены логнормально (медиана около 120 000 руб.) и округлены до тысяч.
+    :param count: Число вакансий.
+    :param seed: Зерно генератора: одинаковые параметры дают одинаковые данные.
+    :param missing_salary_share: Доля вакансий без зарплаты.
+    :param html_share: Доля описаний с HTML-разметкой и сущностями.
+    :return: Итератор словарей с полями id, title, link, salary, description.
+    """
+    rng = random.Random(seed)
+    for number in range(count):
+        vacancy_id = str(100_000_000 + number)
+        if rng.random() < missing_salary_share:
+            salary: Any = "Зарплата не указана"
+        else:
+            salary = round(rng.lognormvariate(11.7, 0.5), -3)
+        yield {
+            "id": vacancy_id,
+            "title": rng.choice(TITLES),
+            "link": f"https://hh.ru/vacancy/{vacancy_id}",
+            "salary": salary,
+            "description": _description(rng, rng.random() < html_share),
+        }
+
+
+def generate_raw_descriptions(count: int, seed: int = 0) -> List[str]:
+    """Описания с HTML-разметкой, как поле snippet.requirement ответа API."""
+    rng = random.Random(seed)
+    return [_description(rng, True) for _ in range(count)]
+
+
+def generate_api_items(count: int, seed: int = 0, missing_salary_share: float = 0.3) -> List[Dict[str, Any]]:
+    """
+    Элементы ответа API hh.ru (поле items): описания с разметкой подсветки, зарплата в виде словаря.
+    :param count: Число элементов.
+    :param seed: Зерно генератора.
+    :param missing_salary_share: Доля вакансий без зарплаты.
+    """
+    rng = random.Random(seed)
+    items = []
+    for number in range(count):
+        vacancy_id = str(100_000_000 + number)
+        salary = None
+        if rng.random() >= missing_salary_share:
+            low = round(rng.lognormvariate(11.7, 0.5), -3)
+            salary = {"from": low, "to": low * 1.5 if rng.random() < 0.5 else None, "currency": "RUR",
+                      "gross": rng.random() < 0.5}
+        items.append({
+            "id": vacancy_id,
+            "name": rng.choice(TITLES),
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "salary": salary,
+            "snippet": {"requirement": _description(rng, True)},
+        })
+    return items
@@ -1,37 +1,90 @@
-from typing import Any, Dict, List
+import argparse
+import json
+import os
+import sys
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+# Сетевой стек (requests, urllib3, hashlib) и sqlite3 загружаются лениво: команды, работающие только
+# с локальным файлом, запускаются скриптами тысячи раз в день, и время старта для них важно
 from src.api_handler import HeadHunterAPI
-from src.file_handler import JSONFileHandler
-from src.helpers import clean_html, parse_salary_range
+from src.file_handler import FileHandler, JSONFileHandler, JSONLinesFileHandler
+from src.helpers import parse_salary_range
+from src.metrics import metrics
+from src.query_cache import QueryCache
+from src.salary import currency_rates, format_salary
+from src.response_cache import ResponseCache
+from src.utils import sort_vacancies
 from src.vacancy import Vacancy
 
+if TYPE_CHECKING:
+    from src.sync_state import SyncState
 
-def display_vacancies(vacancies: List[Dict[str, Any]]) -> None:
+# Коды завершения командной строки
+EXIT_OK = 0
+EXIT_FAILURE = 1  # Операция выполнена частично или не выполнена (ошибки сети, не найдены ID)
+EXIT_USAGE = 2  # Некорректные аргументы (тот же код использует argparse)
+
+VACANCY_FIELDS = ("id", "title", "link", "salary", "salary_to", "currency", "gross", "description")
+FETCH_FIELDS = ("keyword", "fetched", "error")
+
+
+def display_vacancies(vacancies: Iterable[Dict[str, Any]]) -> None:
     """
     Отображает список вакансий.
-    :param vacancies: Список словарей с данными о вакансиях.
+    :param vacancies: Словари с данными о вакансиях (список или итератор, например iter_filter).
     """
     for vacancy in vacancies:
+        vacancy_id = vacancy.get("id")
         title = vacancy.get("title", "Без названия")
         link = vacancy.get("link", "Ссылка отсутствует")
-        salary = vacancy.get("salary", "Зарплата не указана")
-        description = clean_html(vacancy.get("description", "Описание отсутствует") or "Описание отсутствует")
+        description = vacancy.get("description", "Описание отсутствует") or "Описание отсутствует"
 
+        if vacancy_id is not None:
+            print(f"ID: {vacancy_id}")
         print(f"Название: {title}")
         print(f"Ссылка: {link}")
-        print(f"Зарплата: {salary} руб.")
+        print(f"Зарплата: {format_salary(vacancy)}")
         print(f"Описание: {description}")
         print("-" * 40)
 
 
-def user_interaction() -> None:
-    """Функция для взаимодействия с пользователем через консоль."""
-    json_saver = JSONFileHandler()
+def get_file_handler(storage: Optional[str] = None) -> FileHandler:
+    """
+    Создаёт хранилище вакансий.
+    :param storage: "json" (по умолчанию), "jsonl" или "sqlite"; если не задано,
+                    берётся из переменной окружения VACANCIES_STORAGE.
+    :return: Экземпляр FileHandler.
+    """
+    storage = (storage or os.environ.get("VACANCIES_STORAGE") or "json").lower()
+    if storage == "json":
+        return JSONFileHandler(cached=True, query_cache=QueryCache())
+    if storage == "jsonl":
+        return JSONLinesFileHandler()
+    if storage == "sqlite":
+        from src.sqlite_handler import SQLiteFileHandler
+
+        return SQLiteFileHandler()
+    raise ValueError(f"Неизвестный тип хранилища: {storage}")
+
+
+def user_interaction(storage: Optional[str] = None) -> None:
+    """
+    Функция для взаимодействия с пользователем через консоль.
+    :param storage: Тип хранилища (см. get_file_handler).
+    """
+    # Путь для выгрузки метрик (.prom — формат Prometheus, иначе JSON); без него метрики не собираются
+    metrics_path = os.environ.get("VACANCIES_METRICS")
+    if metrics_path:
+        metrics.enable()
+    json_saver = get_file_handler(storage)
+    # Клиент создаётся при первой загрузке: сеанс, работающий только с локальными данными, не загружает
+    # сетевой стек. Дальше одна сессия на весь сеанс: соединения переиспользуются, повторы берутся из кэша
+    hh_api: Optional[HeadHunterAPI] = None
 
     while True:
         print("\nМеню:")
         print("1. Добавить вакансии из HeadHunter")
-        print("2. Удалить вакансию по ID")
+        print("2. Удалить вакансии по ID")
         print("3. Фильтровать вакансии по ключевым словам")
         print("4. Фильтровать вакансии по зарплате")
         print("5. Показать все вакансии")
@@ -44,31 +97,30 @@ def user_interaction() -> None:
             if not search_query:
                 print("Поисковый запрос не может быть пустым.")
                 continue
-            hh_api = HeadHunterAPI()
+            if hh_api is None:
+                hh_api = HeadHunterAPI(cache=ResponseCache())
             try:
                 hh_vacancies = hh_api.get_vacancies(search_query)
-                for vacancy in hh_vacancies:
-                    try:
-                        vacancy_data = Vacancy(
-                            title=vacancy["title"],
-                            link=vacancy["link"],
-                            salary=vacancy.get("salary", "Зарплата не указана"),
-                            description=vacancy.get("description", "Описание отсутствует")
-                        ).to_dict()
-                        json_saver.add_vacancy(vacancy_data)
-                        print(f"Вакансия «{vacancy['title']}» успешно добавлена.")  # Явное сообщение
-                    except ValueError as e:
-                        print(f"Ошибка при добавлении вакансии: {e}")
+                # Описания уже очищены в get_vacancies: повторно их не обрабатывают ни Vacancy, ни хранилище
+                vacancies, errors = Vacancy.from_dicts(hh_vacancies, clean=False)
+                summary = json_saver.add_vacancies([vacancy.to_dict() for vacancy in vacancies], clean=False)
+                print(
+                    f"Добавлено вакансий: {summary['added']}, "
+                    f"обновлено: {summary['updated']}, "
+                    f"без изменений: {summary['skipped']}, "
+                    f"некорректных: {summary['invalid'] + len(errors)}."
+                )
             except ConnectionError as e:
                 print(f"Ошибка подключения к API: {e}")
 
         elif choice == "2":
-            vacancy_id = input("Введите ID вакансии для удаления: ").strip()
-            if vacancy_id.isdigit():
-                json_saver.delete_vacancy(int(vacancy_id))
-                print(f"Вакансия с ID {vacancy_id} удалена.")  # Явное сообщение
-            else:
+            vacancy_ids = input("Введите ID вакансий для удаления (через пробел): ").strip().split()
+            if not vacancy_ids:
                 print("Некорректный ID.")
+            elif len(vacancy_ids) == 1:
+                json_saver.delete_vacancy(vacancy_ids[0])
+            else:
+                print(f"Удалено вакансий: {json_saver.delete_vacancies(vacancy_ids)}.")
 
         elif choice == "3":
             filter_words = input("Введите ключевые слова для фильтрации (через пробел): ").strip().split()
@@ -90,11 +142,303 @@ def user_interaction() -> None:
 
         elif choice == "6":
             print("Выход из программы.")  # Явное сообщение
+            if hh_api is not None:
+                hh_api.close()
+            if metrics_path:
+                metrics.export(metrics_path)
             break
 
         else:
             print("Некорректный выбор.")
 
 
+def _tsv_value(value: Any) -> str:
+    """Значение поля TSV: табуляции и переводы строк заменяются пробелами."""
+    if value is None:
+        return ""
+    return " ".join(str(value).replace("\t", " ").splitlines())
+
+
+def write_records(
+    records: Iterable[Dict[str, Any]],
+    fields: Sequence[str],
+    output_format: str = "jsonl",
+    stream: Optional[IO[str]] = None,
+) -> int:
+    """
+    Выводит записи для передачи по конвейеру.
+    :param records: Словари (список или итератор).
+    :param fields: Поля записи; в JSON Lines выводятся только присутствующие, в TSV — все по порядку.
+    :param output_format: "jsonl" — по объекту JSON на строку, "tsv" — строка заголовка и значения через табуляцию.
+    :param stream: Поток вывода (по умолчанию sys.stdout).
+    :return: Число выведенных записей.
+    """
+    stream = stream or sys.stdout
+    if output_format == "tsv":
+        stream.write("\t".join(fields) + "\n")
+    count = 0
+    for record in records:
+        if output_format == "tsv":
+            stream.write("\t".join(_tsv_value(record.get(field)) for field in fields) + "\n")
+        else:
+            stream.write(json.dumps({field: record[field] for field in fields if field in record},
+                                    ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def read_keywords(path: str) -> List[str]:
+    """
+    Читает поисковые запросы из файла: по одному на строку, пустые строки и строки с # пропускаются,
+    повторы удаляются с сохранением порядка.
+    :param path: Путь к файлу или "-" для стандартного ввода.
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    keywords = (line.strip() for line in lines)
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword and not keyword.startswith("#")))
+
+
+def fetch_keywords(
+    hh_api: HeadHunterAPI, keywords: Sequence[str], jobs: int = 8, state: Optional["SyncState"] = None
+) -> List[Tuple[str, List[Dict[str, Any]], Optional[str]]]:
+    """
+    Загружает вакансии по нескольким запросам параллельно (страницы каждого запроса тоже загружаются
+    параллельно внутри HeadHunterAPI).
+    :param hh_api: Клиент API; его сессия и кэш ответов общие для всех потоков.
+    :param keywords: Поисковые запросы.
+    :param jobs: Число запросов, выполняемых одновременно.
+    :param state: Состояние синхронизации: если задано, загружаются только новые и обновлённые вакансии.
+    :return: Кортежи (запрос, вакансии, текст ошибки или None) в порядке keywords.
+    """
+
+    def fetch(keyword: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+        try:
+            if state is not None:
+                return keyword, hh_api.sync_vacancies(keyword, state), None
+            return keyword, hh_api.fetch_vacancies(keyword), None
+        except ConnectionError as e:
+            return keyword, [], str(e)
+
+    if not keywords:
+        return []
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(keywords))) as executor:
+        return list(executor.map(fetch, keywords))
+
+
+def _all_vacancies(handler: FileHandler) -> Iterable[Dict[str, Any]]:
+    """Все вакансии хранилища; JSON-файл читается потоково, если он не закэширован в памяти."""
+    iter_vacancies = getattr(handler, "iter_vacancies", None)
+    return iter_vacancies() if iter_vacancies is not None else handler.filter_vacancies([])
+
+
+def _error(message: str) -> None:
+    """Сообщение об ошибке в stderr, чтобы не смешивать его с данными в stdout."""
+    print(message, file=sys.stderr)
+
+
+def command_fetch(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Загружает вакансии по запросам и сохраняет их одной записью в хранилище."""
+    keywords = list(dict.fromkeys(args.keywords))
+    if args.keywords_file:
+        keywords = list(dict.fromkeys(keywords + read_keywords(args.keywords_file)))
+    if not keywords:
+        _error("Не задано ни одного поискового запроса.")
+        return EXIT_USAGE
+
+    state = None
+    if args.incremental:
+        from src.sync_state import SyncState
+
+        state = SyncState.for_data(handler.filename)
+
+    # Соединений в пуле хватает на все одновременно загружаемые страницы
+    hh_api = HeadHunterAPI(
+        max_workers=args.page_workers, pool_size=args.jobs * args.page_workers,
+        cache=None if args.no_cache else ResponseCache(),
+    )
+    try:
+        if currency_rates.is_stale():
+            # Курсы нужны для пересчёта зарплат в рубли при фильтрации; без связи остаются прежние
+            try:
+                currency_rates.update(hh_api.get_currency_rates())
+            except ConnectionError as e:
+                _error(f"Не удалось обновить курсы валют: {e}")
+        results = fetch_keywords(hh_api, keywords, args.jobs, state)
+    finally:
+        hh_api.close()
+
+    # Запросы пересекаются, поэтому вакансии объединяются по ссылке до разбора и записи
+    merged: Dict[str, Dict[str, Any]] = {}
+    for _, vacancies, _ in results:
+        for vacancy_data in vacancies:
+            merged.setdefault(vacancy_data.get("link") or str(len(merged)), vacancy_data)
+    vacancies_list, errors = Vacancy.from_dicts(merged.values(), clean=False)
+    # Одна запись хранилища на весь запуск вместо записи после каждого запроса
+    summary = handler.add_vacancies([vacancy.to_dict() for vacancy in vacancies_list], clean=False)
+    if state is not None:
+        state.save()  # Водяные знаки сдвигаются только после того, как вакансии записаны
+
+    write_records(
+        ({"keyword": keyword, "fetched": len(vacancies), "error": error} for keyword, vacancies, error in results),
+        FETCH_FIELDS, args.format,
+    )
+    failed = sum(1 for _, _, error in results if error is not None)
+    _error(
+        f"Запросов: {len(results)}, с ошибкой: {failed}. "
+        f"Добавлено вакансий: {summary['added']}, обновлено: {summary['updated']}, "
+        f"без изменений: {summary['skipped']}, некорректных: {summary['invalid'] + len(errors)}."
+    )
+    return EXIT_FAILURE if failed else EXIT_OK
+
+
+def command_filter(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Выводит вакансии, в описании которых есть ключевые слова."""
+    vacancies = handler.filter_vacancies(args.words, match_all=args.match_all, prefix=args.prefix)
+    write_records(vacancies, VACANCY_FIELDS, args.format)
+    return EXIT_OK
+
+
+def command_salary(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Выводит вакансии с зарплатой в диапазоне."""
+    salary_range = parse_salary_range(args.range)
+    if salary_range == (0, float("inf")):
+        _error("Некорректный формат диапазона зарплат.")
+        return EXIT_USAGE
+    vacancies = handler.filter_vacancies_by_salary(salary_range, offset=args.offset, limit=args.limit)
+    write_records(vacancies, VACANCY_FIELDS, args.format)
+    return EXIT_OK
+
+
+def command_top(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Выводит N вакансий с наибольшей (или наименьшей) зарплатой."""
+    vacancies = sort_vacancies(_all_vacancies(handler), reverse=not args.ascending, top_n=args.count)
+    write_records(vacancies, VACANCY_FIELDS, args.format)
+    return EXIT_OK
+
+
+def command_delete(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Удаляет вакансии по ID; код 1, если хотя бы один ID не найден."""
+    ids = list(dict.fromkeys(args.ids))
+    deleted = handler.delete_vacancies(ids)
+    _error(f"Удалено вакансий: {deleted} из {len(ids)}.")
+    return EXIT_OK if deleted == len(ids) else EXIT_FAILURE
+
+
+def command_stale(args: argparse.Namespace, handler: FileHandler) -> int:
+    """
+    Выводит вакансии, которые по данным синхронизации не обновлялись дольше --days дней
+    (вероятно, сняты с публикации); с --delete удаляет их.
+    """
+    from src.sync_state import SyncState
+
+    state = SyncState.for_data(handler.filename)
+    stale_ids = set(state.stale_ids(args.days))
+    stale = [vacancy for vacancy in _all_vacancies(handler) if str(vacancy.get("id")) in stale_ids]
+    write_records(stale, VACANCY_FIELDS, args.format)
+    if args.delete and stale_ids:
+        deleted = handler.delete_vacancies(sorted(stale_ids))
+        state.forget(stale_ids)
+        state.save()
+        _error(f"Удалено устаревших вакансий: {deleted}.")
+    return EXIT_OK
+
+
+def command_export(args: argparse.Namespace, handler: FileHandler) -> int:
+    """Выводит все вакансии хранилища."""
+    write_records(_all_vacancies(handler), VACANCY_FIELDS, args.format)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт разборщик аргументов с подкомандами."""
+    parser = argparse.ArgumentParser(description="Сбор и поиск вакансий hh.ru.")
+    parser.add_argument("--storage", choices=("json", "jsonl", "sqlite"),
+                        help="Тип хранилища (по умолчанию VACANCIES_STORAGE или json).")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=("jsonl", "tsv"), default="jsonl", help="Формат вывода в stdout.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("interactive", help="Интерактивное меню (режим по умолчанию).")
+
+    fetch = subparsers.add_parser("fetch", parents=[output], help="Загрузить вакансии по запросам.")
+    fetch.add_argument("keywords", nargs="*", help="Поисковые запросы.")
+    fetch.add_argument("-f", "--keywords-file", help="Файл с запросами, по одному на строку (- — stdin).")
+    fetch.add_argument("-j", "--jobs", type=int, default=8, help="Число запросов, выполняемых параллельно.")
+    fetch.add_argument("--page-workers", type=int, default=4, help="Число страниц запроса, загружаемых параллельно.")
+    fetch.add_argument("--no-cache", action="store_true", help="Не использовать кэш ответов API.")
+    fetch.add_argument("-i", "--incremental", action="store_true",
+                       help="Загружать только вакансии, опубликованные после прошлой синхронизации запроса.")
+    fetch.set_defaults(handler=command_fetch)
+
+    filter_parser = subparsers.add_parser("filter", parents=[output], help="Вакансии по ключевым словам в описании.")
+    filter_parser.add_argument("words", nargs="+", help="Ключевые слова.")
+    filter_parser.add_argument("--all", dest="match_all", action="store_true", help="Требовать все слова.")
+    filter_parser.add_argument("--prefix", action="store_true", help="Искать слова как начала токенов.")
+    filter_parser.set_defaults(handler=command_filter)
+
+    salary = subparsers.add_parser("salary", parents=[output], help="Вакансии по диапазону зарплат.")
+    salary.add_argument("range", help="Диапазон зарплат: минимум-максимум.")
+    salary.add_argument("--offset", type=int, default=0, help="Сколько вакансий пропустить.")
+    salary.add_argument("--limit", type=int, help="Максимальное число вакансий.")
+    salary.set_defaults(handler=command_salary)
+
+    top = subparsers.add_parser("top", parents=[output], help="Вакансии с наибольшей зарплатой.")
+    top.add_argument("count", type=int, nargs="?", default=10, help="Число вакансий.")
+    top.add_argument("--asc", dest="ascending", action="store_true", help="Наименьшие зарплаты.")
+    top.set_defaults(handler=command_top)
+
+    delete = subparsers.add_parser("delete", help="Удалить вакансии по ID.")
+    delete.add_argument("ids", nargs="+", help="ID вакансий.")
+    delete.set_defaults(handler=command_delete)
+
+    stale = subparsers.add_parser("stale", parents=[output], help="Вакансии, снятые с публикации.")
+    stale.add_argument("--days", type=float, default=30, help="Возраст последней публикации, дни.")
+    stale.add_argument("--delete", action="store_true", help="Удалить найденные вакансии.")
+    stale.set_defaults(handler=command_stale)
+
+    export = subparsers.add_parser("export", parents=[output], help="Вывести все вакансии.")
+    export.set_defaults(handler=command_export)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Точка входа командной строки. Без подкоманды запускается интерактивное меню.
+    :param argv: Аргументы (по умолчанию sys.argv[1:]).
+    :return: Код завершения.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in (None, "interactive"):
+        user_interaction(args.storage)
+        return EXIT_OK
+    if getattr(args, "jobs", 1) < 1 or getattr(args, "page_workers", 1) < 1 or getattr(args, "count", 1) < 0:
+        parser.error("число потоков и вакансий должно быть положительным")
+
+    metrics_path = os.environ.get("VACANCIES_METRICS")
+    if metrics_path:
+        metrics.enable()
+    try:
+        handler = get_file_handler(args.storage)
+        command: Callable[[argparse.Namespace, FileHandler], int] = args.handler
+        return command(args, handler)
+    except BrokenPipeError:
+        # Читатель конвейера (например, head) закрыл поток: это не ошибка
+        sys.stdout = open(os.devnull, "w")
+        return EXIT_OK
+    except (OSError, ValueError) as e:
+        _error(f"Ошибка: {e}")
+        return EXIT_FAILURE
+    finally:
+        if metrics_path:
+            metrics.export(metrics_path)
+
+
 if __name__ == "__main__":
-    user_interaction()
+    sys.exit(main())
@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
-import requests
-from src.helpers import clean_html
-from typing import List, Dict, Any
+import random
+import time
+from src.helpers import clean_html_many
+from src.metrics import metrics
+from src.response_cache import ResponseCache
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union
 from typing import cast
 
+if TYPE_CHECKING:
+    import requests
+
+    from src.sync_state import SyncState
+
 
 # class APIHandler(ABC):
 #     """Абстрактный класс для работы с API платформ с вакансиями."""
@@ -30,6 +38,83 @@ from typing import cast
 #         if response.status_code != 200:
 #             raise ConnectionError(f"Ошибка подключения к API: {response.status_code}")
 #         return response.json()  # Убедитесь, что ответ - это словарь
+
+
+PER_PAGE = 100
+MAX_DEPTH = 2000  # hh.ru отдаёт не более 2000 вакансий по одному запросу
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_BACKOFF = 30.0  # Верхняя граница паузы между повторами, секунды
+SYNC_OVERLAP = 600.0  # Запас инкрементальной синхронизации: вакансии индексируются hh.ru с задержкой, секунды
+
+
+def parse_vacancies(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Преобразует элементы ответа API hh.ru в словари вакансий.
+    :param data: Ответ API (одна страница выдачи).
+    :return: Список словарей с полями id, title, link, salary, description, а при указанной зарплате —
+             ещё salary_to, currency и gross.
+    """
+    items = data.get("items", [])
+    descriptions = clean_html_many(
+        item.get("snippet", {}).get("requirement", "Описание отсутствует") for item in items
+    )
+    vacancies = []
+    for item, description in zip(items, descriptions):
+        vacancy_data: Dict[str, Any] = {
+            "id": item.get("id"),
+            "title": item.get("name", "Название не указано"),
+            "link": item.get("alternate_url", "Ссылка не указана"),
+            "salary": "Зарплата не указана",
+        }
+        salary = item.get("salary")
+        if salary and (salary.get("from") is not None or salary.get("to") is not None):
+            # Нижняя граница — from, а если её нет, то to; валюта и признак gross сохраняются для пересчёта в рубли
+            vacancy_data["salary"] = salary["from"] if salary.get("from") is not None else salary["to"]
+            vacancy_data["salary_to"] = salary.get("to")
+            vacancy_data["currency"] = salary.get("currency")
+            vacancy_data["gross"] = salary.get("gross")
+        vacancy_data["description"] = description
+        vacancies.append(vacancy_data)
+    return vacancies
+
+
+def count_pages(data: Dict[str, Any], max_pages: int) -> int:
+    """
+    Определяет число страниц для загрузки по первому ответу API.
+    :param data: Ответ API для первой страницы.
+    :param max_pages: Ограничение числа страниц.
+    :return: Число страниц с учётом found, глубины выдачи hh.ru и max_pages.
+    """
+    pages = int(data.get("pages") or 1)
+    found = data.get("found")
+    if found is not None:
+        pages = min(pages, -(-int(found) // PER_PAGE))
+    return max(1, min(pages, MAX_DEPTH // PER_PAGE, max_pages))
+
+
+def backoff_delay(attempt: int, backoff_factor: float) -> float:
+    """Экспоненциальная задержка с «полным» джиттером."""
+    return random.uniform(0, min(MAX_BACKOFF, backoff_factor * 2 ** attempt))
+
+
+def retry_after_delay(value: Optional[str]) -> Optional[float]:
+    """Возвращает паузу из заголовка Retry-After (секунды или HTTP-дата)."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        # Даты в Retry-After редки: модуль email загружается только для них
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_BACKOFF, max(0.0, delay))
+
+
 class APIHandler(ABC):
     """Абстрактный класс для работы с API платформ с вакансиями."""
 
@@ -48,33 +133,210 @@ class HeadHunterAPI(APIHandler):
     """Класс для работы с API HeadHunter."""
 
     _BASE_URL = "https://api.hh.ru/vacancies"
+    _DICTIONARIES_URL = "https://api.hh.ru/dictionaries"
+
+    def __init__(
+        self,
+        max_workers: int = 5,
+        max_pages: int = 20,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 10.0),
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        :param max_workers: Максимальное число страниц, загружаемых параллельно.
+        :param max_pages: Максимальное число страниц выдачи на один запрос.
+        :param pool_size: Размер пула соединений HTTP-сессии.
+        :param max_retries: Число повторов при ответах 429/5xx и сетевых ошибках.
+        :param backoff_factor: Базовая пауза экспоненциальной задержки, секунды.
+        :param timeout: Таймаут запроса (общий или пара «подключение, чтение»), секунды.
+        :param cache: Дисковый кэш ответов; без него каждый запрос идёт в сеть.
+        """
+        if max_workers < 1:
+            raise ValueError("Число потоков должно быть положительным.")
+        if max_pages < 1:
+            raise ValueError("Число страниц должно быть положительным.")
+        if pool_size < 1:
+            raise ValueError("Размер пула соединений должен быть положительным.")
+        if max_retries < 0:
+            raise ValueError("Число повторов не может быть отрицательным.")
+        self._max_workers = max_workers
+        self._max_pages = max_pages
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._timeout = timeout
+        self._cache = cache
+
+        # requests и его зависимости загружаются только при создании клиента: локальным командам сеть не нужна
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Одна сессия на клиент: соединения переиспользуются (keep-alive) всеми потоками
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def __enter__(self) -> "HeadHunterAPI":
+        return self
 
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрывает HTTP-сессию и освобождает соединения пула."""
+        self._session.close()
+
+    @property
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """Счётчики попаданий и промахов кэша ответов (None, если кэш не используется)."""
+        return self._cache.stats if self._cache is not None else None
+
+    def _request(self, url: str, params: dict, headers: Optional[Dict[str, str]] = None) -> "requests.Response":
+        """
+        Выполняет GET-запрос через сессию.
+        Ответы 429/5xx и сетевые ошибки повторяются с экспоненциальной задержкой.
+        :return: Ответ со статусом 200 или 304.
+        """
+        import requests  # уже загружен в __init__
+
+        for attempt in range(self._max_retries + 1):
+            is_last = attempt == self._max_retries
+            if attempt:
+                metrics.increment("http_retries_total")
+            try:
+                response = self._session.get(url, params=params, headers=headers, timeout=self._timeout)
+            except requests.RequestException as e:
+                metrics.increment("http_errors_total", error=type(e).__name__)
+                if is_last:
+                    raise ConnectionError(f"Ошибка подключения к API: {e}") from e
+                time.sleep(backoff_delay(attempt, self._backoff_factor))
+                continue
+
+            if metrics.enabled:
+                metrics.increment("http_responses_total", status=response.status_code)
+                metrics.increment("http_received_bytes_total", len(response.content))
+            if response.status_code == 200 or (response.status_code == 304 and headers):
+                return response
+            if response.status_code not in RETRY_STATUSES or is_last:
+                raise ConnectionError(f"Ошибка подключения к API: {response.status_code}")
+
+            delay = retry_after_delay(response.headers.get("Retry-After"))
+            time.sleep(backoff_delay(attempt, self._backoff_factor) if delay is None else delay)
+
+        raise ConnectionError("Ошибка подключения к API")
+
+    @metrics.timed("http_connect")
     def connect(self, url: str, params: dict) -> Dict[str, Any]:
-        """Подключение к API HeadHunter."""
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            raise ConnectionError(f"Ошибка подключения к API: {response.status_code}")
+        """
+        Подключение к API HeadHunter.
+        Свежие ответы берутся из кэша, устаревшие перепроверяются условным запросом (ETag/Last-Modified).
+        """
+        if self._cache is None:
+            # Явно указываем, что ответ является словарем
+            return cast(Dict[str, Any], self._request(url, params).json())
+
+        body, conditional_headers = self._cache.lookup(url, params)
+        if body is not None:
+            return cast(Dict[str, Any], body)
+
+        response = self._request(url, params, conditional_headers or None)
+        if response.status_code == 304:
+            body = self._cache.revalidate(url, params)
+            if body is not None:
+                return cast(Dict[str, Any], body)
+            response = self._request(url, params)
 
-        # Явно указываем, что ответ является словарем
-        return cast(Dict[str, Any], response.json())
+        body = response.json()
+        self._cache.store(url, params, body, response.headers)
+        return cast(Dict[str, Any], body)
+
+    def _fetch_page(self, keyword: str, page: int, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Загружает одну страницу выдачи; extra — дополнительные параметры запроса."""
+        params = {"text": keyword, "per_page": PER_PAGE, "page": page, **(extra or {})}
+        return self.connect(self._BASE_URL, params)
+
+    def _fetch_pages(self, keyword: str, extra: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Загружает все страницы выдачи.
+        Первая страница определяет общее число страниц, остальные загружаются параллельно.
+        :return: Ответы API в порядке страниц.
+        """
+        first_page = self._fetch_page(keyword, 0, extra)
+        pages = count_pages(first_page, self._max_pages)
+        if pages == 1:
+            return [first_page]
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, pages - 1)) as executor:
+            # executor.map сохраняет порядок страниц
+            return [first_page, *executor.map(lambda page: self._fetch_page(keyword, page, extra), range(1, pages))]
+
+    def fetch_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
+        """
+        Загружает вакансии по ключевому слову, не перехватывая ошибки.
+        :param keyword: Поисковый запрос.
+        :return: Список вакансий в порядке страниц выдачи.
+        :raises ConnectionError: Если API недоступен.
+        """
+        vacancies: List[Dict[str, Any]] = []
+        for data in self._fetch_pages(keyword):
+            vacancies.extend(parse_vacancies(data))
+        return vacancies
+
+    def sync_vacancies(
+        self, keyword: str, state: "SyncState", overlap: float = SYNC_OVERLAP
+    ) -> List[Dict[str, Any]]:
+        """
+        Инкрементальная загрузка: запрашивает только вакансии, опубликованные или обновлённые после
+        водяного знака запроса (с запасом overlap секунд). Первая синхронизация запроса загружает всю выдачу.
+        Даты публикации и новый водяной знак записываются в state в памяти; сохранить их (state.save())
+        нужно после записи вакансий в хранилище.
+        :param keyword: Поисковый запрос.
+        :param state: Состояние синхронизации (см. SyncState.for_data).
+        :param overlap: Запас перед водяным знаком, секунды; повторно полученные вакансии не изменят хранилище.
+        :return: Список вакансий, как у fetch_vacancies.
+        :raises ConnectionError: Если API недоступен.
+        """
+        from datetime import timedelta
+
+        from src.sync_state import format_hh_date, parse_hh_date
+
+        extra: Dict[str, Any] = {"order_by": "publication_time"}
+        watermark = state.watermark(keyword)
+        if watermark is not None:
+            extra["date_from"] = format_hh_date(watermark - timedelta(seconds=overlap))
+
+        vacancies: List[Dict[str, Any]] = []
+        published = {}
+        for data in self._fetch_pages(keyword, extra):
+            for item in data.get("items", []):
+                moment = parse_hh_date(item.get("published_at"))
+                if item.get("id") is not None and moment is not None:
+                    published[str(item["id"])] = moment
+            vacancies.extend(parse_vacancies(data))
+        state.update(keyword, published)
+        return vacancies
+
+    def get_currency_rates(self) -> Dict[str, float]:
+        """
+        Загружает курсы валют из справочника hh.ru.
+        :return: Код валюты -> единиц валюты за один рубль (формат CurrencyRates.update).
+        :raises ConnectionError: Если API недоступен.
+        """
+        currencies = self.connect(self._DICTIONARIES_URL, {}).get("currency") or []
+        return {item["code"]: float(item["rate"]) for item in currencies if item.get("code") and item.get("rate")}
 
     def get_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
-        """Получение вакансий с hh.ru по ключевому слову."""
-        params = {"text": keyword, "per_page": 100}
+        """
+        Получение вакансий с hh.ru по ключевому слову.
+        :param keyword: Поисковый запрос.
+        :return: Список вакансий в порядке страниц выдачи (пустой при ошибке подключения).
+        """
         try:
-            data = self.connect(self._BASE_URL, params)
-            return [
-                {
-                    "title": item.get("name", "Название не указано"),
-                    "link": item.get("alternate_url", "Ссылка не указана"),
-                    "salary": (
-                        item.get("salary", {}).get("from", None) if item.get("salary") else "Зарплата не указана"
-                    ),
-                    "description": clean_html(item.get("snippet", {}).get("requirement", "Описание отсутствует")),
-                }
-                for item in data.get("items", [])
-            ]
-
+            return self.fetch_vacancies(keyword)
         except ConnectionError as e:
             print(f"Произошла ошибка: {e}")
             return []
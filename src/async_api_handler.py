@@ -0,0 +1,150 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, cast
+
+import aiohttp
+
+from src.api_handler import (PER_PAGE, RETRY_STATUSES, APIHandler, HeadHunterAPI, backoff_delay, count_pages,
+                             parse_vacancies, retry_after_delay)
+
+
+class AsyncHeadHunterAPI(APIHandler):
+    """
+    Асинхронный клиент API HeadHunter.
+    Возвращает те же словари вакансий, что и HeadHunterAPI, но позволяет
+    загружать страницы многих запросов одновременно в одном цикле событий.
+    """
+
+    _BASE_URL = HeadHunterAPI._BASE_URL
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        max_pages: int = 20,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 10.0,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param max_concurrency: Максимальное число одновременных HTTP-запросов.
+        :param max_pages: Максимальное число страниц выдачи на один запрос.
+        :param max_retries: Число повторов при ответах 429/5xx и сетевых ошибках.
+        :param backoff_factor: Базовая пауза экспоненциальной задержки, секунды.
+        :param timeout: Общий таймаут одного запроса, секунды.
+        :param base_url: Адрес API (например, локальный тестовый сервер).
+        """
+        if max_concurrency < 1:
+            raise ValueError("Число одновременных запросов должно быть положительным.")
+        if max_pages < 1:
+            raise ValueError("Число страниц должно быть положительным.")
+        if max_retries < 0:
+            raise ValueError("Число повторов не может быть отрицательным.")
+        self._max_concurrency = max_concurrency
+        self._max_pages = max_pages
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._base_url = base_url or self._BASE_URL
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncHeadHunterAPI":
+        self._open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _open(self) -> aiohttp.ClientSession:
+        """Создаёт сессию и семафор в текущем цикле событий."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        """Закрывает HTTP-сессию."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Использует открытую сессию или открывает временную на время вызова."""
+        if self._session is not None:
+            yield self._session
+            return
+        session = self._open()
+        try:
+            yield session
+        finally:
+            await self.close()
+
+    async def connect(self, url: str, params: dict) -> Dict[str, Any]:  # type: ignore[override]
+        """
+        Асинхронное подключение к API HeadHunter.
+        Ответы 429/5xx и сетевые ошибки повторяются с экспоненциальной задержкой.
+        """
+        async with self._client() as session:
+            semaphore = cast(asyncio.Semaphore, self._semaphore)
+            for attempt in range(self._max_retries + 1):
+                is_last = attempt == self._max_retries
+                async with semaphore:
+                    try:
+                        async with session.get(url, params=params) as response:
+                            if response.status == 200:
+                                return cast(Dict[str, Any], await response.json())
+                            status = response.status
+                            retry_after = response.headers.get("Retry-After")
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        if is_last:
+                            raise ConnectionError(f"Ошибка подключения к API: {e}") from e
+                        status, retry_after = None, None
+
+                if status is not None and (status not in RETRY_STATUSES or is_last):
+                    raise ConnectionError(f"Ошибка подключения к API: {status}")
+                # Пауза выполняется вне семафора, чтобы не занимать слот
+                delay = retry_after_delay(retry_after)
+                await asyncio.sleep(backoff_delay(attempt, self._backoff_factor) if delay is None else delay)
+
+        raise ConnectionError("Ошибка подключения к API")
+
+    async def _fetch_page(self, keyword: str, page: int) -> Dict[str, Any]:
+        """Загружает одну страницу выдачи."""
+        params = {"text": keyword, "per_page": PER_PAGE, "page": page}
+        return await self.connect(self._base_url, params)
+
+    async def get_vacancies(self, keyword: str) -> List[Dict[str, Any]]:  # type: ignore[override]
+        """
+        Асинхронное получение вакансий с hh.ru по ключевому слову.
+        :param keyword: Поисковый запрос.
+        :return: Список вакансий в порядке страниц выдачи.
+        """
+        async with self._client():
+            try:
+                first_page = await self._fetch_page(keyword, 0)
+                pages = count_pages(first_page, self._max_pages)
+                rest = await asyncio.gather(*(self._fetch_page(keyword, page) for page in range(1, pages)))
+            except ConnectionError as e:
+                print(f"Произошла ошибка: {e}")
+                return []
+
+        vacancies = parse_vacancies(first_page)
+        for data in rest:
+            vacancies.extend(parse_vacancies(data))
+        return vacancies
+
+    async def get_vacancies_many(self, keywords: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Получение вакансий сразу по нескольким ключевым словам.
+        Все запросы и их страницы выполняются одновременно в пределах max_concurrency.
+        :param keywords: Поисковые запросы.
+        :return: Словарь «запрос -> список вакансий» в порядке переданных запросов.
+        """
+        unique_keywords = list(dict.fromkeys(keywords))
+        async with self._client():
+            results = await asyncio.gather(*(self.get_vacancies(keyword) for keyword in unique_keywords))
+        return dict(zip(unique_keywords, results))
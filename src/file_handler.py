@@ -1,40 +1,304 @@
 import json
+import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import (IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union,
+                    cast)
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка только между потоками процесса
+    fcntl = None  # type: ignore[assignment]
 
 from src.helpers import clean_html
+from src.indexes import (LOCAL_ID_PREFIX, InvertedIndex, KeyIndex, SalaryIndex, file_stamp, hh_vacancy_id,
+                         load_last_local_id, load_sidecar, local_id_number, save_sidecar, tokenize, vacancy_key)
+from src.metrics import metrics
+from src.query_cache import QueryCache, normalize_words
+from src.salary import merge_vacancy, salary_interval, salary_overlaps
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+REQUIRED_FIELDS = ("title", "link", "salary", "description")
+
+
+def prepare_vacancy(vacancy_data: Dict[str, Any], clean: bool = True) -> Dict[str, Any]:
+    """
+    Проверяет обязательные поля вакансии и очищает описание от HTML.
+    :param vacancy_data: Словарь с данными о вакансии (изменяется на месте).
+    :param clean: False — описание уже очищено (parse_vacancies, Vacancy.to_dict) и повторно не очищается:
+                  повторная очистка не только лишняя, но и портит текст с декодированными «<» и «&».
+    :return: Тот же словарь.
+    """
+    for field in REQUIRED_FIELDS:
+        if field not in vacancy_data:
+            raise ValueError(f"Вакансия должна содержать поле '{field}'.")
+
+    # Если поле 'description' отсутствует, можно установить значение по умолчанию
+    vacancy_data["description"] = vacancy_data.get("description", "Описание отсутствует")
+
+    # Обработка HTML
+    if clean:
+        vacancy_data["description"] = clean_html(vacancy_data["description"])
+    elif not vacancy_data["description"]:
+        vacancy_data["description"] = "Описание отсутствует"
+    return vacancy_data
+
+
+def upgrade_legacy_records(data: List[Dict[str, Any]]) -> int:
+    """
+    Дополняет записи, сохранённые прежними версиями программы без поля id: ID hh.ru берётся из ссылки,
+    остальным записям назначается локальный ID. Прежние версии очищали описания при чтении, поэтому
+    в таких записях могла остаться разметка (<highlighttext> и сущности) — описание очищается здесь.
+    Прежние версии не проверяли дубликаты, поэтому копии одной вакансии (с одинаковым ключом) сливаются
+    в одну запись на месте первой копии, поля более поздних копий имеют приоритет.
+    Отсутствие id и есть признак прежнего формата: после обновления запись больше не очищается.
+    Записи изменяются на месте, на диск они попадают при следующей записи хранилища.
+    :return: Число дополненных записей.
+    """
+    legacy = [record for record in data if record.get("id") is None]
+    if not legacy:
+        return 0
+    last_local_id = max((local_id_number(record.get("id")) or 0 for record in data), default=0)
+    for record in legacy:
+        vacancy_id = hh_vacancy_id(record.get("link"))
+        if vacancy_id is None:
+            last_local_id += 1
+            vacancy_id = f"{LOCAL_ID_PREFIX}{last_local_id}"
+        record["id"] = vacancy_id
+        record["description"] = clean_html(record.get("description"))
+
+    positions: Dict[str, int] = {}
+    unique: List[Dict[str, Any]] = []
+    for record in data:
+        key = vacancy_key(record)
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(unique)
+            unique.append(record)
+        else:
+            unique[position] = merge_vacancy(unique[position], record)
+    data[:] = unique
+    return len(legacy)
+
+
+def validate_batch(vacancies: Iterable[Dict[str, Any]], clean: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Проверяет и очищает пакет вакансий.
+    :param vacancies: Вакансии для добавления.
+    :param clean: False — описания уже очищены от HTML (см. prepare_vacancy).
+    :return: Кортеж (корректные вакансии, число некорректных).
+    """
+    valid = []
+    invalid = 0
+    for vacancy_data in vacancies:
+        if not isinstance(vacancy_data, dict):
+            invalid += 1
+            continue
+        try:
+            valid.append(prepare_vacancy(vacancy_data, clean))
+        except ValueError:
+            invalid += 1
+    return valid, invalid
+
+
+def _match_words(
+    data: List[Dict[str, Any]], filter_words: List[str], match_all: bool = False
+) -> List[Dict[str, Any]]:
+    """Отбирает вакансии, в описании которых встречается хотя бы одно (или каждое) из слов как подстрока."""
+    if not filter_words:
+        return data
+
+    matches = all if match_all else any
+    words = [word.lower() for word in filter_words]
+    # Описания очищаются от HTML при сохранении (prepare_vacancy) или при загрузке записей прежнего формата
+    return [
+        v for v in data if isinstance(v, dict) and matches(
+            word in (v.get("description", "Описание отсутствует") or "Описание отсутствует").lower()
+            for word in words
+        )
+    ]
+
+
+def _match_salary(data: List[Dict[str, Any]], salary_range: Tuple[float, float]) -> List[Dict[str, Any]]:
+    """Отбирает вакансии, диапазон зарплаты которых (в рублях) пересекается с заданным."""
+    return [v for v in data if isinstance(v, dict) and salary_overlaps(v, salary_range)]
+
+
+def iter_json_array(file: IO[str], chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Разбирает JSON-массив верхнего уровня по одному элементу, читая файл порциями.
+    В памяти одновременно находится только текущая порция и разбираемый элемент.
+    Разбор останавливается на первой синтаксической ошибке (уже выданные элементы остаются в силе).
+    :param file: Текстовый файл, содержащий JSON-массив.
+    :param chunk_size: Размер порции чтения, символы.
+    :return: Итератор элементов массива.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size)
+    position = 0
+    eof = not buffer
+    started = False
+
+    while True:
+        # Пропускаем пробелы и разделители; при нехватке данных дочитываем порцию
+        while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ",")):
+            position += 1
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = file.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        if not started:
+            if buffer[position] != "[":
+                return
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                return
+            # Элемент не поместился в порцию: дочитываем и разбираем его заново
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if buffer[position] not in '{["' and not eof:
+            # Число на границе порции могло оборваться («1» из «1.5»): принимаем его, только увидев разделитель
+            delimiter = end
+            while delimiter < len(buffer) and buffer[delimiter].isspace():
+                delimiter += 1
+            if delimiter == len(buffer) or buffer[delimiter] not in ",]":
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+        position = end
+        yield item
+
+
+def word_matcher(
+    filter_words: List[str], match_all: bool = False, prefix: bool = False
+) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Строит проверку одной вакансии по ключевым словам с той же семантикой, что и инвертированный индекс:
+    слова сравниваются с токенами описания целиком (или как начала токенов при prefix=True).
+    Если в словах нет ни одного токена, проверяется вхождение подстроки. Общая для всех хранилищ.
+    """
+    tokens = list(dict.fromkeys(token for word in filter_words for token in tokenize(word)))
+    matches = all if match_all else any
+    if not tokens:
+        words = [word.lower() for word in filter_words]
+        return lambda v: matches(word in str(v.get("description") or "").lower() for word in words)
+
+    def match(vacancy: Dict[str, Any]) -> bool:
+        description_tokens = set(tokenize(str(vacancy.get("description") or "")))
+        if prefix:
+            return matches(any(candidate.startswith(token) for candidate in description_tokens) for token in tokens)
+        return matches(token in description_tokens for token in tokens)
+
+    return match
 
 
 class FileHandler(ABC):
     """Абстрактный класс для работы с файлами."""
 
+    _filename: str
+
+    @property
+    def filename(self) -> str:
+        """Путь к файлу данных (рядом с ним хранятся индексы и состояние синхронизации)."""
+        return self._filename
+
     @abstractmethod
     def add_vacancy(self, vacancy_data: Dict[str, Any]) -> None:
         """Добавляет вакансию в файл."""
         pass
 
     @abstractmethod
-    def delete_vacancy(self, vacancy_id: int) -> None:
+    def add_vacancies(self, vacancies: Iterable[Dict[str, Any]], clean: bool = True) -> Dict[str, int]:
+        """
+        Добавляет пакет вакансий и возвращает сводку added/updated/skipped/invalid.
+        clean=False — описания уже очищены от HTML и сохраняются как есть.
+        """
+        pass
+
+    @abstractmethod
+    def delete_vacancy(self, vacancy_id: Union[int, str]) -> None:
         """Удаляет вакансию из файла по ID."""
         pass
 
     @abstractmethod
-    def filter_vacancies(self, filter_words: List[str]) -> List[Dict[str, Any]]:
-        """Фильтрует вакансии по ключевым словам."""
+    def delete_vacancies(self, vacancy_ids: Iterable[Union[int, str]]) -> int:
+        """Удаляет вакансии по списку ID и возвращает число удалённых."""
         pass
 
     @abstractmethod
-    def filter_vacancies_by_salary(self, salary_range: Tuple[float, float]) -> List[Dict[str, Any]]:
-        """Фильтрует вакансии по диапазону зарплат."""
+    def filter_vacancies(
+        self, filter_words: List[str], match_all: bool = False, prefix: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Фильтрует вакансии по ключевым словам.
+        :param filter_words: Ключевые слова для фильтрации.
+        Во всех хранилищах слова ищутся в описании и сравниваются с его токенами целиком (регистр и «ё»
+        не учитываются, см. word_matcher); если в словах нет ни одного токена (например, «++»), ищется подстрока.
+        :param match_all: True — вакансия должна содержать все слова, False — хотя бы одно.
+        :param prefix: Совпадение слова с началом токена («pyth» найдёт «python»).
+        :return: Список словарей с отфильтрованными вакансиями.
+        """
+        pass
+
+    @abstractmethod
+    def filter_vacancies_by_salary(
+        self, salary_range: Tuple[float, float], offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Фильтрует вакансии, диапазон зарплаты которых (в рублях) пересекается с заданным.
+        :param salary_range: Кортеж (min_salary, max_salary).
+        :param offset: Сколько первых вакансий результата пропустить (для постраничного вывода).
+        :param limit: Максимальное число вакансий (None — все).
+        :return: Список отфильтрованных вакансий.
+        """
         pass
 
 
 class JSONFileHandler(FileHandler):
     """Класс для работы с JSON-файлами."""
 
-    def __init__(self, filename: str = "data/vacancies.json") -> None:
+    def __init__(
+        self, filename: str = "data/vacancies.json", cached: bool = False, query_cache: Optional[QueryCache] = None
+    ) -> None:
+        """
+        :param filename: Путь к JSON-файлу с вакансиями.
+        :param cached: Держать разобранные данные в памяти и перечитывать файл, только если изменились
+                       его размер или время изменения (например, другим процессом).
+        :param query_cache: Кэш результатов фильтров; None — фильтры всегда вычисляются заново.
+        """
         self._filename = filename
+        self._cached = cached
+        self._query_cache = query_cache
+        self._cache: Optional[List[Dict[str, Any]]] = None
+        self._cache_stamp: Optional[List[int]] = None
+        self._version = 0
+        self._seen_stamp: Optional[List[int]] = None
+        self._key_index: Optional[KeyIndex] = None
+        self._term_index: Optional[InvertedIndex] = None
+        self._salary_index: Optional[SalaryIndex] = None
+        self._index_stamp: Optional[List[int]] = None
+        self._write_lock = threading.Lock()
         self._ensure_file_exists()
 
     def _ensure_file_exists(self) -> None:
@@ -44,84 +308,758 @@ class JSONFileHandler(FileHandler):
             with open(self._filename, "w", encoding="utf-8") as file:
                 json.dump([], file)
 
-    def _load_data(self) -> List[Dict[str, Any]]:
-        """Загружает данные из JSON-файла."""
+    @property
+    def version(self) -> int:
+        """
+        Версия набора данных: увеличивается при каждом изменении файла — через этот обработчик
+        или в обход него. Подходит как ключ для кэшей, построенных поверх данных.
+        """
+        self._observe(file_stamp(self._filename))
+        return self._version
+
+    @property
+    def query_cache_stats(self) -> Optional[Dict[str, int]]:
+        """Счётчики попаданий, промахов и вытеснений кэша фильтров (None, если кэш не используется)."""
+        return self._query_cache.stats if self._query_cache is not None else None
+
+    def _observe(self, stamp: Optional[List[int]]) -> None:
+        """Учитывает текущий отпечаток файла и увеличивает версию, если файл изменился."""
+        if stamp != self._seen_stamp:
+            self._seen_stamp = stamp
+            self._version += 1
+
+    def _load_data(self, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Загружает данные из JSON-файла (в кэширующем режиме — только если файл изменился).
+        :param strict: Бросать ValueError для повреждённого файла вместо пустого списка
+                       (используется перед записью, чтобы не затереть данные). В кэширующем режиме
+                       возвращается копия списка: изменения попадают в кэш только после успешной записи (_commit).
+        """
+        stamp = file_stamp(self._filename)  # Отпечаток снимается до чтения, чтобы не пропустить запись
+        self._observe(stamp)
+        if self._cached and self._cache is not None and stamp is not None and stamp == self._cache_stamp:
+            return list(self._cache) if strict else self._cache
+        data = self._read_data(strict)
+        if self._cached:
+            self._cache, self._cache_stamp = data, stamp
+            return list(data) if strict else data
+        return data
+
+    @metrics.timed("json_load")
+    def _read_data(self, strict: bool = False) -> List[Dict[str, Any]]:
+        """Читает и разбирает JSON-файл."""
         try:
             with open(self._filename, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                # Убедимся, что данные - это список словарей
-                if isinstance(data, list) and all(isinstance(item, dict) for item in data):
-                    return data
-                else:
-                    return []  # Возвращаем пустой список, если данные некорректны
-        except (FileNotFoundError, json.JSONDecodeError):
+                text = file.read()
+        except FileNotFoundError:
             return []
+        if not text.strip():
+            return []
+        if metrics.enabled:
+            metrics.increment("file_read_bytes_total", len(text.encode("utf-8")))
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            if strict:
+                raise ValueError(f"Файл {self._filename} повреждён: {e}") from e
+            return []
+        # Убедимся, что данные - это список словарей
+        if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+            metrics.increment("records_loaded_total", len(data))
+            upgrade_legacy_records(data)
+            return data
+        if strict:
+            raise ValueError(f"Файл {self._filename} не содержит список вакансий.")
+        return []  # Возвращаем пустой список, если данные некорректны
+
+    def iter_vacancies(self) -> Iterator[Dict[str, Any]]:
+        """
+        Выдаёт вакансии по одной, разбирая файл порциями: память не зависит от размера файла,
+        а первая вакансия доступна сразу. Элементы массива, не являющиеся словарями, пропускаются.
+        """
+        count = 0
+        try:
+            with open(self._filename, "r", encoding="utf-8") as file:
+                for item in iter_json_array(file):
+                    if not isinstance(item, dict):
+                        continue
+                    if item.get("id") is None:
+                        # Файл прежнего формата: локальные ID зависят от всех записей, поэтому остаток
+                        # выдаётся из полной загрузки (после первой записи файл читается потоково)
+                        yield from self._load_data()[count:]
+                        return
+                    count += 1
+                    yield item
+        except FileNotFoundError:
+            return
 
+    def iter_filter(
+        self,
+        filter_words: Optional[List[str]] = None,
+        salary_range: Optional[Tuple[float, float]] = None,
+        match_all: bool = False,
+        prefix: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Лениво фильтрует вакансии по мере чтения файла, без загрузки всех записей и без индексов.
+        Вакансии выдаются в порядке хранения.
+        :param filter_words: Ключевые слова (как в filter_vacancies); None или пустой список — без фильтра.
+        :param salary_range: Кортеж (min_salary, max_salary); None — без фильтра.
+        :param match_all: True — описание должно содержать все слова, False — хотя бы одно.
+        :param prefix: Совпадение слова с началом токена.
+        :return: Итератор подходящих вакансий.
+        """
+        match_words = word_matcher(filter_words, match_all, prefix) if filter_words else None
+        for vacancy in self.iter_vacancies():
+            if salary_range is not None and not salary_overlaps(vacancy, salary_range):
+                continue
+            if match_words is None or match_words(vacancy):
+                yield vacancy
+
+    @metrics.timed("json_save")
     def _save_data(self, data: List[Dict[str, Any]]) -> None:
-        """Сохраняет данные в JSON-файл."""
-        with open(self._filename, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        """
+        Сохраняет данные в JSON-файл атомарно: запись идёт во временный файл, который затем заменяет основной.
+        При сбое посреди записи на диске остаётся прежняя версия файла.
+        """
+        tmp_path = f"{self._filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._filename)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        if metrics.enabled:
+            metrics.increment("file_written_bytes_total", os.path.getsize(self._filename))
+            metrics.increment("records_saved_total", len(data))
 
-    def add_vacancy(self, vacancy_data: Dict[str, Any]) -> None:
-        """Добавляет вакансию в JSON-файл."""
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Блокирует цикл «чтение — изменение — запись» от других потоков и процессов.
+        Между процессами используется рекомендательная блокировка fcntl файла <данные>.lock:
+        сам файл данных при сохранении заменяется, поэтому блокировать его нельзя.
+        """
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(f"{self._filename}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # Закрытие дескриптора снимает блокировку
 
-        # Проверка на наличие необходимых полей
-        required_fields = ['title', 'link', 'salary', 'description']
-        for field in required_fields:
-            if field not in vacancy_data:
-                raise ValueError(f"Вакансия должна содержать поле '{field}'.")
+    def _sidecar_path(self, kind: str) -> Path:
+        """Путь к файлу индекса, хранящемуся рядом с данными."""
+        return Path(self._filename).with_suffix(f".{kind}.idx")
 
-        # Если поле 'description' отсутствует, можно установить значение по умолчанию
-        vacancy_data["description"] = vacancy_data.get("description", "Описание отсутствует")
+    def _sync_indexes(self, data: List[Dict[str, Any]]) -> None:
+        """Сбрасывает индексы в памяти, если файл данных изменился в обход обработчика."""
+        stamp = file_stamp(self._filename)
+        if stamp is None or stamp != self._index_stamp or (
+            self._key_index is not None and self._key_index.count != len(data)
+        ):
+            self._key_index, self._term_index, self._salary_index = None, None, None
+            self._index_stamp = stamp
 
-        # Обработка HTML
-        vacancy_data["description"] = clean_html(vacancy_data["description"])
+    def _get_key_index(self, data: List[Dict[str, Any]]) -> KeyIndex:
+        """
+        Возвращает индекс ключей для текущих данных.
+        Индекс берётся из памяти или с диска, если файл данных не менялся, иначе перестраивается.
+        """
+        self._sync_indexes(data)
+        if self._key_index is None:
+            path = self._sidecar_path("keys")
+            index = KeyIndex.from_payload(load_sidecar(path, self._index_stamp), len(data))
+            if index is None:
+                index = KeyIndex.build(data)
+                index.reserve_local_ids(load_last_local_id(path))  # Номера удалённых вакансий не выдаются снова
+            self._key_index = index
+        return self._key_index
 
-        data = self._load_data()
-        if vacancy_data not in data:  # Проверка на дубликаты
-            data.append(vacancy_data)
+    def _get_term_index(self, data: List[Dict[str, Any]]) -> InvertedIndex:
+        """Возвращает инвертированный индекс описаний для текущих данных (из памяти, с диска или заново)."""
+        self._get_key_index(data)
+        if self._term_index is None:
+            index = InvertedIndex.from_payload(load_sidecar(self._sidecar_path("terms"), self._index_stamp), len(data))
+            self._term_index = index if index is not None else InvertedIndex.build(data)
+        return self._term_index
+
+    def _get_salary_index(self, data: List[Dict[str, Any]]) -> SalaryIndex:
+        """Возвращает отсортированный индекс зарплат (строится в памяти при первом обращении)."""
+        self._get_key_index(data)
+        if self._salary_index is None:
+            self._salary_index = SalaryIndex.build(data)
+        return self._salary_index
+
+    def _commit(self, data: List[Dict[str, Any]]) -> None:
+        """Сохраняет данные и индексы, привязанные к новой версии файла."""
+        try:
             self._save_data(data)
+        except Exception:
+            # Индексы уже обновлены под несохранённые данные: при следующем обращении они берутся с диска
+            self._key_index, self._term_index, self._salary_index = None, None, None
+            raise
+        self._index_stamp = file_stamp(self._filename)
+        # Версия растёт при каждой записи, даже если размер и время изменения файла совпали с прежними
+        self._seen_stamp = self._index_stamp
+        self._version += 1
+        if self._query_cache is not None:
+            self._query_cache.clear()
+        if self._cached:
+            self._cache, self._cache_stamp = data, self._index_stamp
+        for kind, index in (("keys", self._key_index), ("terms", self._term_index)):
+            if index is not None:
+                index.count = len(data)
+                save_sidecar(self._sidecar_path(kind), self._index_stamp, index.to_payload())
+
+    def _upsert(self, data: List[Dict[str, Any]], vacancy_data: Dict[str, Any]) -> str:
+        """
+        Добавляет вакансию или обновляет уже сохранённую с тем же ключом; индексы обновляются инкрементально.
+        :return: "added", "updated" или "skipped" (если данные не изменились).
+        """
+        index = self._get_key_index(data)
+        terms = self._get_term_index(data)
+        salaries = self._get_salary_index(data)
+        key = vacancy_key(vacancy_data)
+        position = index.get(key)
+        if position is None:
+            if vacancy_data.get("id") is None:
+                vacancy_data["id"] = index.next_local_id()  # Вакансия добавлена не с hh.ru
+            index.add(key, len(data), vacancy_data["id"])
+            terms.add(key, vacancy_data.get("description"))
+            salaries.add(key, salary_interval(vacancy_data))
+            data.append(vacancy_data)
+            return "added"
+        current = data[position]
+        merged = merge_vacancy(current, vacancy_data)
+        if merged == current:
+            return "skipped"
+        if merged.get("id") != current.get("id"):
+            index.set_id(position, current.get("id"), merged.get("id"))
+        if merged.get("description") != current.get("description"):
+            terms.remove(key, current.get("description"))
+            terms.add(key, merged.get("description"))
+        if salary_interval(merged) != salary_interval(current):
+            salaries.remove(key, salary_interval(current))
+            salaries.add(key, salary_interval(merged))
+        data[position] = merged
+        return "updated"
+
+    def add_vacancy(self, vacancy_data: Dict[str, Any]) -> None:
+        """Добавляет вакансию в JSON-файл или обновляет уже сохранённую (по ID hh.ru или ссылке)."""
+        prepare_vacancy(vacancy_data)
+
+        with self._locked():
+            data = self._load_data(strict=True)
+            status = self._upsert(data, vacancy_data)  # Проверка на дубликаты
+            if status == "skipped":
+                return
+            self._commit(data)
+        if status == "added":
             print(f"Вакансия '{vacancy_data['title']}' успешно добавлена.")
+        else:
+            print(f"Вакансия '{vacancy_data['title']}' обновлена.")
+
+    def add_vacancies(self, vacancies: Iterable[Dict[str, Any]], clean: bool = True) -> Dict[str, int]:
+        """
+        Добавляет пакет вакансий с одной загрузкой и одной записью файла.
+        :param vacancies: Вакансии для добавления.
+        :param clean: False — описания уже очищены от HTML (например, из parse_vacancies).
+        :return: Сводка: added — добавлено, updated — обновлено, skipped — без изменений,
+                 invalid — без обязательных полей.
+        """
+        valid, invalid = validate_batch(vacancies, clean)
+        summary = {"added": 0, "updated": 0, "skipped": 0, "invalid": invalid}
+
+        with self._locked():
+            data = self._load_data(strict=True)
+            for vacancy_data in valid:
+                summary[self._upsert(data, vacancy_data)] += 1
+            if summary["added"] or summary["updated"]:
+                self._commit(data)
+        return summary
 
-    def delete_vacancy(self, vacancy_id: int) -> None:
+    def delete_vacancy(self, vacancy_id: Union[int, str]) -> None:
         """Удаляет вакансию из JSON-файла по ID."""
-        data = self._load_data()
-        data = [v for v in data if v.get("id") != vacancy_id]
-        self._save_data(data)
-        print(f"Вакансия с ID {vacancy_id} удалена.")
+        if self.delete_vacancies([vacancy_id]):
+            print(f"Вакансия с ID {vacancy_id} удалена.")
+        else:
+            print(f"Вакансия с ID {vacancy_id} не найдена.")
+
+    def delete_vacancies(self, vacancy_ids: Iterable[Union[int, str]]) -> int:
+        """
+        Удаляет вакансии по списку ID.
+        Позиции находятся по индексу ID без просмотра записей; файл переписывается один раз на весь список.
+        :param vacancy_ids: ID вакансий (число или строка).
+        :return: Число удалённых вакансий.
+        """
+        with self._locked():
+            data, removed = self._remove(self._load_data(strict=True), vacancy_ids)
+            if any(removed):
+                self._commit(data)
+        return sum(removed)
+
+    def _remove(
+        self, data: List[Dict[str, Any]], vacancy_ids: Iterable[Union[int, str]]
+    ) -> Tuple[List[Dict[str, Any]], List[bool]]:
+        """
+        Удаляет вакансии из данных в памяти, обновляя индексы (без записи файла).
+        :return: Кортеж (новый список вакансий, признак удаления для каждого ID в порядке запроса).
+        """
+        index = self._get_key_index(data)
+        positions: Set[int] = set()
+        removed = []
+        for vacancy_id in vacancy_ids:
+            position = index.position_of_id(vacancy_id)
+            removed.append(position is not None and position not in positions)
+            if position is not None:
+                positions.add(position)
+        if not positions:
+            return data, removed
+        terms = self._get_term_index(data)
+        salaries = self._get_salary_index(data)
+        for position in positions:
+            key = vacancy_key(data[position])
+            terms.remove(key, data[position].get("description"))
+            salaries.remove(key, salary_interval(data[position]))
+        first = min(positions)
+        data = data[:first] + [v for position, v in enumerate(data[first:], first) if position not in positions]
+        index.remove_positions(data, first)
+        return data, removed
+
+    def apply_changes(self, operations: List[Tuple[str, Any]]) -> List[Any]:
+        """
+        Применяет последовательность добавлений и удалений с одной загрузкой и одной записью файла.
+        :param operations: Пары ("add", словарь вакансии) или ("delete", ID) в порядке выполнения.
+        :return: Результат каждой операции: для "add" — "added", "updated", "skipped" или "invalid",
+                 для "delete" — True, если вакансия удалена.
+        """
+        results: List[Any] = []
+        with self._locked():
+            data = self._load_data(strict=True)
+            changed = False
+            position = 0
+            while position < len(operations):
+                kind, payload = operations[position]
+                if kind == "delete":
+                    # Подряд идущие удаления выполняются одним проходом по списку
+                    end = position
+                    while end < len(operations) and operations[end][0] == "delete":
+                        end += 1
+                    data, removed = self._remove(data, [operation[1] for operation in operations[position:end]])
+                    changed = changed or any(removed)
+                    results.extend(removed)
+                    position = end
+                    continue
+                if kind != "add":
+                    raise ValueError(f"Неизвестная операция: {kind}.")
+                try:
+                    status = self._upsert(data, prepare_vacancy(payload))
+                except ValueError:
+                    status = "invalid"
+                changed = changed or status in ("added", "updated")
+                results.append(status)
+                position += 1
+            if changed:
+                self._commit(data)
+        return results
 
-    def filter_vacancies(self, filter_words: List[str]) -> List[Dict]:
+    @metrics.timed("filter_vacancies")
+    def filter_vacancies(
+        self, filter_words: List[str], match_all: bool = False, prefix: bool = False, substring: bool = False
+    ) -> List[Dict]:
         """
-        Фильтрует вакансии по ключевому слову в описании.
-        :param filter_word: Ключевое слово для фильтрации.
+        Фильтрует вакансии по ключевым словам в описании с помощью инвертированного индекса.
+        :param filter_words: Ключевые слова для фильтрации.
+        :param match_all: True — описание должно содержать все слова, False — хотя бы одно.
+        :param prefix: Совпадение слова с началом токена («pyth» найдёт «python»).
+        :param substring: Прежний режим: поиск подстроки в описании без индекса.
         :return: Список словарей с отфильтрованными вакансиями.
         """
+        if self._query_cache is None:
+            return self._filter_vacancies(filter_words, match_all, prefix, substring)
+        version = self.version
+        key = ("words", normalize_words(filter_words), match_all, prefix, substring)
+        result = self._query_cache.get(version, key)
+        if result is None:
+            result = self._filter_vacancies(filter_words, match_all, prefix, substring)
+            self._query_cache.put(version, key, result)
+        return list(result)
+
+    def _filter_vacancies(
+        self, filter_words: List[str], match_all: bool, prefix: bool, substring: bool
+    ) -> List[Dict[str, Any]]:
+        """Вычисляет результат filter_vacancies без кэша."""
         data = self._load_data()
         if not data or not isinstance(data, list):
             return []
 
-        # Если фильтр пуст, возвращаем все вакансии
+        # Если фильтр пуст, возвращаются все вакансии
         if not filter_words:
-            return data
+            return list(data)
+        if substring:
+            return _match_words(data, filter_words, match_all)
 
-        return [
-            v for v in data if isinstance(v, dict) and any(
-                word.lower() in (
-                    clean_html(v.get("description", "Описание отсутствует") or "Описание отсутствует")).lower()
-                for word in filter_words
-            )
-        ]
+        keys = self._get_term_index(data).search(filter_words, match_all, prefix)
+        if keys is None:
+            # В словах нет ни одного токена (например, «++»): ищем подстроку
+            return _match_words(data, filter_words, match_all)
+        index = self._get_key_index(data)
+        positions = sorted(position for position in map(index.get, keys) if position is not None)
+        return [data[position] for position in positions]
 
-    def filter_vacancies_by_salary(self, salary_range: Tuple[float, float]) -> List[Dict[str, Any]]:
+    @metrics.timed("filter_vacancies_by_salary")
+    def filter_vacancies_by_salary(
+        self, salary_range: Tuple[float, float], offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Фильтрует вакансии по диапазону зарплат.
+        Фильтрует вакансии, диапазон зарплаты которых (в рублях) пересекается с заданным, с помощью
+        интервального индекса.
         :param salary_range: Кортеж (min_salary, max_salary).
-        :return: Список отфильтрованных вакансий.
+        :param offset: Сколько первых вакансий диапазона пропустить (для постраничного вывода).
+        :param limit: Максимальное число вакансий (None — все).
+        :return: Список отфильтрованных вакансий по возрастанию нижней границы зарплаты.
         """
+        if self._query_cache is None:
+            return self._filter_vacancies_by_salary(salary_range, offset, limit)
+        version = self.version
+        key = ("salary", tuple(salary_range), offset, limit)
+        result = self._query_cache.get(version, key)
+        if result is None:
+            result = self._filter_vacancies_by_salary(salary_range, offset, limit)
+            self._query_cache.put(version, key, result)
+        return list(result)
+
+    def _filter_vacancies_by_salary(
+        self, salary_range: Tuple[float, float], offset: int, limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Вычисляет результат filter_vacancies_by_salary без кэша."""
         data = self._load_data()
         min_salary, max_salary = salary_range
+        index = self._get_key_index(data)
+        result = []
+        for _, key in self._get_salary_index(data).range(min_salary, max_salary, offset, limit):
+            position = index.get(key)
+            if position is not None:
+                result.append(data[position])
+        return result
+
+
+class GroupCommitWriter:
+    """
+    Объединяет добавления и удаления из многих потоков в общие записи файла (group commit).
+    Фоновый поток забирает накопившиеся операции и применяет их одним вызовом JSONFileHandler.apply_changes,
+    поэтому N потоков, добавляющих вакансии, вызывают не N перезаписей файла, а по одной на пакет.
+    """
+
+    _STOP = ("stop", None, None)
+
+    def __init__(self, handler: JSONFileHandler, max_batch: int = 1000, max_delay: float = 0.01) -> None:
+        """
+        :param handler: Хранилище, в которое записываются изменения.
+        :param max_batch: Максимальное число операций в одной записи.
+        :param max_delay: Сколько ждать новых операций после первой, прежде чем записывать пакет, секунды.
+        """
+        if max_batch < 1:
+            raise ValueError("Размер пакета должен быть положительным.")
+        self._handler = handler
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue: "queue.Queue[Tuple[str, Any, Optional[Future]]]" = queue.Queue()
+        self.commits = 0
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "GroupCommitWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add(self, vacancy_data: Dict[str, Any]) -> "Future":
+        """
+        Ставит вакансию в очередь на добавление.
+        :return: Future с результатом "added", "updated", "skipped" или "invalid".
+        """
+        return self._submit("add", vacancy_data)
+
+    def delete(self, vacancy_id: Union[int, str]) -> "Future":
+        """
+        Ставит вакансию в очередь на удаление.
+        :return: Future с True, если вакансия удалена.
+        """
+        return self._submit("delete", vacancy_id)
+
+    def _submit(self, kind: str, payload: Any) -> "Future":
+        # concurrent.futures тянет logging: загружаем его только при групповой записи
+        from concurrent.futures import Future
+
+        if not self._thread.is_alive():
+            raise RuntimeError("Запись уже остановлена.")
+        future: Future = Future()
+        self._queue.put((kind, payload, future))
+        return future
+
+    def flush(self) -> None:
+        """Ждёт, пока будут записаны все поставленные в очередь операции."""
+        self._submit("flush", None).result()
+
+    def close(self) -> None:
+        """Записывает оставшиеся операции и останавливает фоновый поток."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _collect(self) -> List[Tuple[str, Any, Optional["Future"]]]:
+        """Забирает первую операцию (с ожиданием) и всё, что успело накопиться за max_delay."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_delay
+        while len(batch) < self._max_batch and batch[-1][0] not in ("stop", "flush"):
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            operations = [(kind, payload) for kind, payload, _ in batch if kind in ("add", "delete")]
+            futures = [future for kind, _, future in batch if kind in ("add", "delete")]
+            if operations:
+                try:
+                    results = self._handler.apply_changes(operations)
+                    self.commits += 1
+                except Exception as e:
+                    for future in futures:
+                        cast("Future", future).set_exception(e)
+                else:
+                    for future, result in zip(futures, results):
+                        cast("Future", future).set_result(result)
+            for kind, _, future in batch:
+                if kind == "flush":
+                    cast("Future", future).set_result(None)
+            if batch[-1][0] == "stop":
+                return
+
+
+class JSONLinesFileHandler(FileHandler):
+    """
+    Хранилище вакансий в формате JSON Lines с дозаписью в конец файла.
+    Каждая вакансия — отдельная строка; удаление записывается строкой-«надгробием» {"_deleted": "<id>"}.
+    Файл только растёт, пока не вызван compact(). Уплотнённый журнал начинается строкой
+    {"_last_local_id": <n>}: номера локальных ID удалённых вакансий не выдаются повторно.
+    """
+
+    def __init__(self, filename: str = "data/vacancies.jsonl") -> None:
+        self._filename = filename
+        self._records: Dict[str, Dict[str, Any]] = {}  # Ключ вакансии -> актуальная версия записи
+        self._ids: Dict[str, str] = {}  # ID вакансии -> ключ вакансии
+        self._last_local_id = 0
+        self._offset = 0  # Позиция в файле, до которой журнал уже прочитан
+        self._ensure_file_exists()
+
+    def _ensure_file_exists(self) -> None:
+        """Создает файл, если он не существует."""
+        Path(self._filename).parent.mkdir(parents=True, exist_ok=True)
+        Path(self._filename).touch(exist_ok=True)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Применяет одну запись журнала к состоянию в памяти."""
+        if "_deleted" in record:
+            deleted_key = self._ids.pop(str(record["_deleted"]), None)
+            if deleted_key is not None:
+                del self._records[deleted_key]
+            return
+        if "_last_local_id" in record:
+            number = record["_last_local_id"]
+            if isinstance(number, int):
+                self._last_local_id = max(self._last_local_id, number)
+            return
+        # Более поздняя версия вакансии замещает предыдущую
+        key = vacancy_key(record)
+        previous_id = self._records.get(key, {}).get("id")
+        merged = merge_vacancy(self._records.get(key, {}), record)
+        self._records[key] = merged
+        if previous_id is not None and previous_id != merged.get("id"):
+            self._ids.pop(str(previous_id), None)
+        if merged.get("id") is not None:
+            self._ids[str(merged["id"])] = key
+            self._last_local_id = max(self._last_local_id, local_id_number(merged["id"]) or 0)
+
+    def _refresh(self) -> None:
+        """Дочитывает новые строки журнала (в том числе дописанные другими процессами)."""
+        try:
+            size = os.path.getsize(self._filename)
+        except OSError:
+            size = 0
+        if size < self._offset:
+            # Файл был уплотнён или пересоздан — читаем заново
+            self._records, self._ids, self._offset = {}, {}, 0
+        if size == self._offset:
+            return
+        with open(self._filename, "rb") as file:
+            file.seek(self._offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Незавершённая строка: запись ещё не дописана
+                self._offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict):
+                    self._apply(record)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Дописывает записи в конец журнала одной операцией записи."""
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(self._filename, "a", encoding="utf-8") as file:
+            file.write(payload)
+
+    def _load_data(self) -> List[Dict[str, Any]]:
+        """Возвращает актуальный список вакансий."""
+        self._refresh()
+        return list(self._records.values())
+
+    def _changes(self, vacancy_data: Dict[str, Any], pending: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """
+        Определяет, изменит ли запись состояние журнала.
+        :return: "added", "updated" или None, если такая версия вакансии уже сохранена.
+        """
+        key = vacancy_key(vacancy_data)
+        current = pending.get(key, self._records.get(key))
+        if current is None:
+            status = "added"
+            if vacancy_data.get("id") is None:
+                # Вакансия добавлена не с hh.ru
+                self._last_local_id += 1
+                vacancy_data["id"] = f"{LOCAL_ID_PREFIX}{self._last_local_id}"
+            pending[key] = dict(vacancy_data)
+            return status
+        merged = merge_vacancy(current, vacancy_data)
+        if merged == current:
+            return None
+        pending[key] = merged
+        return "updated"
+
+    def add_vacancy(self, vacancy_data: Dict[str, Any]) -> None:
+        """Добавляет вакансию одной строкой в конец журнала (новая версия замещает прежнюю)."""
+        prepare_vacancy(vacancy_data)
+        self._refresh()
+        status = self._changes(vacancy_data, {})  # Проверка на дубликаты
+        if status is None:
+            return
+        self._append([vacancy_data])
+        self._refresh()
+        if status == "added":
+            print(f"Вакансия '{vacancy_data['title']}' успешно добавлена.")
+        else:
+            print(f"Вакансия '{vacancy_data['title']}' обновлена.")
+
+    def add_vacancies(self, vacancies: Iterable[Dict[str, Any]], clean: bool = True) -> Dict[str, int]:
+        """
+        Добавляет пакет вакансий одной дозаписью в журнал.
+        :param vacancies: Вакансии для добавления.
+        :param clean: False — описания уже очищены от HTML (например, из parse_vacancies).
+        :return: Сводка: added — добавлено, updated — обновлено, skipped — без изменений,
+                 invalid — без обязательных полей.
+        """
+        valid, invalid = validate_batch(vacancies, clean)
+        summary = {"added": 0, "updated": 0, "skipped": 0, "invalid": invalid}
+
+        self._refresh()
+        pending: Dict[str, Dict[str, Any]] = {}
+        accepted = []
+        for vacancy_data in valid:
+            status = self._changes(vacancy_data, pending)
+            if status is None:
+                summary["skipped"] += 1
+                continue
+            summary[status] += 1
+            accepted.append(vacancy_data)
+        if accepted:
+            self._append(accepted)
+            self._refresh()
+        return summary
+
+    def delete_vacancy(self, vacancy_id: Union[int, str]) -> None:
+        """Записывает в журнал «надгробие» для вакансии с указанным ID."""
+        if self.delete_vacancies([vacancy_id]):
+            print(f"Вакансия с ID {vacancy_id} удалена.")
+        else:
+            print(f"Вакансия с ID {vacancy_id} не найдена.")
+
+    def delete_vacancies(self, vacancy_ids: Iterable[Union[int, str]]) -> int:
+        """
+        Записывает «надгробия» для существующих вакансий из списка ID одной дозаписью.
+        :return: Число удалённых вакансий.
+        """
+        self._refresh()
+        existing = list(dict.fromkeys(str(vacancy_id) for vacancy_id in vacancy_ids if str(vacancy_id) in self._ids))
+        if existing:
+            self._append([{"_deleted": vacancy_id} for vacancy_id in existing])
+            self._refresh()
+        return len(existing)
+
+    def filter_vacancies(
+        self, filter_words: List[str], match_all: bool = False, prefix: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Фильтрует вакансии по ключевым словам в описании (просмотром всех записей, см. word_matcher)."""
+        data = self._load_data()
+        if not filter_words:
+            return data
+        return list(filter(word_matcher(filter_words, match_all, prefix), data))
+
+    def filter_vacancies_by_salary(
+        self, salary_range: Tuple[float, float], offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Фильтрует вакансии по диапазону зарплат (в порядке записей в журнале)."""
+        matched = _match_salary(self._load_data(), salary_range)
+        return matched[offset:] if limit is None else matched[offset:offset + limit]
+
+    def compact(self) -> int:
+        """
+        Переписывает журнал, оставляя только актуальные вакансии.
+        :return: Число вакансий в уплотнённом файле.
+        """
+        records = self._load_data()
+        tmp_filename = f"{self._filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as file:
+            if self._last_local_id:
+                # Удалённые записи отбрасываются, а с ними и выданные им локальные ID: номер сохраняется отдельно
+                file.write(json.dumps({"_last_local_id": self._last_local_id}) + "\n")
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_filename, self._filename)
+        self._offset = os.path.getsize(self._filename)
+        return len(records)
+
 
-        return [
-            v for v in data if isinstance(v, dict) and isinstance(v.get("salary"), (float, int)) and min_salary <= v[
-                "salary"] <= max_salary
-        ]
+def convert_json_to_jsonl(
+    json_filename: str = "data/vacancies.json", jsonl_filename: str = "data/vacancies.jsonl"
+) -> int:
+    """
+    Переносит вакансии из JSON-файла (массив) в журнал JSON Lines.
+    :param json_filename: Исходный файл в формате JSONFileHandler.
+    :param jsonl_filename: Файл журнала; перезаписывается.
+    :return: Число перенесённых вакансий.
+    """
+    count = 0
+    source = JSONFileHandler(json_filename)
+    Path(jsonl_filename).parent.mkdir(parents=True, exist_ok=True)
+    with open(jsonl_filename, "w", encoding="utf-8") as file:
+        last_local_id = load_last_local_id(source._sidecar_path("keys"))
+        if last_local_id:
+            file.write(json.dumps({"_last_local_id": last_local_id}) + "\n")
+        for record in source.iter_vacancies():
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
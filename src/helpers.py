@@ -1,17 +1,46 @@
+import html
 import re
-from typing import Optional
+from typing import Iterable, List, Optional
+
+# Блочные теги заменяются пробелом, чтобы не склеивать слова соседних абзацев и пунктов списка
+_BLOCK_TAG = re.compile(
+    r"</?(?:[Bb][Rr]|[Pp]|[Dd][Ii][Vv]|[Ll][Ii]|[Uu][Ll]|[Oo][Ll]|[Tt][RrDdHh]|[Hh][1-6])\b[^<>]*>"
+)
+# Тегом считается только «<» с именем, «/», «!» или «?» — так «опыт <3 лет» и «a < b > c» не пострадают
+_TAG = re.compile(r"<[A-Za-z/!?][^<>]*>")
 
 
 def clean_html(raw_html: Optional[str]) -> str:
     """
-    Удаляет HTML-теги из строки.
+    Преобразует HTML-фрагмент в простой текст: удаляет теги (в том числе <highlighttext> из ответов hh.ru),
+    декодирует сущности (&nbsp;, &amp; и др.) и сводит пробельные символы к одному пробелу.
+    Функция применяется к описанию ровно один раз, там, где оно получено (parse_vacancies, Vacancy,
+    хранилище при clean=True): декодированные «&lt;b&gt;» становятся текстом «<b>», и повторная очистка
+    удалила бы его. Сохранённые описания поэтому при чтении и фильтрации не очищаются.
     :param raw_html: Строка с HTML-тегами или None.
     :return: Чистая строка без HTML-тегов или "Описание отсутствует", если входная строка None.
     """
     if raw_html is None or not raw_html:
         return "Описание отсутствует"
-    clean_text = re.sub(r"<.*?>", "", raw_html)  # Удаляем все теги между <>
-    return clean_text.strip()
+    # Подсветку hh.ru убираем заменой строк: это самый частый тег и самый дешёвый способ
+    text = raw_html.replace("<highlighttext>", "").replace("</highlighttext>", "")
+    if "<" in text:
+        text = _TAG.sub("", _BLOCK_TAG.sub(" ", text))
+    if "&" in text:
+        text = html.unescape(text)
+    # isprintable() ложно для переводов строк, табуляций и неразрывных пробелов
+    if "  " in text or not text.isprintable():
+        return " ".join(text.split())
+    return text.strip()
+
+
+def clean_html_many(raw_htmls: Iterable[Optional[str]]) -> List[str]:
+    """
+    Пакетный вариант clean_html для множества описаний (например, всех вакансий страницы ответа API).
+    :param raw_htmls: Строки с HTML-тегами или None.
+    :return: Список очищенных строк в том же порядке.
+    """
+    return [clean_html(raw_html) for raw_html in raw_htmls]
 
 
 def parse_salary_range(salary_range_input: str) -> tuple:
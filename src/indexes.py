@@ -0,0 +1,466 @@
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+from src.salary import BASE_CURRENCY, salary_interval
+
+_HH_VACANCY_LINK = re.compile(r"^(?:[\w-]+\.)*hh\.ru/vacancy/(\d+)$")
+_TOKEN = re.compile(r"\w+")
+LOCAL_ID_PREFIX = "local-"  # Префикс ID вакансий, добавленных вручную (не с hh.ru)
+# Версия формата индексов на диске: при её смене сохранённые индексы перестраиваются.
+# 2 — записи прежнего формата (без id) получают ID при загрузке, 3 — и очищенное описание.
+SIDECAR_VERSION = 3
+
+
+def local_id_number(vacancy_id: Any) -> Optional[int]:
+    """Возвращает номер локального ID вида local-<n> или None для прочих ID."""
+    if isinstance(vacancy_id, str) and vacancy_id.startswith(LOCAL_ID_PREFIX):
+        number = vacancy_id[len(LOCAL_ID_PREFIX):]
+        return int(number) if number.isdigit() else None
+    return None
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Разбивает текст на токены для поиска.
+    Регистр приводится через casefold (в том числе для кириллицы), «ё» считается равной «е».
+    """
+    if not text:
+        return []
+    return _TOKEN.findall(text.casefold().replace("ё", "е"))
+
+
+def canonical_link(link: str) -> str:
+    """
+    Приводит ссылку на вакансию к каноническому виду.
+    Схема, «www.», параметры запроса, якорь и завершающий слэш не учитываются.
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def vacancy_key(vacancy_data: Dict[str, Any]) -> str:
+    """
+    Возвращает ключ вакансии для поиска дубликатов.
+    Приоритет: ID hh.ru (поле id или ссылка вида hh.ru/vacancy/<id>), затем каноническая ссылка,
+    затем полное содержимое записи. Локальные ID не участвуют: они назначаются уже после проверки.
+    """
+    vacancy_id = vacancy_data.get("id")
+    if vacancy_id is not None and local_id_number(vacancy_id) is None:
+        return f"id:{vacancy_id}"
+    link = vacancy_data.get("link")
+    if isinstance(link, str) and link.lower().startswith("http"):
+        canonical = canonical_link(link)
+        match = _HH_VACANCY_LINK.match(canonical)
+        return f"id:{match.group(1)}" if match else f"link:{canonical}"
+    return "raw:" + json.dumps(vacancy_data, ensure_ascii=False, sort_keys=True)
+
+
+def hh_vacancy_id(link: Any) -> Optional[str]:
+    """ID вакансии hh.ru из ссылки вида hh.ru/vacancy/<id> или None для прочих ссылок."""
+    if not isinstance(link, str) or not link.lower().startswith("http"):
+        return None
+    match = _HH_VACANCY_LINK.match(canonical_link(link))
+    return match.group(1) if match else None
+
+
+def file_stamp(filename: str) -> Optional[List[int]]:
+    """Отпечаток состояния файла: размер и время изменения в наносекундах."""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_sidecar(path: Path, stamp: Optional[List[int]]) -> Optional[Any]:
+    """
+    Загружает сохранённый рядом с данными индекс.
+    :return: Содержимое индекса или None, если файла нет, он повреждён или построен для другой версии данных.
+    """
+    if stamp is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            payload = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("stamp") != stamp or payload.get("version") != SIDECAR_VERSION:
+        return None
+    return payload.get("index")
+
+
+def load_last_local_id(path: Path) -> int:
+    """
+    Читает из сохранённого индекса ключей наибольший выданный номер локального ID.
+    В отличие от самого индекса, номер годится и для изменившегося файла данных: номера только растут,
+    поэтому ID удалённых вакансий не выдаются повторно.
+    :return: Номер или 0, если файла нет или он повреждён.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            payload = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    index = payload.get("index") if isinstance(payload, dict) else None
+    number = index.get("last_local_id") if isinstance(index, dict) else None
+    return number if isinstance(number, int) and not isinstance(number, bool) else 0
+
+
+def save_sidecar(path: Path, stamp: Optional[List[int]], index: Any) -> None:
+    """Сохраняет индекс рядом с данными вместе с отпечатком файла данных."""
+    if stamp is None:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"version": SIDECAR_VERSION, "stamp": stamp, "index": index}, file, ensure_ascii=False)
+    except OSError:
+        pass  # Индекс можно перестроить по данным, ошибка записи не критична
+
+
+class KeyIndex:
+    """
+    Хэш-индексы «ключ вакансии -> позиция» и «ID -> позиция» для проверки дубликатов
+    и поиска вакансии за O(1).
+    """
+
+    def __init__(
+        self,
+        positions: Optional[Dict[str, int]] = None,
+        ids: Optional[Dict[str, int]] = None,
+        count: int = 0,
+        last_local_id: int = 0,
+    ) -> None:
+        self._positions: Dict[str, int] = positions or {}
+        self._ids: Dict[str, int] = ids or {}
+        self.count = count  # Число записей в данных, для которых построен индекс
+        # Наибольший выданный номер локального ID, в том числе у уже удалённых вакансий
+        self._last_local_id = max(
+            last_local_id, max((local_id_number(vacancy_id) or 0 for vacancy_id in self._ids), default=0)
+        )
+
+    @classmethod
+    def build(cls, data: List[Dict[str, Any]]) -> "KeyIndex":
+        """Строит индекс по списку вакансий."""
+        index = cls()
+        index._index_from(data, 0)
+        return index
+
+    def _index_from(self, data: List[Dict[str, Any]], start: int) -> None:
+        """Индексирует записи, начиная с позиции start."""
+        for position in range(start, len(data)):
+            self.add(vacancy_key(data[position]), position, data[position].get("id"))
+        self.count = len(data)
+
+    @classmethod
+    def from_payload(cls, payload: Any, count: int) -> Optional["KeyIndex"]:
+        """Восстанавливает индекс из сохранённого вида, если он соответствует данным."""
+        if not isinstance(payload, dict) or payload.get("count") != count:
+            return None
+        positions, ids = payload.get("keys"), payload.get("ids")
+        for mapping in (positions, ids):
+            if not isinstance(mapping, dict) or not all(
+                isinstance(position, int) and 0 <= position < count for position in mapping.values()
+            ):
+                return None
+        last_local_id = payload.get("last_local_id")
+        return cls(positions, ids, count, last_local_id if isinstance(last_local_id, int) else 0)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Представление индекса для сохранения в JSON."""
+        return {"count": self.count, "keys": self._positions, "ids": self._ids, "last_local_id": self._last_local_id}
+
+    def get(self, key: str) -> Optional[int]:
+        """Возвращает позицию вакансии по ключу."""
+        return self._positions.get(key)
+
+    def position_of_id(self, vacancy_id: Any) -> Optional[int]:
+        """Возвращает позицию вакансии по её ID."""
+        return self._ids.get(str(vacancy_id))
+
+    def add(self, key: str, position: int, vacancy_id: Any = None) -> None:
+        """Добавляет ключ и ID новой записи."""
+        self._positions.setdefault(key, position)
+        if vacancy_id is not None:
+            self._ids.setdefault(str(vacancy_id), position)
+            self._last_local_id = max(self._last_local_id, local_id_number(vacancy_id) or 0)
+        self.count = max(self.count, position + 1)
+
+    def set_id(self, position: int, old_id: Any, new_id: Any) -> None:
+        """Обновляет ID записи на позиции position (например, локальный ID заменён ID hh.ru)."""
+        if old_id is not None and self._ids.get(str(old_id)) == position:
+            del self._ids[str(old_id)]
+        if new_id is not None:
+            self._ids[str(new_id)] = position
+
+    def reserve_local_ids(self, last_local_id: int) -> None:
+        """Учитывает номера локальных ID до last_local_id включительно как уже выданные."""
+        self._last_local_id = max(self._last_local_id, last_local_id)
+
+    def next_local_id(self) -> str:
+        """Выдаёт новый локальный ID для вакансии, добавленной не с hh.ru."""
+        self._last_local_id += 1
+        return f"{LOCAL_ID_PREFIX}{self._last_local_id}"
+
+    def remove_positions(self, data: List[Dict[str, Any]], start: int) -> None:
+        """
+        Обновляет индекс после удаления записей.
+        :param data: Данные после удаления.
+        :param start: Наименьшая позиция удалённой записи; записи до неё не сдвинулись.
+        """
+        self._positions = {key: position for key, position in self._positions.items() if position < start}
+        self._ids = {vacancy_id: position for vacancy_id, position in self._ids.items() if position < start}
+        self._index_from(data, start)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс «токен описания -> ключи вакансий».
+    Поддерживает поиск любого или всех слов, а также поиск по префиксу токена.
+    """
+
+    def __init__(self, postings: Optional[Dict[str, Set[str]]] = None, count: int = 0) -> None:
+        self._postings: Dict[str, Set[str]] = postings or {}
+        self._sorted_tokens: Optional[List[str]] = None  # Строится лениво для поиска по префиксу
+        self.count = count  # Число записей в данных, для которых построен индекс
+
+    @classmethod
+    def build(cls, data: List[Dict[str, Any]]) -> "InvertedIndex":
+        """Строит индекс по описаниям вакансий."""
+        index = cls(count=len(data))
+        for vacancy_data in data:
+            index.add(vacancy_key(vacancy_data), vacancy_data.get("description"))
+        return index
+
+    @classmethod
+    def from_payload(cls, payload: Any, count: int) -> Optional["InvertedIndex"]:
+        """Восстанавливает индекс из сохранённого вида, если он соответствует данным."""
+        if not isinstance(payload, dict) or payload.get("count") != count:
+            return None
+        postings = payload.get("postings")
+        if not isinstance(postings, dict) or not all(isinstance(keys, list) for keys in postings.values()):
+            return None
+        return cls({token: set(keys) for token, keys in postings.items()}, count)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Представление индекса для сохранения в JSON."""
+        return {"count": self.count, "postings": {token: sorted(keys) for token, keys in self._postings.items()}}
+
+    @staticmethod
+    def _tokens(text: Optional[str]) -> Set[str]:
+        return set(tokenize(text))  # Описания очищаются от HTML при сохранении
+
+    def add(self, key: str, text: Optional[str]) -> None:
+        """Индексирует текст записи с ключом key."""
+        for token in self._tokens(text):
+            keys = self._postings.get(token)
+            if keys is None:
+                self._postings[token] = {key}
+                self._sorted_tokens = None
+            else:
+                keys.add(key)
+
+    def remove(self, key: str, text: Optional[str]) -> None:
+        """Удаляет из индекса текст записи с ключом key."""
+        for token in self._tokens(text):
+            keys = self._postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._postings[token]
+                self._sorted_tokens = None
+
+    def _lookup(self, token: str, prefix: bool) -> Set[str]:
+        """Ключи записей, содержащих токен (или токены, начинающиеся с него)."""
+        if not prefix:
+            return self._postings.get(token, set())
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        keys: Set[str] = set()
+        for position in range(bisect_left(self._sorted_tokens, token), len(self._sorted_tokens)):
+            candidate = self._sorted_tokens[position]
+            if not candidate.startswith(token):
+                break
+            keys |= self._postings[candidate]
+        return keys
+
+    def search(self, words: Iterable[str], match_all: bool = False, prefix: bool = False) -> Optional[Set[str]]:
+        """
+        Ищет записи по словам.
+        :param words: Слова запроса.
+        :param match_all: True — запись должна содержать все слова, False — хотя бы одно.
+        :param prefix: Искать токены, начинающиеся со слова, а не только точные совпадения.
+        :return: Множество ключей или None, если в словах нет ни одного токена.
+        """
+        tokens = list(dict.fromkeys(token for word in words for token in tokenize(word)))
+        if not tokens:
+            return None
+        result: Optional[Set[str]] = None
+        for token in tokens:
+            keys = self._lookup(token, prefix)
+            if result is None:
+                result = set(keys)
+            elif match_all:
+                result &= keys
+            else:
+                result |= keys
+            if match_all and not result:
+                break
+        return result
+
+
+def numeric_salary(vacancy_data: Dict[str, Any]) -> Optional[float]:
+    """
+    Числовая зарплата вакансии в рублях (нижняя граница диапазона) или None
+    («Зарплата не указана», нечисловые значения, неизвестная валюта).
+    """
+    if vacancy_data.get("currency") not in (None, BASE_CURRENCY):
+        interval = salary_interval(vacancy_data)
+        return interval[0] if interval is not None else None
+    # Рублёвая зарплата (частый случай при сортировке): нижняя граница — salary, а без неё — salary_to
+    for field in ("salary", "salary_to"):
+        salary = vacancy_data.get(field)
+        if not isinstance(salary, bool) and isinstance(salary, (int, float)) and salary == salary:
+            return float(salary)
+    return None
+
+
+Interval = Tuple[float, float]
+
+
+def _as_interval(salary: Union[float, Interval, None]) -> Optional[Interval]:
+    """Диапазон из пары границ или из одной суммы (точка)."""
+    if salary is None or isinstance(salary, tuple):
+        return salary
+    return float(salary), float(salary)
+
+
+def _width_class(low: float, high: float) -> int:
+    """Класс ширины диапазона: 0 — точка, далее ширины растут вдвое от класса к классу."""
+    width = high - low
+    return 0 if width <= 0 else max(1, int(width).bit_length())
+
+
+class SalaryIndex:
+    """
+    Интервальный индекс зарплат (в рублях) на отсортированных концах диапазонов.
+    Диапазоны разложены по классам ширины (точки, 1-2 тыс., 2-4 тыс. и т. д.); в каждом классе — параллельные
+    списки, отсортированные по нижней границе, и наибольшая ширина. Диапазон класса пересекается с запросом
+    [min, max], только если его нижняя граница лежит в [min - наибольшая ширина, max], поэтому запрос — два
+    бинарных поиска на класс и проверка верхней границы у кандидатов. Ширины в классе отличаются не больше чем
+    вдвое, так что лишних кандидатов мало даже при очень широких диапазонах в соседних классах.
+    Вакансии с одной суммой — точки: для них пересечение совпадает с попаданием в диапазон.
+    """
+
+    def __init__(self) -> None:
+        # Класс ширины -> [нижние границы, верхние границы, ключи, наибольшая ширина]
+        self._classes: Dict[int, List[Any]] = {}
+        self._size = 0
+
+    @classmethod
+    def build(cls, data: List[Dict[str, Any]]) -> "SalaryIndex":
+        """Строит индекс по списку вакансий."""
+        index = cls()
+        seen: Set[str] = set()
+        groups: Dict[int, List[Tuple[float, float, str]]] = {}
+        for vacancy_data in data:
+            key = vacancy_key(vacancy_data)
+            interval = salary_interval(vacancy_data)
+            if interval is not None and key not in seen:  # Дубликаты по ключу индексируются один раз
+                seen.add(key)
+                groups.setdefault(_width_class(*interval), []).append((interval[0], interval[1], key))
+        for width_class, triples in groups.items():
+            triples.sort()
+            index._classes[width_class] = [
+                [low for low, _, _ in triples],
+                [high for _, high, _ in triples],
+                [key for _, _, key in triples],
+                max(high - low for low, high, _ in triples),
+            ]
+            index._size += len(triples)
+        return index
+
+    def add(self, key: str, salary: Union[float, Interval, None]) -> None:
+        """
+        Добавляет вакансию с ключом key (вакансии без зарплаты не индексируются).
+        :param salary: Диапазон (минимум, максимум) из salary_interval или одна сумма.
+        """
+        interval = _as_interval(salary)
+        if interval is None:
+            return
+        low, high = interval
+        group = self._classes.setdefault(_width_class(low, high), [[], [], [], 0.0])
+        position = bisect_right(group[0], low)
+        group[0].insert(position, low)
+        group[1].insert(position, high)
+        group[2].insert(position, key)
+        group[3] = max(group[3], high - low)
+        self._size += 1
+
+    def remove(self, key: str, salary: Union[float, Interval, None]) -> None:
+        """Удаляет вакансию с ключом key из индекса (salary — как при добавлении)."""
+        interval = _as_interval(salary)
+        if interval is None:
+            return
+        group = self._classes.get(_width_class(*interval))
+        if group is None:
+            return
+        lows, highs, keys = group[0], group[1], group[2]
+        for position in range(bisect_left(lows, interval[0]), bisect_right(lows, interval[0])):
+            if keys[position] == key:
+                del lows[position], highs[position], keys[position]
+                self._size -= 1
+                return
+
+    @staticmethod
+    def _class_overlapping(group: List[Any], min_salary: float, max_salary: float) -> Iterator[Tuple[float, str]]:
+        """Пары (нижняя граница, ключ) пересекающихся диапазонов одного класса ширины по возрастанию."""
+        lows, highs, keys, max_width = group
+        for position in range(bisect_left(lows, min_salary - max_width), bisect_right(lows, max_salary)):
+            if highs[position] >= min_salary:
+                yield lows[position], keys[position]
+
+    def _overlapping(self, min_salary: float, max_salary: float) -> List[Iterator[Tuple[float, str]]]:
+        """Для каждого класса ширины — пары (нижняя граница, ключ) пересекающихся диапазонов по возрастанию."""
+        return [self._class_overlapping(group, min_salary, max_salary) for group in self._classes.values()]
+
+    def range(
+        self, min_salary: float, max_salary: float, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Tuple[float, str]]:
+        """
+        Возвращает вакансии, диапазон зарплат которых пересекается с [min_salary, max_salary],
+        по возрастанию нижней границы.
+        :param offset: Сколько первых совпадений пропустить.
+        :param limit: Максимальное число результатов (None — без ограничения).
+        :return: Список пар (нижняя граница зарплаты, ключ вакансии).
+        """
+        matches = heapq.merge(*self._overlapping(min_salary, max_salary), key=itemgetter(0))
+        stop = None if limit is None else max(offset, 0) + max(limit, 0)
+        return list(islice(matches, max(offset, 0), stop))
+
+    def count(self, min_salary: float, max_salary: float) -> int:
+        """Число вакансий, диапазон зарплат которых пересекается с [min_salary, max_salary]."""
+        return sum(sum(1 for _ in matches) for matches in self._overlapping(min_salary, max_salary))
+
+    def __len__(self) -> int:
+        return self._size
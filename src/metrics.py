@@ -0,0 +1,176 @@
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar, cast
+
+# Границы корзин гистограммы длительности, секунды (как у клиентов Prometheus по умолчанию)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Histogram:
+    """Накопитель гистограммы одной операции: счётчики корзин, сумма и количество замеров."""
+
+    __slots__ = ["buckets", "total", "count"]
+
+    def __init__(self) -> None:
+        self.buckets: List[int] = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Значение для формата Prometheus без потери точности: целые — всеми цифрами, дробные — через repr."""
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metrics:
+    """
+    Реестр метрик: гистограммы длительности операций и счётчики (байты, записи, статусы HTTP, повторы).
+    По умолчанию выключен: замеры сводятся к проверке одного флага.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[str, _Histogram] = {}
+
+    def enable(self) -> None:
+        """Включает сбор метрик."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключает сбор метрик (накопленные значения сохраняются)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Удаляет накопленные значения."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Увеличивает счётчик name с метками labels."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """Добавляет длительность операции в её гистограмму."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = _Histogram()
+            histogram.buckets[bisect_left(BUCKETS, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[None]:
+        """Контекстный менеджер, замеряющий длительность блока."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, time.perf_counter() - started)
+
+    def timed(self, operation: str) -> Callable[[F], F]:
+        """Декоратор, замеряющий длительность вызовов функции или метода."""
+
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(operation, time.perf_counter() - started)
+
+            return cast(F, wrapper)
+
+        return decorator
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Снимок метрик в виде словаря для JSON."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = {
+                operation: {
+                    "buckets": {
+                        str(bound): count for bound, count in zip(BUCKETS + ("+Inf",), histogram.buckets)
+                    },
+                    "sum": histogram.total,
+                    "count": histogram.count,
+                }
+                for operation, histogram in sorted(self._histograms.items())
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE vacancies_{name} counter")
+                for (counter, labels), value in sorted(self._counters.items()):
+                    if counter == name:
+                        lines.append(f"vacancies_{name}{_format_labels(labels)} {_format_value(value)}")
+            if self._histograms:
+                lines.append("# TYPE vacancies_operation_seconds histogram")
+            for operation, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, bucket in zip(BUCKETS + ("+Inf",), histogram.buckets):
+                    cumulative += bucket
+                    label_text = _format_labels((("le", str(bound)), ("operation", operation)))
+                    lines.append(f"vacancies_operation_seconds_bucket{label_text} {cumulative}")
+                label_text = _format_labels((("operation", operation),))
+                lines.append(f"vacancies_operation_seconds_sum{label_text} {_format_value(histogram.total)}")
+                lines.append(f"vacancies_operation_seconds_count{label_text} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """
+        Сохраняет метрики в файл: текстовый формат Prometheus для расширений .prom и .txt, иначе JSON.
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.suffix in (".prom", ".txt"):
+            target.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            target.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=4), encoding="utf-8")
+
+
+# Общий реестр, в который пишут HeadHunterAPI и хранилища
+metrics = Metrics()
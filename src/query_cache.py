@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def normalize_words(filter_words: Iterable[str]) -> Tuple[str, ...]:
+    """Приводит ключевые слова к виду, не зависящему от порядка, регистра и лишних пробелов."""
+    return tuple(sorted({" ".join(word.casefold().split()) for word in filter_words} - {""}))
+
+
+class QueryCache:
+    """
+    Ограниченный кэш результатов фильтров в памяти.
+    При переполнении вытесняется запись, к которой дольше всего не обращались (LRU).
+    В ключ входит версия набора данных, поэтому результаты по устаревшим данным никогда не возвращаются.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        """
+        :param max_entries: Максимальное число хранимых результатов.
+        """
+        if max_entries < 1:
+            raise ValueError("Размер кэша должен быть положительным.")
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, version: int, key: Hashable) -> Optional[Any]:
+        """
+        Ищет результат запроса.
+        :param version: Текущая версия набора данных; при её смене кэш очищается.
+        :param key: Нормализованный ключ запроса.
+        :return: Сохранённый результат или None.
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, version: int, key: Hashable, result: Any) -> None:
+        """Сохраняет результат запроса, вычисленный для версии данных version."""
+        with self._lock:
+            if version != self._version:
+                return  # Данные изменились, пока вычислялся результат
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Удаляет все результаты."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Счётчики обращений к кэшу."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
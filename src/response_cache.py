@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Дисковый кэш ответов API.
+    Каждый ответ хранится в отдельном JSON-файле, имя которого — хэш URL и параметров.
+    Время последнего обращения к записи — это mtime файла, по нему вытесняются старые записи (LRU).
+    """
+
+    def __init__(self, directory: str = "data/http_cache", ttl: float = 600.0, max_entries: int = 256) -> None:
+        """
+        :param directory: Каталог для файлов кэша.
+        :param ttl: Время, в течение которого ответ считается свежим, секунды.
+        :param max_entries: Максимальное число хранимых ответов.
+        """
+        if ttl < 0:
+            raise ValueError("Время жизни записи не может быть отрицательным.")
+        if max_entries < 1:
+            raise ValueError("Размер кэша должен быть положительным.")
+        self._directory = Path(directory)
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]]) -> str:
+        """Формирует ключ записи по URL и нормализованным параметрам запроса."""
+        import hashlib  # загрузка OpenSSL заметна при старте, а ключи нужны только при запросах к API
+
+        normalized = sorted((str(name), str(value)) for name, value in (params or {}).items())
+        raw = json.dumps([url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Читает запись кэша, помечая её как недавно использованную."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if isinstance(entry, dict) and "body" in entry else None
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        """Атомарно записывает запись кэша и вытесняет лишние."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Удаляет наименее недавно использованные записи сверх max_entries."""
+        entries = []
+        for path in self._directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        if len(entries) <= self._max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self._max_entries]:
+            path.unlink(missing_ok=True)
+
+    def lookup(self, url: str, params: Optional[Mapping[str, Any]]) -> Tuple[Optional[Any], Dict[str, str]]:
+        """
+        Ищет ответ в кэше.
+        :return: Кортеж (тело свежего ответа или None, заголовки условного запроса для устаревшей записи).
+        """
+        entry = self._read(self.make_key(url, params))
+        with self._lock:
+            if entry is not None and time.time() - entry.get("stored_at", 0) < self._ttl:
+                self.hits += 1
+                return entry["body"], {}
+            self.misses += 1
+
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return None, headers
+
+    def store(self, url: str, params: Optional[Mapping[str, Any]], body: Any, headers: Mapping[str, str]) -> None:
+        """Сохраняет ответ вместе с его валидаторами (ETag, Last-Modified)."""
+        entry = {
+            "stored_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": body,
+        }
+        self._write(self.make_key(url, params), entry)
+
+    def revalidate(self, url: str, params: Optional[Mapping[str, Any]]) -> Optional[Any]:
+        """
+        Продлевает срок жизни записи после ответа 304 Not Modified.
+        :return: Тело сохранённого ответа или None, если запись успели вытеснить.
+        """
+        key = self.make_key(url, params)
+        entry = self._read(key)
+        if entry is None:
+            return None
+        entry["stored_at"] = time.time()
+        self._write(key, entry)
+        with self._lock:
+            self.revalidations += 1
+        return entry["body"]
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        for path in self._directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Счётчики обращений к кэшу."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations}
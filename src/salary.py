@@ -0,0 +1,233 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+NO_SALARY = "Зарплата не указана"
+SALARY_FIELDS = ("salary", "salary_to", "currency", "gross")  # Поля зарплаты, которые меняются только вместе
+BASE_CURRENCY = "RUR"  # Код рубля в API hh.ru
+RATES_TTL = 86400.0  # Таблица курсов считается устаревшей через сутки, секунды
+
+# Приблизительные курсы в формате справочника hh.ru (единиц валюты за один рубль).
+# Используются, пока таблица не загружена из API (см. CurrencyRates.update и HeadHunterAPI.get_currency_rates).
+DEFAULT_RATES: Dict[str, float] = {
+    "RUR": 1.0,
+    "USD": 0.011,
+    "EUR": 0.0103,
+    "KZT": 5.6,
+    "BYR": 0.036,
+    "UZS": 140.0,
+    "UAH": 0.46,
+    "AZN": 0.019,
+    "GEL": 0.031,
+    "KGS": 0.98,
+}
+_ALIASES: Dict[str, str] = {"RUB": "RUR", "BYN": "BYR"}
+
+_NUMBER = re.compile(r"\d[\d\s ]*(?:[.,]\d+)?")
+_CURRENCY_MARKS = (
+    ("руб", "RUR"), ("₽", "RUR"), ("rub", "RUR"), ("rur", "RUR"), ("$", "USD"), ("usd", "USD"),
+    ("€", "EUR"), ("eur", "EUR"), ("₸", "KZT"), ("kzt", "KZT"),
+)
+
+
+def normalize_currency(code: Any) -> Optional[str]:
+    """Код валюты в написании hh.ru (RUB -> RUR, BYN -> BYR) или None."""
+    if not isinstance(code, str) or not code.strip():
+        return None
+    normalized = code.strip().upper()
+    return _ALIASES.get(normalized, normalized)
+
+
+class CurrencyRates:
+    """
+    Таблица курсов валют к рублю, кэшируемая локально в JSON-файле.
+    Курсы хранятся как в справочнике hh.ru: сколько единиц валюты стоит один рубль, поэтому сумма в рублях —
+    это сумма, делённая на курс. Файл читается при первом обращении; без него используются DEFAULT_RATES.
+    """
+
+    def __init__(self, path: str = "data/currency_rates.json") -> None:
+        """
+        :param path: Путь к файлу с таблицей курсов.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._rates: Optional[Dict[str, float]] = None
+        self.fetched_at = 0.0  # Время загрузки таблицы из API (0 — используются курсы по умолчанию)
+
+    def _table(self) -> Dict[str, float]:
+        """Таблица курсов; при первом обращении читается из файла."""
+        rates = self._rates
+        if rates is not None:
+            return rates
+        with self._lock:
+            if self._rates is None:
+                self._rates = dict(DEFAULT_RATES)
+                try:
+                    with open(self._path, "r", encoding="utf-8") as file:
+                        stored = json.load(file)
+                    self._rates.update({str(code): float(rate) for code, rate in stored["rates"].items() if rate})
+                    self.fetched_at = float(stored.get("fetched_at", 0.0))
+                except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                    pass  # Нет файла или он повреждён: остаются курсы по умолчанию
+            return self._rates
+
+    def rate(self, currency: Any) -> Optional[float]:
+        """Курс валюты (единиц за рубль) или None для неизвестной валюты."""
+        code = normalize_currency(currency)
+        return self._table().get(code) if code is not None else None
+
+    def to_rub(self, amount: float, currency: Any) -> Optional[float]:
+        """Сумма в рублях или None, если курс валюты неизвестен."""
+        rate = self.rate(currency)
+        return amount / rate if rate else None
+
+    @property
+    def version(self) -> float:
+        """
+        Отметка текущей таблицы курсов (время её загрузки из API, 0 — курсы по умолчанию).
+        Меняется при каждом обновлении: по ней хранилища узнают, что суммы в рублях пора пересчитать.
+        """
+        self._table()
+        return self.fetched_at
+
+    def is_stale(self, ttl: float = RATES_TTL) -> bool:
+        """True, если таблица не загружалась из API дольше ttl секунд."""
+        self._table()
+        return time.time() - self.fetched_at > ttl
+
+    def update(self, rates: Dict[str, float]) -> None:
+        """
+        Заменяет курсы и сохраняет таблицу в файл атомарно (временный файл, затем замена).
+        :param rates: Код валюты -> единиц валюты за рубль.
+        """
+        table = dict(DEFAULT_RATES)
+        table.update({normalize_currency(code) or code: float(rate) for code, rate in rates.items() if rate})
+        table[BASE_CURRENCY] = 1.0
+        with self._lock:
+            self._rates = table
+            self.fetched_at = time.time()
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{self._path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as file:
+                    json.dump({"fetched_at": self.fetched_at, "rates": table}, file, ensure_ascii=False, indent=4)
+                os.replace(tmp, self._path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+
+# Общая таблица курсов, по которой хранилища и сортировка приводят зарплаты к рублям
+currency_rates = CurrencyRates()
+
+
+def _amount(value: Any) -> Optional[float]:
+    """Число из поля зарплаты или None (строки, bool, NaN)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return None
+    return float(value)
+
+
+def salary_interval(
+    vacancy_data: Dict[str, Any], rates: Optional[CurrencyRates] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    Диапазон зарплаты вакансии в рублях.
+    Поле salary — нижняя граница (или единственная известная сумма), salary_to — верхняя, currency — валюта
+    (без неё суммы считаются рублёвыми, как в записях, сохранённых до появления этих полей).
+    Если известна только одна граница, диапазон вырождается в точку.
+    :param rates: Таблица курсов (по умолчанию — общая currency_rates).
+    :return: Пара (минимум, максимум) или None, если зарплата не указана или валюта неизвестна.
+    """
+    low = _amount(vacancy_data.get("salary"))
+    high = _amount(vacancy_data.get("salary_to"))
+    if low is None:
+        if high is None:
+            return None
+        low = high
+    elif high is None or high < low:
+        high = low
+    currency = vacancy_data.get("currency")
+    if currency is None or currency == BASE_CURRENCY:
+        return low, high
+    rate = (rates or currency_rates).rate(currency)
+    if not rate:
+        return None  # Сравнить с рублями нельзя
+    return low / rate, high / rate
+
+
+def merge_vacancy(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Новая версия сохранённой вакансии: поля update замещают поля current.
+    Поля зарплаты замещаются вместе: если в update есть salary, границы, валюта и gross прежней версии
+    отбрасываются, даже если в update их нет (например, зарплату убрали из вакансии).
+    """
+    merged = dict(current)
+    if "salary" in update:
+        for field in SALARY_FIELDS:
+            if field not in update:
+                merged.pop(field, None)
+    merged.update(update)
+    return merged
+
+
+def salary_overlaps(vacancy_data: Dict[str, Any], salary_range: Tuple[float, float]) -> bool:
+    """True, если диапазон зарплаты вакансии (в рублях) пересекается с salary_range."""
+    interval = salary_interval(vacancy_data)
+    return interval is not None and interval[0] <= salary_range[1] and interval[1] >= salary_range[0]
+
+
+def parse_salary_text(text: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """
+    Разбирает зарплату, записанную строкой: «100 000-150 000 руб.», «от 1500 до 2000 USD», «до 90000».
+    :return: Кортеж (от, до, код валюты); отсутствующие части — None.
+    """
+    lowered = text.casefold()
+    numbers = []
+    for match in _NUMBER.findall(lowered):
+        try:
+            numbers.append(float("".join(match.split()).replace(",", ".")))
+        except ValueError:
+            continue
+    currency = next((code for mark, code in _CURRENCY_MARKS if mark in lowered), None)
+    if not numbers:
+        return None, None, currency
+    if len(numbers) == 1:
+        if lowered.lstrip().startswith("до"):
+            return None, numbers[0], currency
+        return numbers[0], None, currency
+    return numbers[0], numbers[1], currency
+
+
+def _plain(amount: float) -> str:
+    """Сумма без лишней дробной части: 150000.0 -> «150000»."""
+    return str(int(amount)) if amount.is_integer() else str(amount)
+
+
+def format_salary(vacancy_data: Dict[str, Any]) -> str:
+    """
+    Зарплата для вывода: «от 100000 до 150000 RUR (до вычета налогов)».
+    Записи без диапазона и валюты выводятся в прежнем виде: «100000 руб.».
+    """
+    salary = vacancy_data.get("salary", NO_SALARY)
+    salary_to = _amount(vacancy_data.get("salary_to"))
+    currency = vacancy_data.get("currency")
+    if salary_to is None and currency is None:
+        return f"{salary} руб."
+    low = _amount(salary)
+    if low is None and salary_to is None:
+        return NO_SALARY
+    parts = []
+    if low is not None:
+        parts.append(f"от {_plain(low)}" if salary_to is not None and salary_to != low else _plain(low))
+    if salary_to is not None and salary_to != low:
+        parts.append(f"до {_plain(salary_to)}")
+    text = " ".join(parts) + f" {currency or BASE_CURRENCY}"
+    gross = vacancy_data.get("gross")
+    if gross is not None:
+        text += " (до вычета налогов)" if gross else " (на руки)"
+    return text
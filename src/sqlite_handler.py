@@ -0,0 +1,308 @@
+import json
+import sqlite3
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.file_handler import FileHandler, prepare_vacancy, validate_batch, word_matcher
+from src.indexes import LOCAL_ID_PREFIX, tokenize, vacancy_key
+from src.salary import BASE_CURRENCY, CurrencyRates, currency_rates, merge_vacancy, salary_interval
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    salary REAL,
+    salary_max REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vacancies_salary ON vacancies (salary);
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5 (
+    title, description, content='vacancies', content_rowid='rowid', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO vacancies_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Интервальный индекс зарплат (в рублях): R*-дерево по отрезкам [salary, salary_max].
+# Пустой salary_max (записи, сохранённые до появления столбца) означает диапазон из одной суммы.
+_SALARY_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_salary_rtree USING rtree (id, min_salary, max_salary);
+CREATE TRIGGER IF NOT EXISTS vacancies_salary_ai AFTER INSERT ON vacancies WHEN new.salary IS NOT NULL BEGIN
+    INSERT INTO vacancies_salary_rtree VALUES (new.rowid, new.salary, COALESCE(new.salary_max, new.salary));
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_salary_ad AFTER DELETE ON vacancies BEGIN
+    DELETE FROM vacancies_salary_rtree WHERE id = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_salary_au AFTER UPDATE ON vacancies BEGIN
+    DELETE FROM vacancies_salary_rtree WHERE id = old.rowid;
+    INSERT INTO vacancies_salary_rtree SELECT new.rowid, new.salary, COALESCE(new.salary_max, new.salary)
+    WHERE new.salary IS NOT NULL;
+END;
+"""
+
+
+def _fts_variants(token: str) -> List[str]:
+    """
+    Написания токена для запроса FTS5. Токенизатор unicode61 различает «е» и «ё», а фильтры — нет
+    (см. tokenize), поэтому каждая «е» ищется в обоих вариантах. При большем числе «е» берётся начало
+    токена до пятой из них: запрос по префиксу лишь расширяет круг кандидатов.
+    """
+    positions = [position for position, char in enumerate(token) if char == "е"]
+    if len(positions) > 4:
+        token, positions = token[:positions[4]], positions[:4]
+    variants = []
+    for chars in product("её", repeat=len(positions)):
+        letters = list(token)
+        for position, char in zip(positions, chars):
+            letters[position] = char
+        variants.append("".join(letters))
+    return variants
+
+
+def _fts_query(tokens: List[str], match_all: bool = False) -> str:
+    """Строит запрос FTS5: любое (или каждое) из слов как префикс токена описания."""
+    terms = [
+        "(" + " OR ".join('"' + variant.replace('"', '""') + '"*' for variant in _fts_variants(token)) + ")"
+        for token in tokens
+    ]
+    return "description : (" + (" AND " if match_all else " OR ").join(terms) + ")"
+
+
+class SQLiteFileHandler(FileHandler):
+    """
+    Хранилище вакансий в базе SQLite.
+    Диапазон зарплаты индексируется R*-деревом, название и описание — полнотекстовым индексом FTS5
+    (фильтр по словам, как и в других хранилищах, ищет только в описании), поэтому фильтры не читают все записи.
+    Границы в рублях для зарплат в валюте пересчитываются, когда меняется таблица курсов (см. _sync_rates).
+    """
+
+    def __init__(self, filename: str = "data/vacancies.db", rates: Optional[CurrencyRates] = None) -> None:
+        """
+        :param filename: Путь к файлу базы.
+        :param rates: Таблица курсов для перевода зарплат в рубли (по умолчанию — общая currency_rates).
+        """
+        self._filename = filename
+        self._rates = rates or currency_rates
+        Path(self._filename).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self._filename)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Добавляет верхнюю границу зарплаты и интервальный индекс в базы, созданные до их появления."""
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(vacancies)")}
+        if "salary_max" not in columns:
+            # Прежние записи хранили одну сумму в рублях: столбец остаётся пустым, диапазон вырождается в точку.
+            # Заполнять его UPDATE не нужно — это переписало бы все строки и полнотекстовый индекс.
+            self._connection.execute("ALTER TABLE vacancies ADD COLUMN salary_max REAL")
+        has_rtree = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vacancies_salary_rtree'"
+        ).fetchone()
+        self._connection.executescript(_SALARY_SCHEMA)
+        if not has_rtree:
+            self._connection.execute(
+                "INSERT INTO vacancies_salary_rtree SELECT rowid, salary, COALESCE(salary_max, salary) FROM vacancies "
+                "WHERE salary IS NOT NULL"
+            )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self._connection.close()
+
+    def __enter__(self) -> "SQLiteFileHandler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _next_local_id(self) -> str:
+        """Выдаёт новый локальный ID; счётчик хранится в базе и не уменьшается при удалении."""
+        row = self._connection.execute("SELECT value FROM meta WHERE name = 'last_local_id'").fetchone()
+        last_local_id = (row[0] if row else 0) + 1
+        self._connection.execute(
+            "INSERT INTO meta (name, value) VALUES ('last_local_id', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (last_local_id,),
+        )
+        return f"{LOCAL_ID_PREFIX}{last_local_id}"
+
+    def _sync_rates(self) -> None:
+        """
+        Пересчитывает столбцы salary и salary_max (а с ними R*-дерево) у зарплат в валюте, если таблица курсов
+        сменилась после их расчёта. Версия курсов, по которой посчитаны столбцы, хранится в таблице meta.
+        """
+        version = self._rates.version
+        row = self._connection.execute("SELECT value FROM meta WHERE name = 'rates_version'").fetchone()
+        if row is not None and row[0] == version:
+            return
+        with self._connection:
+            rows = self._connection.execute(
+                "SELECT rowid, data, salary, salary_max FROM vacancies "
+                "WHERE COALESCE(json_extract(data, '$.currency'), ?) <> ?",
+                (BASE_CURRENCY, BASE_CURRENCY),
+            ).fetchall()
+            for rowid, data, salary, salary_max in rows:
+                interval = salary_interval(json.loads(data), self._rates)
+                low, high = interval if interval else (None, None)
+                if (low, high) != (salary, salary_max):
+                    self._connection.execute(
+                        "UPDATE vacancies SET salary = ?, salary_max = ? WHERE rowid = ?", (low, high, rowid)
+                    )
+            self._connection.execute(
+                "INSERT INTO meta (name, value) VALUES ('rates_version', ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                (version,),
+            )
+
+    def _upsert(self, vacancy_data: Dict[str, Any]) -> str:
+        """
+        Добавляет вакансию или обновляет сохранённую с тем же ключом (внутри текущей транзакции).
+        :return: "added", "updated" или "skipped".
+        """
+        key = vacancy_key(vacancy_data)
+        row = self._connection.execute("SELECT rowid, data FROM vacancies WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            if vacancy_data.get("id") is None:
+                vacancy_data["id"] = self._next_local_id()  # Вакансия добавлена не с hh.ru
+            merged = vacancy_data
+            status = "added"
+        else:
+            current = json.loads(row[1])
+            merged = merge_vacancy(current, vacancy_data)
+            if merged == current:
+                return "skipped"
+            status = "updated"
+
+        # В рублях по текущим курсам; NULL для «Зарплата не указана» и неизвестной валюты
+        interval = salary_interval(merged, self._rates)
+        values = (
+            str(merged["id"]),
+            key,
+            str(merged.get("title", "")),
+            str(merged.get("description", "")),
+            interval[0] if interval else None,
+            interval[1] if interval else None,
+            json.dumps(merged, ensure_ascii=False),
+        )
+        if row is None:
+            self._connection.execute(
+                "INSERT INTO vacancies (id, key, title, description, salary, salary_max, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+        else:
+            self._connection.execute(
+                "UPDATE vacancies SET id = ?, key = ?, title = ?, description = ?, salary = ?, salary_max = ?, "
+                "data = ? WHERE rowid = ?",
+                (*values, row[0]),
+            )
+        return status
+
+    def _select(self, query: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        """Выполняет запрос, возвращающий столбец data, и декодирует записи."""
+        return [json.loads(row[0]) for row in self._connection.execute(query, params)]
+
+    def add_vacancy(self, vacancy_data: Dict[str, Any]) -> None:
+        """Добавляет вакансию в базу или обновляет уже сохранённую (по ID hh.ru или ссылке)."""
+        prepare_vacancy(vacancy_data)
+        with self._connection:
+            status = self._upsert(vacancy_data)
+        if status == "added":
+            print(f"Вакансия '{vacancy_data['title']}' успешно добавлена.")
+        elif status == "updated":
+            print(f"Вакансия '{vacancy_data['title']}' обновлена.")
+
+    def add_vacancies(self, vacancies: Iterable[Dict[str, Any]], clean: bool = True) -> Dict[str, int]:
+        """
+        Добавляет пакет вакансий одной транзакцией.
+        :param vacancies: Вакансии для добавления.
+        :param clean: False — описания уже очищены от HTML (например, из parse_vacancies).
+        :return: Сводка: added — добавлено, updated — обновлено, skipped — без изменений,
+                 invalid — без обязательных полей.
+        """
+        valid, invalid = validate_batch(vacancies, clean)
+        summary = {"added": 0, "updated": 0, "skipped": 0, "invalid": invalid}
+        with self._connection:
+            for vacancy_data in valid:
+                summary[self._upsert(vacancy_data)] += 1
+        return summary
+
+    def delete_vacancy(self, vacancy_id: Union[int, str]) -> None:
+        """Удаляет вакансию из базы по ID."""
+        if self.delete_vacancies([vacancy_id]):
+            print(f"Вакансия с ID {vacancy_id} удалена.")
+        else:
+            print(f"Вакансия с ID {vacancy_id} не найдена.")
+
+    def delete_vacancies(self, vacancy_ids: Iterable[Union[int, str]]) -> int:
+        """
+        Удаляет вакансии по списку ID одной транзакцией.
+        :return: Число удалённых вакансий.
+        """
+        ids = list(dict.fromkeys(str(vacancy_id) for vacancy_id in vacancy_ids))
+        with self._connection:
+            return sum(
+                self._connection.execute("DELETE FROM vacancies WHERE id = ?", (vacancy_id,)).rowcount
+                for vacancy_id in ids
+            )
+
+    def filter_vacancies(
+        self, filter_words: List[str], match_all: bool = False, prefix: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Фильтрует вакансии по ключевым словам в описании с той же семантикой, что и JSONFileHandler.
+        Полнотекстовый индекс отбирает кандидатов (слова как префиксы токенов), точное условие
+        проверяется word_matcher.
+        """
+        if not filter_words:
+            return self._select("SELECT data FROM vacancies ORDER BY rowid")
+        tokens = list(dict.fromkeys(token for word in filter_words for token in tokenize(word)))
+        if tokens:
+            candidates = self._select(
+                "SELECT v.data FROM vacancies_fts JOIN vacancies AS v ON v.rowid = vacancies_fts.rowid "
+                "WHERE vacancies_fts MATCH ? ORDER BY v.rowid",
+                (_fts_query(tokens, match_all),),
+            )
+        else:
+            # В словах нет ни одного токена (например, «++»): ищем подстроку без индекса
+            candidates = self._select("SELECT data FROM vacancies ORDER BY rowid")
+        return list(filter(word_matcher(filter_words, match_all, prefix), candidates))
+
+    def filter_vacancies_by_salary(
+        self, salary_range: Tuple[float, float], offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Фильтрует вакансии, диапазон зарплаты которых (в рублях) пересекается с заданным, через R*-дерево.
+        Индекс хранит границы с одинарной точностью, поэтому точное условие проверяется по столбцам таблицы.
+        Вакансии выдаются в порядке добавления; offset и limit задают страницу результата.
+        """
+        self._sync_rates()
+        min_salary, max_salary = salary_range
+        return self._select(
+            "SELECT v.data FROM vacancies_salary_rtree AS r JOIN vacancies AS v ON v.rowid = r.id "
+            "WHERE r.min_salary <= ? AND r.max_salary >= ? "
+            "AND v.salary <= ? AND COALESCE(v.salary_max, v.salary) >= ? "
+            "ORDER BY v.rowid LIMIT ? OFFSET ?",
+            (max_salary, min_salary, max_salary, min_salary, -1 if limit is None else limit, offset),
+        )
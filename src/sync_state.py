@@ -0,0 +1,129 @@
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+HH_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"  # Формат дат API hh.ru: 2024-05-01T12:00:00+0300
+VACANCY_LIFETIME_DAYS = 30  # Вакансия на hh.ru снимается с публикации через 30 дней, если её не обновили
+
+
+def parse_hh_date(value: Any) -> Optional[datetime]:
+    """Разбирает дату из ответа API hh.ru; None, если дата отсутствует или некорректна."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value, HH_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def format_hh_date(moment: datetime) -> str:
+    """Дата в формате параметра date_from API hh.ru (в UTC)."""
+    return moment.astimezone(timezone.utc).strftime(HH_DATE_FORMAT)
+
+
+def normalize_query(query: str) -> str:
+    """Ключ поискового запроса: без учёта регистра и лишних пробелов."""
+    return " ".join(query.casefold().split())
+
+
+class SyncState:
+    """
+    Состояние инкрементальной синхронизации с hh.ru, хранится рядом с файлом данных (<data>.sync.json).
+    Для каждого запроса — водяной знак (самая поздняя дата публикации среди полученных вакансий),
+    для каждой вакансии — дата её последней публикации, по которой определяются снятые с публикации вакансии.
+    Изменения сохраняются только вызовом save(), после того как вакансии записаны в хранилище:
+    если запись не удалась, следующая синхронизация повторит тот же интервал.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Путь к файлу состояния.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._queries: Dict[str, Dict[str, str]] = {}
+        self._published: Dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            self._queries = dict(state.get("queries", {}))
+            self._published = dict(state.get("published", {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            # Без состояния следующая синхронизация будет полной, данные при этом не теряются
+            # В stderr: stdout команды fetch занят выводом JSON Lines
+            print(f"Состояние синхронизации {path} повреждено и будет создано заново: {e}", file=sys.stderr)
+
+    @classmethod
+    def for_data(cls, filename: str) -> "SyncState":
+        """Состояние для файла данных filename."""
+        return cls(f"{filename}.sync.json")
+
+    def watermark(self, query: str) -> Optional[datetime]:
+        """Водяной знак запроса или None, если запрос ещё не синхронизировался."""
+        with self._lock:
+            entry = self._queries.get(normalize_query(query))
+        return parse_hh_date(entry.get("watermark")) if entry else None
+
+    def update(self, query: str, published: Dict[str, datetime], synced_at: Optional[datetime] = None) -> None:
+        """
+        Учитывает результат синхронизации запроса.
+        :param query: Поисковый запрос.
+        :param published: ID вакансии hh.ru -> дата публикации из ответа API.
+        :param synced_at: Время синхронизации (по умолчанию — текущее).
+        """
+        synced_at = synced_at or datetime.now(timezone.utc)
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._queries.setdefault(key, {})
+            latest = parse_hh_date(entry.get("watermark"))
+            for vacancy_id, moment in published.items():
+                previous = parse_hh_date(self._published.get(vacancy_id))
+                if previous is None or moment > previous:
+                    self._published[vacancy_id] = format_hh_date(moment)
+                if latest is None or moment > latest:
+                    latest = moment
+            if latest is not None:
+                entry["watermark"] = format_hh_date(latest)
+            entry["synced_at"] = format_hh_date(synced_at)
+
+    def published_at(self, vacancy_id: Any) -> Optional[datetime]:
+        """Дата последней публикации вакансии, полученная при синхронизации."""
+        with self._lock:
+            return parse_hh_date(self._published.get(str(vacancy_id)))
+
+    def stale_ids(self, max_age_days: float = VACANCY_LIFETIME_DAYS, now: Optional[datetime] = None) -> List[str]:
+        """
+        ID вакансий, которые не публиковались и не обновлялись дольше max_age_days дней.
+        Обновлённая на hh.ru вакансия получает новую дату публикации и приходит при следующей синхронизации,
+        поэтому старая дата означает, что вакансия, скорее всего, снята с публикации.
+        """
+        threshold = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+        with self._lock:
+            published = list(self._published.items())
+        return [vacancy_id for vacancy_id, value in published if (parse_hh_date(value) or threshold) < threshold]
+
+    def forget(self, vacancy_ids: Iterable[Any]) -> None:
+        """Удаляет даты публикации вакансий (например, после их удаления из хранилища)."""
+        with self._lock:
+            for vacancy_id in vacancy_ids:
+                self._published.pop(str(vacancy_id), None)
+
+    def save(self) -> None:
+        """Сохраняет состояние атомарно: во временный файл, затем замена."""
+        with self._lock:
+            state = {"queries": self._queries, "published": self._published}
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{self._path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as file:
+                    json.dump(state, file, ensure_ascii=False)
+                os.replace(tmp, self._path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
@@ -1,9 +1,52 @@
+import heapq
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
 from src.file_handler import JSONFileHandler
+from src.indexes import numeric_salary
+
+
+def _salary_sort_key(reverse: bool) -> Callable[[Dict[str, Any]], Tuple[bool, float, str]]:
+    """
+    Ключ сортировки: зарплата в нужном направлении, затем название по алфавиту.
+    Вакансии без числовой зарплаты («Зарплата не указана») всегда идут последними.
+    """
 
+    def key(vacancy: Dict[str, Any]) -> Tuple[bool, float, str]:
+        salary = numeric_salary(vacancy)
+        if salary is None:
+            return True, 0.0, str(vacancy.get("title", "")).casefold()
+        return False, -salary if reverse else salary, str(vacancy.get("title", "")).casefold()
+
+    return key
+
+
+def sort_vacancies(
+    vacancies: Iterable[dict],
+    reverse: bool = True,
+    top_n: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> list:
+    """
+    Сортировка вакансий по зарплате (при равной зарплате — по названию).
+    Если нужна только часть результата (top_n или limit), вакансии отбираются кучей за O(n log k)
+    без полной сортировки.
+    :param vacancies: Вакансии: список или любой итерируемый объект (например, iter_vacancies).
+    :param reverse: True — по убыванию зарплаты, False — по возрастанию.
+    :param top_n: Вернуть только первые top_n вакансий (то же, что limit).
+    :param offset: Сколько первых вакансий пропустить (для постраничного вывода).
+    :param limit: Максимальное число вакансий после offset (None — все).
+    :return: Отсортированный список вакансий.
+    """
+    if top_n is not None:
+        limit = top_n
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("Смещение и размер страницы не могут быть отрицательными.")
 
-def sort_vacancies(vacancies: list, reverse: bool = True) -> list:
-    """Сортировка вакансий по зарплате."""
-    return sorted(vacancies, key=lambda v: v["salary"] or 0, reverse=reverse)
+    key = _salary_sort_key(reverse)
+    if limit is None:
+        return sorted(vacancies, key=key)[offset:]
+    return heapq.nsmallest(offset + limit, vacancies, key=key)[offset:]
 
 
 def save_vacancy_to_file(vacancy: dict, json_saver: JSONFileHandler) -> None:
@@ -1,24 +1,130 @@
-from typing import Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from src.helpers import clean_html
+from src.salary import NO_SALARY, format_salary, normalize_currency, parse_salary_text, salary_interval
+
+SalaryParts = Tuple[Union[float, str], Optional[float], Optional[str], Optional[bool]]
 
 
 class Vacancy:
     """Класс для представления вакансии."""
 
-    __slots__ = ["_title", "_link", "_salary", "_description"]
-
-    def __init__(self, title: str, link: str, salary: Optional[Union[float, str]], description: str) -> None:
+    __slots__ = ["_title", "_link", "_salary", "_salary_to", "_currency", "_gross", "_description", "_id"]
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        salary: Optional[Union[float, str, Dict[str, Any]]],
+        description: str,
+        vacancy_id: Optional[str] = None,
+        salary_to: Optional[float] = None,
+        currency: Optional[str] = None,
+        gross: Optional[bool] = None,
+    ) -> None:
+        """
+        :param salary: Нижняя граница зарплаты (или единственная сумма), строка вида «100 000-150 000 руб.»
+                       или поле salary ответа API hh.ru ({"from", "to", "currency", "gross"}).
+        :param salary_to: Верхняя граница зарплаты.
+        :param currency: Код валюты hh.ru (RUR, USD, EUR...); None — рубли.
+        :param gross: True — зарплата до вычета налогов, False — на руки, None — неизвестно.
+        """
+        self._id = vacancy_id  # ID hh.ru; для добавленных вручную вакансий назначается хранилищем
         self._title = self._validate_title(title)
         self._link = self._validate_link(link)
+        self._salary, self._salary_to, self._currency, self._gross = self._parse_salary(
+            salary, salary_to, currency, gross
+        )
+        self._description = self._validate_description(description)
 
-        # Присваиваем _salary, который может быть как float, так и str
-        if salary is None:
-            self._salary: Union[float, str] = "Зарплата не указана"  # строка, если salary None
+    @classmethod
+    def _build(
+        cls,
+        title: str,
+        link: str,
+        salary: Optional[Union[float, str]],
+        description: Optional[str],
+        vacancy_id: Optional[Any],
+        clean: bool,
+        salary_to: Optional[float] = None,
+        currency: Optional[str] = None,
+        gross: Optional[bool] = None,
+    ) -> "Vacancy":
+        """
+        Создаёт вакансию без повторной работы: при clean=False описание считается уже очищенным от HTML.
+        Проверки названия, ссылки и зарплаты те же, что в __init__.
+        """
+        vacancy = cls.__new__(cls)
+        vacancy._id = vacancy_id
+        vacancy._title = cls._validate_title(title)
+        vacancy._link = cls._validate_link(link)
+        vacancy._salary, vacancy._salary_to, vacancy._currency, vacancy._gross = cls._parse_salary(
+            salary, salary_to, currency, gross
+        )
+        if clean:
+            vacancy._description = cls._validate_description(description)
         else:
-            self._salary = self._validate_salary(salary)  # Присваиваем значение, которое может быть float или str
-
-        self._description = self._validate_description(description)
+            vacancy._description = description or "Описание отсутствует"
+        return vacancy
+
+    @classmethod
+    def from_dicts(
+        cls, records: Iterable[Dict[str, Any]], clean: bool = True
+    ) -> Tuple[List["Vacancy"], List[Tuple[int, str]]]:
+        """
+        Создаёт вакансии из словарей за один проход, не останавливаясь на первой ошибке.
+        :param records: Словари с полями title, link, salary, description и необязательными id, salary_to,
+                        currency, gross
+                        (как у parse_vacancies или в хранилище).
+        :param clean: False — описания уже очищены от HTML (например, HeadHunterAPI.get_vacancies),
+                      повторная очистка пропускается.
+        :return: Кортеж (вакансии, ошибки); ошибка — пара (номер записи, сообщение).
+        """
+        vacancies: List[Vacancy] = []
+        errors: List[Tuple[int, str]] = []
+        build = cls._build
+        for number, record in enumerate(records):
+            try:
+                vacancies.append(build(
+                    record["title"],
+                    record["link"],
+                    record.get("salary"),
+                    record.get("description"),
+                    record.get("id"),
+                    clean,
+                    record.get("salary_to"),
+                    record.get("currency"),
+                    record.get("gross"),
+                ))
+            except KeyError as e:
+                errors.append((number, f"Отсутствует поле {e}."))
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append((number, str(e) or type(e).__name__))
+        return vacancies, errors
+
+    @classmethod
+    def from_api_items(cls, items: Iterable[Dict[str, Any]]) -> Tuple[List["Vacancy"], List[Tuple[int, str]]]:
+        """
+        Создаёт вакансии прямо из элементов ответа API hh.ru (поле items), минуя промежуточные словари
+        parse_vacancies; HTML в описании очищается один раз.
+        :return: Кортеж (вакансии, ошибки); ошибка — пара (номер элемента, сообщение).
+        """
+        vacancies: List[Vacancy] = []
+        errors: List[Tuple[int, str]] = []
+        build = cls._build
+        for number, item in enumerate(items):
+            try:
+                vacancies.append(build(
+                    item.get("name", "Название не указано"),
+                    item.get("alternate_url", "Ссылка не указана"),
+                    item.get("salary") or NO_SALARY,
+                    (item.get("snippet") or {}).get("requirement"),
+                    item.get("id"),
+                    True,
+                ))
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append((number, str(e) or type(e).__name__))
+        return vacancies, errors
 
     @staticmethod
     def _validate_title(title: str) -> str:
@@ -43,18 +149,65 @@ class Vacancy:
         except (ValueError, AttributeError):
             return "Зарплата не указана"
 
+    @classmethod
+    def _parse_salary(
+        cls,
+        salary: Optional[Union[float, str, Dict[str, Any]]],
+        salary_to: Optional[float],
+        currency: Optional[str],
+        gross: Optional[bool],
+    ) -> SalaryParts:
+        """
+        Приводит зарплату к полям (нижняя граница или «Зарплата не указана», верхняя граница, валюта, gross).
+        Если известна только верхняя граница, она же становится нижней.
+        """
+        if isinstance(salary, dict):
+            api_salary = salary
+            salary = api_salary.get("from")
+            salary_to = api_salary.get("to") if salary_to is None else salary_to
+            currency = currency or api_salary.get("currency")
+            gross = api_salary.get("gross") if gross is None else gross
+        elif isinstance(salary, str):
+            low, high, marked = parse_salary_text(salary)
+            salary = low
+            salary_to = high if salary_to is None else salary_to
+            currency = currency or marked
+        elif salary is not None:
+            salary = cls._validate_salary(salary)
+
+        high = float(salary_to) if isinstance(salary_to, (int, float)) and not isinstance(salary_to, bool) else None
+        if salary is None or salary == NO_SALARY:
+            salary = high if high is not None else NO_SALARY
+        else:
+            salary = float(salary)
+        return salary, high, normalize_currency(currency), gross if isinstance(gross, bool) else None
+
     @staticmethod
     def _validate_description(description: Optional[str]) -> str:
         cleaned_description = clean_html(description or "")
         return cleaned_description if cleaned_description else "Описание отсутствует"
 
     def to_dict(self) -> dict:
-        return {
+        vacancy_data = {
             "title": self._title,
             "link": self._link,
             "salary": self._salary,
-            "description": self._description,
         }
+        # Поля диапазона сохраняются, только если они известны: прежние записи остаются прежними
+        if self._salary_to is not None:
+            vacancy_data["salary_to"] = self._salary_to
+        if self._currency is not None:
+            vacancy_data["currency"] = self._currency
+        if self._gross is not None:
+            vacancy_data["gross"] = self._gross
+        vacancy_data["description"] = self._description
+        if self._id is not None:
+            vacancy_data["id"] = self._id
+        return vacancy_data
+
+    @property
+    def vacancy_id(self) -> Optional[str]:
+        return self._id
 
     @property
     def title(self) -> str:
@@ -64,15 +217,34 @@ class Vacancy:
     def salary(self) -> Union[float, str]:
         return self._salary
 
+    @property
+    def salary_to(self) -> Optional[float]:
+        return self._salary_to
+
+    @property
+    def currency(self) -> Optional[str]:
+        return self._currency
+
+    @property
+    def gross(self) -> Optional[bool]:
+        return self._gross
+
+    @property
+    def salary_rub(self) -> Optional[Tuple[float, float]]:
+        """Диапазон зарплаты в рублях по общей таблице курсов (None, если зарплата не указана)."""
+        return salary_interval(self.to_dict())
+
     def __str__(self) -> str:
-        return f"{self._title}, {self._salary} руб.\n{self._description}\nСсылка: {self._link}"
+        return f"{self._title}, {format_salary(self.to_dict())}\n{self._description}\nСсылка: {self._link}"
 
     def __lt__(self, other: 'Vacancy') -> bool:
-        if isinstance(self._salary, str) or isinstance(other.salary, str):
-            return False  # Если хотя бы одно из значений зарплаты - строка, сравнивать нельзя
-        return float(self._salary) < float(other.salary)  # Приведем оба к float для корректного сравнения
+        own, others = self.salary_rub, other.salary_rub
+        if own is None or others is None:
+            return False  # Если хотя бы одна зарплата не указана, сравнивать нельзя
+        return own[0] < others[0]  # Сравниваются нижние границы в рублях
 
     def __gt__(self, other: 'Vacancy') -> bool:
-        if isinstance(self._salary, str) or isinstance(other.salary, str):
-            return False  # Если хотя бы одно из значений зарплаты - строка, сравнивать нельзя
-        return float(self._salary) > float(other.salary)  # Приведем оба к float для корректного сравнения
+        own, others = self.salary_rub, other.salary_rub
+        if own is None or others is None:
+            return False  # Если хотя бы одна зарплата не указана, сравнивать нельзя
+        return own[0] > others[0]
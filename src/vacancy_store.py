@@ -0,0 +1,280 @@
+import json
+import math
+import operator
+import sys
+from array import array
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
+
+from src.file_handler import FileHandler, JSONFileHandler
+from src.salary import NO_SALARY, salary_interval
+
+if TYPE_CHECKING:
+    np: Any  # Необязательная зависимость: для проверки типов NumPy не требуется
+else:
+    try:
+        import numpy as np
+    except ImportError:  # NumPy необязателен: без него используются array и bytearray
+        np = None
+
+
+Mask = Any  # bytearray из 0/1 или numpy.ndarray с dtype=bool
+GROSS_VALUES = (None, False, True)  # Коды столбца gross: 0 — неизвестно, 1 — на руки, 2 — до вычета налогов
+
+
+def _column_number(value: Any) -> float:
+    """Значение для столбца array('d'): число или NaN (строки, None, bool)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def _plain_number(value: float) -> Union[int, float]:
+    """Число из столбца в виде, в котором его сохраняет JSON: 150000.0 -> 150000."""
+    return int(value) if value.is_integer() else value
+
+
+def _and(left: bytearray, right: bytearray) -> bytearray:
+    """Побайтовое И двух масок из 0/1 одной длины (через длинные целые, без цикла по байтам)."""
+    value = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return bytearray(value.to_bytes(len(left), "little"))
+
+
+def _or(left: bytearray, right: bytearray) -> bytearray:
+    """Побайтовое ИЛИ двух масок из 0/1 одной длины."""
+    value = int.from_bytes(left, "little") | int.from_bytes(right, "little")
+    return bytearray(value.to_bytes(len(left), "little"))
+
+
+class VacancyStore:
+    """
+    Колоночное хранилище вакансий в памяти.
+    Границы зарплат в рублях лежат в двух array('d') (NaN — зарплата не указана или валюта неизвестна), строки —
+    в списках; повторяющиеся названия и описания интернируются. Фильтры возвращают маски по всем строкам сразу,
+    сортировка — перестановку индексов. С NumPy маски и сортировка вычисляются векторно, без него — средствами
+    стандартной библиотеки.
+    Хранятся поля, которые сохраняет Vacancy: id, title, link, salary, salary_to, currency, gross, description.
+    Исходные поля зарплаты тоже лежат в столбцах (суммы — array('d'), валюта — номер в таблице кодов, gross —
+    байт), словари вакансий собираются из столбцов только по запросу.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None) -> None:
+        """
+        :param use_numpy: True/False — принудительно включить или выключить NumPy;
+                          None — использовать, если установлен.
+        """
+        if use_numpy and np is None:
+            raise ValueError("NumPy не установлен.")
+        self._numpy = np is not None if use_numpy is None else use_numpy
+        self.ids: List[Optional[str]] = []
+        self.titles: List[str] = []
+        self.links: List[str] = []
+        self.descriptions: List[str] = []
+        self.salaries = array("d")  # Нижние границы в рублях
+        self.salary_highs = array("d")  # Верхние границы в рублях
+        self.salary_amounts = array("d")  # Поле salary в валюте вакансии (NaN — не указана)
+        self.salary_tos = array("d")  # Поле salary_to в валюте вакансии (NaN — нет)
+        self.currencies = array("H")  # Номер кода валюты в _currency_codes (0 — не указана)
+        self.gross = bytearray()  # Номер значения в GROSS_VALUES
+        self._currency_codes: List[Optional[str]] = [None]
+        self._currency_numbers: Dict[Optional[str], int] = {None: 0}
+        self._folded: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.salaries)
+
+    def append(self, vacancy_data: Dict[str, Any]) -> None:
+        """Добавляет вакансию в конец хранилища."""
+        vacancy_id = vacancy_data.get("id")
+        interval = salary_interval(vacancy_data)
+        currency = vacancy_data.get("currency")
+        currency = None if currency is None else str(currency)
+        currency_number = self._currency_numbers.get(currency)
+        if currency_number is None:
+            currency_number = self._currency_numbers[currency] = len(self._currency_codes)
+            self._currency_codes.append(currency)
+        gross = vacancy_data.get("gross")
+        self.ids.append(None if vacancy_id is None else str(vacancy_id))
+        self.titles.append(sys.intern(str(vacancy_data.get("title", ""))))
+        self.links.append(str(vacancy_data.get("link", "")))
+        self.descriptions.append(sys.intern(str(vacancy_data.get("description") or "")))
+        self.salaries.append(math.nan if interval is None else interval[0])
+        self.salary_highs.append(math.nan if interval is None else interval[1])
+        self.salary_amounts.append(_column_number(vacancy_data.get("salary")))
+        self.salary_tos.append(_column_number(vacancy_data.get("salary_to")))
+        self.currencies.append(currency_number)
+        self.gross.append(GROSS_VALUES.index(gross) if isinstance(gross, bool) else 0)
+        self._folded = None
+
+    @classmethod
+    def from_dicts(cls, vacancies: Iterable[Dict[str, Any]], use_numpy: Optional[bool] = None) -> "VacancyStore":
+        """Создаёт хранилище из словарей вакансий (список или итератор)."""
+        store = cls(use_numpy)
+        for vacancy_data in vacancies:
+            store.append(vacancy_data)
+        return store
+
+    @classmethod
+    def from_json(cls, filename: str = "data/vacancies.json", use_numpy: Optional[bool] = None) -> "VacancyStore":
+        """Загружает вакансии из JSON-файла JSONFileHandler, разбирая его потоково."""
+        return cls.from_dicts(JSONFileHandler(filename).iter_vacancies(), use_numpy)
+
+    @classmethod
+    def from_handler(cls, handler: FileHandler, use_numpy: Optional[bool] = None) -> "VacancyStore":
+        """Загружает все вакансии из любого хранилища FileHandler (JSON Lines, SQLite и др.)."""
+        return cls.from_dicts(handler.filter_vacancies([]), use_numpy)
+
+    def vacancy(self, row: int) -> Dict[str, Any]:
+        """Собирает словарь вакансии по номеру строки."""
+        salary, salary_to = self.salary_amounts[row], self.salary_tos[row]
+        vacancy_data: Dict[str, Any] = {
+            "title": self.titles[row],
+            "link": self.links[row],
+            "salary": NO_SALARY if salary != salary else _plain_number(salary),
+        }
+        # Поля диапазона, как и в Vacancy.to_dict, выводятся, только если они известны
+        if salary_to == salary_to:
+            vacancy_data["salary_to"] = _plain_number(salary_to)
+        currency = self._currency_codes[self.currencies[row]]
+        if currency is not None:
+            vacancy_data["currency"] = currency
+        gross = GROSS_VALUES[self.gross[row]]
+        if gross is not None:
+            vacancy_data["gross"] = gross
+        vacancy_data["description"] = self.descriptions[row]
+        if self.ids[row] is not None:
+            vacancy_data["id"] = self.ids[row]
+        return vacancy_data
+
+    def take(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Собирает словари вакансий по номерам строк (например, результату rows или argsort_salary)."""
+        return [self.vacancy(row) for row in rows]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Все вакансии в виде словарей."""
+        return self.take(range(len(self)))
+
+    def save_json(self, filename: str = "data/vacancies.json") -> None:
+        """Сохраняет вакансии в формате JSONFileHandler, записывая их по одной."""
+        with open(filename, "w", encoding="utf-8") as file:
+            if not len(self):
+                file.write("[]")
+                return
+            for row in range(len(self)):
+                text = json.dumps(self.vacancy(row), ensure_ascii=False, indent=4).replace("\n", "\n    ")
+                file.write(("[\n    " if row == 0 else ",\n    ") + text)
+            file.write("\n]")
+
+    def save_jsonl(self, filename: str = "data/vacancies.jsonl") -> None:
+        """Сохраняет вакансии в формате JSON Lines (по записи на строку, как convert_json_to_jsonl)."""
+        with open(filename, "w", encoding="utf-8") as file:
+            for row in range(len(self)):
+                file.write(json.dumps(self.vacancy(row), ensure_ascii=False) + "\n")
+
+    def _salary_vector(self, column: Optional["array[float]"] = None) -> Any:
+        """Столбец зарплат (по умолчанию нижние границы) как массив NumPy без копирования (numpy.ndarray)."""
+        column = self.salaries if column is None else column
+        return np.frombuffer(column, dtype=np.float64) if len(self) else np.zeros(0)
+
+    def salary_mask(self, min_salary: float, max_salary: float) -> Mask:
+        """
+        Маска вакансий, диапазон зарплаты которых (в рублях) пересекается с [min_salary, max_salary];
+        NaN ни с чем не пересекается.
+        """
+        if self._numpy:
+            lows, highs = self._salary_vector(), self._salary_vector(self.salary_highs)
+            return (lows <= max_salary) & (highs >= min_salary)
+        return bytearray(
+            low <= max_salary and high >= min_salary for low, high in zip(self.salaries, self.salary_highs)
+        )
+
+    def _folded_descriptions(self) -> List[str]:
+        """Описания в приведённом регистре; столбец строится при первом поиске по словам."""
+        if self._folded is None:
+            self._folded = [sys.intern(description.casefold()) for description in self.descriptions]
+        return self._folded
+
+    def keyword_mask(self, filter_words: Sequence[str], match_all: bool = False) -> Mask:
+        """
+        Маска вакансий, в описании которых встречается хотя бы одно (или каждое) из слов как подстрока
+        без учёта регистра. Проверка одного слова по всему столбцу выполняется через map без цикла Python.
+        """
+        descriptions = self._folded_descriptions()
+        words = [word for word in dict.fromkeys(" ".join(word.casefold().split()) for word in filter_words) if word]
+        if not words:
+            return self._mask(bytearray(b"\x01") * len(self))
+
+        hits: Optional[bytearray] = None
+        for word in words:
+            found = bytearray(map(operator.contains, descriptions, repeat(word)))
+            if hits is None:
+                hits = found
+            else:
+                hits = _and(hits, found) if match_all else _or(hits, found)
+        return self._mask(cast(bytearray, hits))
+
+    def _mask(self, flags: bytearray) -> Mask:
+        """Приводит маску к типу, который использует хранилище."""
+        if self._numpy:
+            return np.frombuffer(bytes(flags), dtype=np.bool_)
+        return flags
+
+    def rows(self, mask: Mask) -> List[int]:
+        """Номера строк, отмеченных маской, по возрастанию."""
+        if self._numpy:
+            rows: List[int] = np.flatnonzero(mask).tolist()
+            return rows
+        return [row for row, flag in enumerate(mask) if flag]
+
+    @staticmethod
+    def combine(*masks: Mask) -> Mask:
+        """Пересечение масок (логическое И)."""
+        result = masks[0]
+        for mask in masks[1:]:
+            result = _and(result, mask) if isinstance(result, bytearray) else result & mask
+        return result
+
+    def argsort_salary(self, descending: bool = False, rows: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Перестановка строк по зарплате; вакансии без зарплаты всегда в конце, равные сохраняют порядок.
+        :param descending: Сортировать по убыванию.
+        :param rows: Сортировать только эти строки (например, результат rows(mask)); None — все.
+        """
+        if self._numpy:
+            salaries = self._salary_vector()
+            selected = np.arange(len(self)) if rows is None else np.fromiter(rows, dtype=np.int64)
+            values = salaries[selected]
+            order = np.argsort(-values if descending else values, kind="stable")  # NaN попадает в конец
+            ordered: List[int] = selected[order].tolist()
+            return ordered
+        salaries = self.salaries
+        candidates = range(len(self)) if rows is None else rows
+        present: List[int] = []
+        missing: List[int] = []
+        for row in candidates:
+            (missing if salaries[row] != salaries[row] else present).append(row)
+        present.sort(key=salaries.__getitem__, reverse=descending)
+        return present + missing
+
+    def filter(
+        self,
+        filter_words: Optional[Sequence[str]] = None,
+        salary_range: Optional[Tuple[float, float]] = None,
+        match_all: bool = False,
+        sort_by_salary: Union[bool, str] = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Отбирает вакансии по словам и/или диапазону зарплат.
+        :param sort_by_salary: False — порядок хранения, True или "asc" — по возрастанию зарплаты,
+                               "desc" — по убыванию.
+        :return: Список словарей вакансий.
+        """
+        masks = []
+        if filter_words:
+            masks.append(self.keyword_mask(filter_words, match_all))
+        if salary_range is not None:
+            masks.append(self.salary_mask(*salary_range))
+        rows: List[int] = self.rows(self.combine(*masks)) if masks else list(range(len(self)))
+        if sort_by_salary:
+            rows = self.argsort_salary(descending=sort_by_salary == "desc", rows=rows)
+        return self.take(rows)
@@ -1,6 +1,13 @@
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import Mock, patch
+
 import pytest
+import requests
 
-from src.api_handler import HeadHunterAPI
+from src.api_handler import HeadHunterAPI, parse_vacancies
+from src.response_cache import ResponseCache
+from src.sync_state import SyncState
 
 
 @pytest.fixture
@@ -44,3 +51,230 @@ def test_get_vacancies_without_salary(hh_api: HeadHunterAPI) -> None:
     for vacancy in vacancies:
         if vacancy["salary"] == "Зарплата не указана":
             assert isinstance(vacancy["salary"], str)
+
+
+def make_page(page: int, pages: int, found: int) -> Dict[str, Any]:
+    """Формирует ответ API с одной вакансией на страницу."""
+    return {
+        "pages": pages,
+        "found": found,
+        "page": page,
+        "items": [
+            {
+                "id": str(page),
+                "name": f"Вакансия {page}",
+                "alternate_url": f"https://hh.ru/vacancy/{page}",
+                "salary": {"from": 1000 * page},
+                "snippet": {"requirement": "<highlighttext>Python</highlighttext>"},
+            }
+        ],
+    }
+
+
+def test_get_vacancies_all_pages_in_order() -> None:
+    """Тестирует загрузку всех страниц выдачи с сохранением порядка."""
+    requested: List[int] = []
+
+    def fake_connect(self: HeadHunterAPI, url: str, params: dict) -> Dict[str, Any]:
+        requested.append(params["page"])
+        return make_page(params["page"], pages=5, found=450)
+
+    with patch.object(HeadHunterAPI, "connect", fake_connect):
+        vacancies = HeadHunterAPI(max_workers=3).get_vacancies("Python")
+
+    assert sorted(requested) == [0, 1, 2, 3, 4]
+    assert [v["title"] for v in vacancies] == [f"Вакансия {page}" for page in range(5)]
+    assert [v["id"] for v in vacancies] == ["0", "1", "2", "3", "4"]
+    assert vacancies[0]["description"] == "Python"
+
+
+def test_get_vacancies_respects_max_pages() -> None:
+    """Тестирует ограничение числа загружаемых страниц."""
+    requested: List[int] = []
+
+    def fake_connect(self: HeadHunterAPI, url: str, params: dict) -> Dict[str, Any]:
+        requested.append(params["page"])
+        return make_page(params["page"], pages=40, found=4000)
+
+    with patch.object(HeadHunterAPI, "connect", fake_connect):
+        assert len(HeadHunterAPI(max_pages=3).get_vacancies("Python")) == 3
+        requested.clear()
+        # Глубина выдачи hh.ru ограничена 2000 вакансиями
+        assert len(HeadHunterAPI(max_pages=100).get_vacancies("Python")) == 20
+
+    assert max(requested) == 19
+
+
+def test_get_vacancies_single_page() -> None:
+    """Тестирует, что при одной странице дополнительные запросы не выполняются."""
+    with patch.object(HeadHunterAPI, "connect", return_value=make_page(0, pages=1, found=1)) as mock_connect:
+        vacancies = HeadHunterAPI().get_vacancies("Python")
+
+    mock_connect.assert_called_once()
+    assert len(vacancies) == 1
+
+
+def test_get_vacancies_connection_error(capsys: pytest.CaptureFixture) -> None:
+    """Тестирует обработку ошибки подключения при загрузке страниц."""
+    def fake_connect(self: HeadHunterAPI, url: str, params: dict) -> Dict[str, Any]:
+        if params["page"] == 2:
+            raise ConnectionError("Ошибка подключения к API: 500")
+        return make_page(params["page"], pages=3, found=300)
+
+    with patch.object(HeadHunterAPI, "connect", fake_connect):
+        assert HeadHunterAPI().get_vacancies("Python") == []
+
+    assert "Ошибка подключения к API: 500" in capsys.readouterr().out
+
+
+def test_sync_vacancies_requests_only_newer(tmp_path: Path) -> None:
+    """Тестирует инкрементальную загрузку: вторая синхронизация передаёт date_from с запасом от водяного знака."""
+    requests_params: List[dict] = []
+    published = {"1": "2024-05-01T12:00:00+0300", "2": "2024-05-02T09:30:00+0300"}
+
+    def fake_connect(self: HeadHunterAPI, url: str, params: dict) -> Dict[str, Any]:
+        requests_params.append(dict(params))
+        page = make_page(0, pages=1, found=2)
+        page["items"] = [dict(page["items"][0], id=key, published_at=value) for key, value in published.items()]
+        return page
+
+    state = SyncState(str(tmp_path / "vacancies.json.sync.json"))
+    with patch.object(HeadHunterAPI, "connect", fake_connect):
+        hh_api = HeadHunterAPI()
+        assert [v["id"] for v in hh_api.sync_vacancies("Python", state)] == ["1", "2"]
+        assert "date_from" not in requests_params[0]
+        assert requests_params[0]["order_by"] == "publication_time"
+
+        hh_api.sync_vacancies(" python ", state, overlap=600)
+
+    assert requests_params[1]["date_from"] == "2024-05-02T06:20:00+0000"
+    assert state.published_at("1") is not None
+
+
+def test_parse_vacancies_salary_range_and_currency_rates() -> None:
+    """Тестирует сохранение диапазона, валюты и gross, а также загрузку курсов из справочника hh.ru."""
+    data = {"items": [
+        {"id": "1", "name": "Go", "alternate_url": "https://hh.ru/vacancy/1",
+         "salary": {"from": None, "to": 2000, "currency": "USD", "gross": False}, "snippet": {"requirement": "Go"}},
+        {"id": "2", "name": "SQL", "alternate_url": "https://hh.ru/vacancy/2", "salary": None, "snippet": {}},
+    ]}
+    vacancies = parse_vacancies(data)
+    assert vacancies[0]["salary"] == 2000
+    assert (vacancies[0]["salary_to"], vacancies[0]["currency"], vacancies[0]["gross"]) == (2000, "USD", False)
+    assert vacancies[1]["salary"] == "Зарплата не указана"
+    assert "currency" not in vacancies[1]
+
+    dictionaries = {"currency": [{"code": "RUR", "rate": 1}, {"code": "USD", "rate": 0.0125}, {"code": "XXX"}]}
+    with patch.object(HeadHunterAPI, "connect", return_value=dictionaries) as mock_connect:
+        assert HeadHunterAPI().get_currency_rates() == {"RUR": 1.0, "USD": 0.0125}
+    assert mock_connect.call_args[0][0].endswith("/dictionaries")
+
+
+def test_invalid_limits() -> None:
+    """Тестирует проверку параметров конструктора."""
+    with pytest.raises(ValueError):
+        HeadHunterAPI(max_workers=0)
+    with pytest.raises(ValueError):
+        HeadHunterAPI(max_pages=0)
+
+
+def make_response(status_code: int, payload: Any = None, headers: Any = None) -> Mock:
+    """Создаёт имитацию HTTP-ответа."""
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = payload
+    return response
+
+
+def test_connect_uses_session_with_timeout() -> None:
+    """Тестирует, что запросы идут через общую сессию с таймаутом."""
+    hh_api = HeadHunterAPI(timeout=5.0)
+    with patch.object(hh_api._session, "get", return_value=make_response(200, {"items": []})) as mock_get:
+        assert hh_api.connect("https://api.hh.ru/vacancies", {"text": "Python"}) == {"items": []}
+    mock_get.assert_called_once_with(
+        "https://api.hh.ru/vacancies", params={"text": "Python"}, headers=None, timeout=5.0
+    )
+
+
+def test_connect_retries_transient_errors() -> None:
+    """Тестирует повтор запросов при ответах 503 и 429 с Retry-After."""
+    hh_api = HeadHunterAPI(max_retries=3)
+    responses = [
+        make_response(503),
+        make_response(429, headers={"Retry-After": "2"}),
+        make_response(200, {"items": []}),
+    ]
+    with patch.object(hh_api._session, "get", side_effect=responses), patch("src.api_handler.time.sleep") as sleep:
+        assert hh_api.connect("https://api.hh.ru/vacancies", {}) == {"items": []}
+
+    assert sleep.call_count == 2
+    assert 0 <= sleep.call_args_list[0].args[0] <= 0.5
+    assert sleep.call_args_list[1].args[0] == 2.0
+
+
+def test_connect_retries_network_errors() -> None:
+    """Тестирует повтор при сетевых ошибках и преобразование их в ConnectionError."""
+    hh_api = HeadHunterAPI(max_retries=2)
+    with patch.object(hh_api._session, "get", side_effect=requests.Timeout("timeout")) as mock_get, patch(
+        "src.api_handler.time.sleep"
+    ):
+        with pytest.raises(ConnectionError, match="timeout"):
+            hh_api.connect("https://api.hh.ru/vacancies", {})
+    assert mock_get.call_count == 3
+
+
+def test_connect_does_not_retry_client_errors() -> None:
+    """Тестирует, что ошибки клиента (4xx) не повторяются."""
+    hh_api = HeadHunterAPI()
+    with patch.object(hh_api._session, "get", return_value=make_response(404)) as mock_get:
+        with pytest.raises(ConnectionError, match="404"):
+            hh_api.connect("https://api.hh.ru/vacancies", {})
+    mock_get.assert_called_once()
+
+
+def test_connect_gives_up_after_max_retries() -> None:
+    """Тестирует отказ после исчерпания повторов."""
+    hh_api = HeadHunterAPI(max_retries=1)
+    with patch.object(hh_api._session, "get", return_value=make_response(502)) as mock_get, patch(
+        "src.api_handler.time.sleep"
+    ):
+        with pytest.raises(ConnectionError, match="502"):
+            hh_api.connect("https://api.hh.ru/vacancies", {})
+    assert mock_get.call_count == 2
+
+
+def test_session_pool_size() -> None:
+    """Тестирует настройку пула соединений и закрытие сессии."""
+    with HeadHunterAPI(pool_size=4) as hh_api:
+        adapter = hh_api._session.get_adapter("https://api.hh.ru/vacancies")
+        assert adapter._pool_maxsize == 4  # type: ignore[attr-defined]
+
+
+def test_connect_uses_response_cache(tmp_path: Path) -> None:
+    """Тестирует, что повторный запрос обслуживается из кэша без обращения к сети."""
+    hh_api = HeadHunterAPI(cache=ResponseCache(str(tmp_path), ttl=60))
+    response = make_response(200, {"items": [1]}, headers={"ETag": '"v1"'})
+    with patch.object(hh_api._session, "get", return_value=response) as mock_get:
+        assert hh_api.connect("https://api.hh.ru/vacancies", {"text": "Python", "page": 0}) == {"items": [1]}
+        assert hh_api.connect("https://api.hh.ru/vacancies", {"page": "0", "text": "Python"}) == {"items": [1]}
+
+    mock_get.assert_called_once()
+    assert hh_api.cache_stats == {"hits": 1, "misses": 1, "revalidations": 0}
+
+
+def test_connect_revalidates_stale_cache(tmp_path: Path) -> None:
+    """Тестирует условный запрос для устаревшей записи и ответ 304."""
+    hh_api = HeadHunterAPI(cache=ResponseCache(str(tmp_path), ttl=0))
+    responses = [
+        make_response(200, {"items": [1]}, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        make_response(304),
+    ]
+    with patch.object(hh_api._session, "get", side_effect=responses) as mock_get:
+        hh_api.connect("https://api.hh.ru/vacancies", {"text": "Python"})
+        assert hh_api.connect("https://api.hh.ru/vacancies", {"text": "Python"}) == {"items": [1]}
+
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert hh_api.cache_stats == {"hits": 0, "misses": 2, "revalidations": 1}
+    assert HeadHunterAPI().cache_stats is None
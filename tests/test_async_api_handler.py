@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pytest
+from aiohttp import web
+
+from src.api_handler import parse_vacancies
+from src.async_api_handler import AsyncHeadHunterAPI
+
+PAGES = 3
+DELAY = 0.05
+
+
+def make_page(keyword: str, page: int) -> Dict[str, Any]:
+    """Формирует ответ API с одной вакансией на страницу."""
+    return {
+        "pages": PAGES,
+        "found": PAGES * 100,
+        "items": [
+            {
+                "name": f"{keyword} {page}",
+                "alternate_url": f"https://hh.ru/vacancy/{page}",
+                "salary": None,
+                "snippet": {"requirement": f"<highlighttext>{keyword}</highlighttext>"},
+            }
+        ],
+    }
+
+
+class StandInServer:
+    """Локальная замена API hh.ru с задержкой ответа и учётом параллельных запросов."""
+
+    def __init__(self, fail_first: int = 0) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self._fail_first = fail_first
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.requests <= self._fail_first:
+            return web.json_response({}, status=503, headers={"Retry-After": "0"})
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(DELAY)
+            return web.json_response(make_page(request.query["text"], int(request.query["page"])))
+        finally:
+            self.in_flight -= 1
+
+
+def run_with_server(server: StandInServer, scenario: Callable[[str], Awaitable[Any]]) -> Any:
+    """Запускает локальный сервер и выполняет сценарий с его адресом."""
+
+    async def main() -> Any:
+        app = web.Application()
+        app.router.add_get("/vacancies", server.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await scenario(f"http://127.0.0.1:{port}/vacancies")
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_get_vacancies_matches_sync_format() -> None:
+    """Тестирует, что асинхронный клиент возвращает те же словари, что и синхронный."""
+    server = StandInServer()
+
+    async def scenario(url: str) -> List[Dict[str, Any]]:
+        return await AsyncHeadHunterAPI(base_url=url).get_vacancies("Python")
+
+    vacancies = run_with_server(server, scenario)
+
+    expected: List[Dict[str, Any]] = []
+    for page in range(PAGES):
+        expected.extend(parse_vacancies(make_page("Python", page)))
+    assert vacancies == expected
+    assert vacancies[0]["description"] == "Python"
+
+
+def test_get_vacancies_many_fans_out_under_semaphore() -> None:
+    """Тестирует параллельную загрузку нескольких запросов с ограничением одновременности."""
+    server = StandInServer()
+    keywords = [f"keyword{i}" for i in range(6)]
+
+    async def scenario(url: str) -> Dict[str, List[Dict[str, Any]]]:
+        async with AsyncHeadHunterAPI(max_concurrency=4, base_url=url) as hh_api:
+            return await hh_api.get_vacancies_many(keywords)
+
+    started = time.perf_counter()
+    results = run_with_server(server, scenario)
+    elapsed = time.perf_counter() - started
+
+    assert list(results) == keywords
+    assert all(len(vacancies) == PAGES for vacancies in results.values())
+    assert results["keyword3"][2]["title"] == "keyword3 2"
+    assert 1 < server.max_in_flight <= 4
+    # Последовательная загрузка заняла бы len(keywords) * PAGES * DELAY секунд
+    assert elapsed < len(keywords) * PAGES * DELAY
+
+
+def test_connect_retries_unavailable_server() -> None:
+    """Тестирует повтор запроса после ответа 503."""
+    server = StandInServer(fail_first=2)
+
+    async def scenario(url: str) -> Dict[str, Any]:
+        return await AsyncHeadHunterAPI(backoff_factor=0, base_url=url).connect(url, {"text": "Python", "page": 0})
+
+    data = run_with_server(server, scenario)
+    assert data["items"][0]["name"] == "Python 0"
+    assert server.requests == 3
+
+
+def test_get_vacancies_connection_error(capsys: pytest.CaptureFixture) -> None:
+    """Тестирует обработку недоступного сервера."""
+    server = StandInServer(fail_first=100)
+
+    async def scenario(url: str) -> List[Dict[str, Any]]:
+        return await AsyncHeadHunterAPI(max_retries=1, backoff_factor=0, base_url=url).get_vacancies("Python")
+
+    assert run_with_server(server, scenario) == []
+    assert "Ошибка подключения к API: 503" in capsys.readouterr().out
+
+
+def test_invalid_limits() -> None:
+    """Тестирует проверку параметров конструктора."""
+    with pytest.raises(ValueError):
+        AsyncHeadHunterAPI(max_concurrency=0)
@@ -0,0 +1,39 @@
+from benchmarks.suite import compare, run_suite, vacancy_cases
+from benchmarks.synthetic import generate_api_items, generate_vacancies
+
+
+def test_generate_vacancies_reproducible() -> None:
+    """Тестирует, что генератор детерминирован и выдаёт вакансии в формате parse_vacancies."""
+    vacancies = list(generate_vacancies(200, seed=7))
+    assert vacancies == list(generate_vacancies(200, seed=7))
+    assert len({v["id"] for v in vacancies}) == 200
+    assert all(v["link"].startswith("https://hh.ru/vacancy/") for v in vacancies)
+    assert any(v["salary"] == "Зарплата не указана" for v in vacancies)
+    assert any(isinstance(v["salary"], float) for v in vacancies)
+    assert any("<highlighttext>" in v["description"] for v in vacancies)
+
+
+def test_run_suite_and_compare() -> None:
+    """Тестирует запуск набора на малом размере и поиск регрессий относительно базовой линии."""
+    results = run_suite([50], cases=["bulk_ingest", "filter_vacancies", "clean_html"], repeat=1)
+    assert [(item["case"], item["size"]) for item in results["results"]] == [
+        ("bulk_ingest", 50),
+        ("filter_vacancies", 50),
+        ("clean_html", 50),
+    ]
+    assert all(item["seconds"] > 0 and item["peak_bytes"] > 0 for item in results["results"])
+
+    baseline = {"results": [dict(item, seconds=item["seconds"] / 2) for item in results["results"]]}
+    assert len(compare(results, baseline, threshold=1.5)) == 3
+    assert compare(results, baseline, threshold=3) == []
+    assert compare(results, {"results": []}) == []
+
+
+def test_vacancy_construction_cases_agree() -> None:
+    """Тестирует, что способы построения Vacancy в бенчмарке дают одинаковый результат."""
+    assert generate_api_items(100, seed=3) == generate_api_items(100, seed=3)
+    cases = vacancy_cases(100)
+    expected = cases["vacancy_per_object"]["case"]()
+    assert len(expected) == 100
+    assert cases["vacancy_from_dicts"]["case"]() == expected
+    assert cases["vacancy_from_api_items"]["case"]() == expected
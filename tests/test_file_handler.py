@@ -1,11 +1,17 @@
+import io
 import json
+import multiprocessing
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from src.file_handler import JSONFileHandler
+from src.file_handler import (GroupCommitWriter, JSONFileHandler, JSONLinesFileHandler, convert_json_to_jsonl,
+                              iter_json_array)
+from src.query_cache import QueryCache
 
 
 @pytest.fixture
@@ -155,3 +161,619 @@ def test_filter_vacancies_by_salary_with_none_salary(json_saver: JSONFileHandler
     filtered = json_saver.filter_vacancies_by_salary((100000.0, 200000.0))
     assert len(filtered) == 1
     assert filtered[0]["title"] == "Python Developer"
+
+
+@pytest.fixture
+def jsonl_saver(tmp_path: Path) -> JSONLinesFileHandler:
+    """Фикстура для создания временного журнала JSON Lines."""
+    return JSONLinesFileHandler(filename=str(tmp_path / "vacancies.jsonl"))
+
+
+def test_jsonl_add_vacancy_appends_line(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что добавление вакансии дописывает одну строку в журнал."""
+    vacancy: Dict[str, Any] = {
+        "id": 1,
+        "title": "Python Developer",
+        "link": "https://example.com/1",
+        "salary": 100000,
+        "description": "<b>Опыт</b> Python",
+    }
+    jsonl_saver.add_vacancy(vacancy)
+    jsonl_saver.add_vacancy(dict(vacancy))  # Дубликат не записывается
+
+    lines = (tmp_path / "vacancies.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["description"] == "Опыт Python"
+    assert jsonl_saver.filter_vacancies(["python"])[0]["id"] == 1
+
+
+def test_jsonl_delete_and_compact(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует удаление через «надгробие» и уплотнение журнала."""
+    for vacancy_id, salary in [(1, 100000), (2, 150000), (3, "Зарплата не указана")]:
+        jsonl_saver.add_vacancy(
+            {"id": vacancy_id, "title": f"Vacancy {vacancy_id}", "link": "https://example.com", "salary": salary,
+             "description": "Описание"}
+        )
+    jsonl_saver.delete_vacancy(2)
+
+    path = tmp_path / "vacancies.jsonl"
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    assert [v["id"] for v in jsonl_saver.filter_vacancies([])] == [1, 3]
+    assert [v["id"] for v in jsonl_saver.filter_vacancies_by_salary((0, 200000))] == [1]
+    assert jsonl_saver.filter_vacancies_by_salary((0, 200000), offset=1) == []
+    assert [v["id"] for v in jsonl_saver.filter_vacancies(["опис", "python"], match_all=True)] == []
+    assert [v["id"] for v in jsonl_saver.filter_vacancies(["опис"], prefix=True)] == [1, 3]
+
+    assert jsonl_saver.compact() == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    # Новый экземпляр видит то же состояние после перезапуска
+    assert [v["id"] for v in JSONLinesFileHandler(str(path)).filter_vacancies([])] == [1, 3]
+
+
+def test_jsonl_sees_external_appends(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что записи другого процесса подхватываются и незавершённая строка игнорируется."""
+    path = tmp_path / "vacancies.jsonl"
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps({"id": 7, "title": "External", "description": "x"}) + "\n")
+        file.write('{"id": 8, "title": "Parti')
+    assert [v["id"] for v in jsonl_saver.filter_vacancies([])] == [7]
+
+
+def test_convert_json_to_jsonl(tmp_path: Path) -> None:
+    """Тестирует перенос данных из JSON-файла в журнал JSON Lines."""
+    json_path = tmp_path / "vacancies.json"
+    json_path.write_text(
+        json.dumps([{"title": "A", "salary": 1}, {"title": "B", "salary": 2}], ensure_ascii=False),
+        encoding="utf-8",
+    )
+    jsonl_path = tmp_path / "vacancies.jsonl"
+
+    assert convert_json_to_jsonl(str(json_path), str(jsonl_path)) == 2
+    assert [v["title"] for v in JSONLinesFileHandler(str(jsonl_path)).filter_vacancies([])] == ["A", "B"]
+
+
+def test_add_vacancies_single_save(json_saver: JSONFileHandler) -> None:
+    """Тестирует пакетное добавление с одной записью файла и сводкой результатов."""
+    existing: Dict[str, Any] = {
+        "title": "Python Developer",
+        "link": "http://example.com/python",
+        "salary": 150000.0,
+        "description": "Опыт работы с Python",
+    }
+    json_saver.add_vacancy(dict(existing))
+
+    batch: List[Dict[str, Any]] = [
+        dict(existing),  # Уже сохранена
+        {"title": "Data Scientist", "link": "http://example.com/data", "salary": None, "description": "<b>ML</b>"},
+        {"title": "Data Scientist", "link": "http://example.com/data", "salary": None, "description": "ML"},
+        {"title": "Без ссылки", "salary": 1, "description": "x"},
+    ]
+    with patch.object(JSONFileHandler, "_save_data", wraps=json_saver._save_data) as mock_save:
+        summary = json_saver.add_vacancies(batch)
+
+    mock_save.assert_called_once()
+    assert summary == {"added": 1, "updated": 0, "skipped": 2, "invalid": 1}
+    data = json_saver._load_data()
+    assert [v["title"] for v in data] == ["Python Developer", "Data Scientist"]
+    assert data[1]["description"] == "ML"
+
+
+def test_add_vacancies_nothing_to_save(json_saver: JSONFileHandler) -> None:
+    """Тестирует, что файл не перезаписывается, если добавлять нечего."""
+    with patch.object(JSONFileHandler, "_save_data") as mock_save:
+        assert json_saver.add_vacancies([{"title": "x"}]) == {"added": 0, "updated": 0, "skipped": 0, "invalid": 1}
+    mock_save.assert_not_called()
+
+
+def test_jsonl_add_vacancies(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует пакетное добавление в журнал JSON Lines."""
+    batch: List[Dict[str, Any]] = [
+        {"title": "A", "link": "https://example.com/a", "salary": 1, "description": "a"},
+        {"title": "A", "link": "https://example.com/a", "salary": 1, "description": "a"},
+        {"title": "B", "link": "https://example.com/b", "salary": 2, "description": "b"},
+    ]
+    assert jsonl_saver.add_vacancies(batch) == {"added": 2, "updated": 0, "skipped": 1, "invalid": 0}
+    assert len((tmp_path / "vacancies.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_add_vacancy_upserts_by_key(json_saver: JSONFileHandler) -> None:
+    """Тестирует, что повторное добавление вакансии с той же ссылкой обновляет запись."""
+    json_saver.add_vacancy(
+        {"title": "Python Developer", "link": "https://hh.ru/vacancy/123", "salary": 100000, "description": "a"}
+    )
+    json_saver.add_vacancy(
+        {"title": "Python Developer", "link": "https://hh.ru/vacancy/123/?from=search", "salary": 120000,
+         "description": "a"}
+    )
+    summary = json_saver.add_vacancies(
+        [{"id": "123", "title": "Python Developer", "link": "https://hh.ru/vacancy/123", "salary": 120000,
+          "description": "a"},
+         {"title": "Python Developer", "link": "http://www.example.com/jobs/1/", "salary": 1, "description": "b"},
+         {"title": "Python Developer", "link": "https://example.com/jobs/1", "salary": 1, "description": "b"}]
+    )
+
+    data = json_saver._load_data()
+    assert summary == {"added": 1, "updated": 2, "skipped": 0, "invalid": 0}
+    assert len(data) == 2
+    assert data[0]["salary"] == 120000
+    assert data[0]["id"] == "123"
+
+
+def test_key_index_persists_across_restarts(tmp_path: Path) -> None:
+    """Тестирует, что индекс ключей сохраняется рядом с данными и переиспользуется после перезапуска."""
+    filename = str(tmp_path / "vacancies.json")
+    JSONFileHandler(filename).add_vacancies(
+        [{"title": f"V{i}", "link": f"https://example.com/{i}", "salary": i, "description": "x"} for i in range(3)]
+    )
+    assert (tmp_path / "vacancies.keys.idx").exists()
+
+    with patch("src.file_handler.KeyIndex.build") as mock_build:
+        reopened = JSONFileHandler(filename)
+        summary = reopened.add_vacancies(
+            [{"title": "V1", "link": "https://example.com/1", "salary": 1, "description": "x"}]
+        )
+    mock_build.assert_not_called()
+    assert summary["skipped"] == 1
+
+
+def test_key_index_rebuilt_after_external_change(tmp_path: Path) -> None:
+    """Тестирует перестроение индекса, если файл данных изменили в обход обработчика."""
+    filename = tmp_path / "vacancies.json"
+    json_saver = JSONFileHandler(str(filename))
+    json_saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "x"})
+
+    filename.write_text(
+        json.dumps([{"title": "B", "link": "https://example.com/b", "salary": 2, "description": "y"}]),
+        encoding="utf-8",
+    )
+    json_saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "x"})
+    json_saver.add_vacancy({"title": "B", "link": "https://example.com/b", "salary": 2, "description": "y"})
+    assert [v["title"] for v in json_saver._load_data()] == ["B", "A"]
+
+
+def test_delete_vacancy_keeps_index_consistent(json_saver: JSONFileHandler) -> None:
+    """Тестирует, что после удаления вакансию можно добавить снова."""
+    vacancy: Dict[str, Any] = {"id": 5, "title": "A", "link": "https://example.com/a", "salary": 1,
+                               "description": "x"}
+    json_saver.add_vacancy(dict(vacancy))
+    json_saver.delete_vacancy(5)
+    assert json_saver.add_vacancies([dict(vacancy)])["added"] == 1
+
+
+def test_jsonl_upsert_replaces_previous_version(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что новая версия вакансии в журнале замещает прежнюю."""
+    jsonl_saver.add_vacancy({"title": "A", "link": "https://hh.ru/vacancy/1", "salary": 1, "description": "x"})
+    jsonl_saver.add_vacancy({"title": "A", "link": "https://hh.ru/vacancy/1", "salary": 2, "description": "x"})
+
+    assert [v["salary"] for v in jsonl_saver.filter_vacancies([])] == [2]
+    reopened = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    assert [v["salary"] for v in reopened.filter_vacancies([])] == [2]
+
+
+def test_local_ids_assigned_and_used_for_delete(json_saver: JSONFileHandler) -> None:
+    """Тестирует назначение локальных ID вакансиям без ID hh.ru и удаление по ним."""
+    json_saver.add_vacancies(
+        [{"title": f"V{i}", "link": f"https://example.com/{i}", "salary": i, "description": "x"} for i in range(4)]
+        + [{"id": "777", "title": "HH", "link": "https://hh.ru/vacancy/777", "salary": 1, "description": "x"}]
+    )
+    data = json_saver._load_data()
+    assert [v["id"] for v in data] == ["local-1", "local-2", "local-3", "local-4", "777"]
+
+    with patch.object(JSONFileHandler, "_save_data", wraps=json_saver._save_data) as mock_save:
+        assert json_saver.delete_vacancies(["local-2", 777, "missing", "local-2"]) == 2
+    mock_save.assert_called_once()
+
+    # Повторное добавление той же вакансии не меняет её ID, новый локальный ID не переиспользуется
+    json_saver.add_vacancy({"title": "V0", "link": "https://example.com/0", "salary": 0, "description": "x"})
+    json_saver.add_vacancy({"title": "New", "link": "https://example.com/new", "salary": 0, "description": "x"})
+    assert [v["id"] for v in json_saver._load_data()] == ["local-1", "local-3", "local-4", "local-5"]
+    assert json_saver.delete_vacancies(["local-4"]) == 1
+    assert [v["id"] for v in JSONFileHandler(json_saver._filename)._load_data()] == ["local-1", "local-3", "local-5"]
+
+    # Номер последнего локального ID хранится в индексе ключей: удалённый local-5 не выдаётся снова
+    assert json_saver.delete_vacancies(["local-5"]) == 1
+    reopened = JSONFileHandler(json_saver._filename)
+    reopened.add_vacancy({"title": "Next", "link": "https://example.com/next", "salary": 0, "description": "x"})
+    assert [v["id"] for v in reopened._load_data()][-1] == "local-6"
+    # Индекс устарел (файл изменён в обход обработчика), но номер из него всё равно учитывается
+    path = Path(json_saver._filename)
+    path.write_text(json.dumps(json.loads(path.read_text(encoding="utf-8"))[:-1]), encoding="utf-8")
+    rebuilt = JSONFileHandler(json_saver._filename)
+    rebuilt.add_vacancy({"title": "Last", "link": "https://example.com/last", "salary": 0, "description": "x"})
+    assert [v["id"] for v in rebuilt._load_data()][-1] == "local-7"
+
+
+def test_delete_missing_vacancy_does_not_rewrite(json_saver: JSONFileHandler, capsys: pytest.CaptureFixture) -> None:
+    """Тестирует, что удаление несуществующего ID не переписывает файл."""
+    with patch.object(JSONFileHandler, "_save_data") as mock_save:
+        json_saver.delete_vacancy("404")
+    mock_save.assert_not_called()
+    assert "Вакансия с ID 404 не найдена." in capsys.readouterr().out
+
+
+def test_jsonl_local_ids_and_delete_list(jsonl_saver: JSONLinesFileHandler, tmp_path: Path) -> None:
+    """Тестирует локальные ID и удаление списка вакансий в журнале JSON Lines."""
+    jsonl_saver.add_vacancies(
+        [{"title": f"V{i}", "link": f"https://example.com/{i}", "salary": i, "description": "x"} for i in range(3)]
+    )
+    assert [v["id"] for v in jsonl_saver.filter_vacancies([])] == ["local-1", "local-2", "local-3"]
+    assert jsonl_saver.delete_vacancies(["local-1", "local-3", "local-9"]) == 2
+
+    reopened = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    assert [v["id"] for v in reopened.filter_vacancies([])] == ["local-2"]
+    reopened.add_vacancy({"title": "New", "link": "https://example.com/new", "salary": 0, "description": "x"})
+    assert [v["id"] for v in reopened.filter_vacancies([])] == ["local-2", "local-4"]
+
+    # После уплотнения надгробий нет, но номер последнего локального ID сохраняется в журнале
+    assert reopened.delete_vacancies(["local-4"]) == 1
+    assert reopened.compact() == 1
+    compacted = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    compacted.add_vacancy({"title": "Next", "link": "https://example.com/next", "salary": 0, "description": "x"})
+    assert [v["id"] for v in compacted.filter_vacancies([])] == ["local-2", "local-5"]
+
+
+@pytest.fixture
+def indexed_saver(json_saver: JSONFileHandler) -> JSONFileHandler:
+    """Фикстура с вакансиями для проверки поиска по ключевым словам."""
+    json_saver.add_vacancies(
+        [
+            {"title": "A", "link": "https://example.com/a", "salary": 1,
+             "description": "Опыт работы с Python и Django"},
+            {"title": "B", "link": "https://example.com/b", "salary": 2, "description": "Python3, FastAPI"},
+            {"title": "C", "link": "https://example.com/c", "salary": 3, "description": "Разработка на Java"},
+        ]
+    )
+    return json_saver
+
+
+def test_filter_vacancies_index_modes(indexed_saver: JSONFileHandler) -> None:
+    """Тестирует поиск по индексу: любое слово, все слова, префикс и подстрока."""
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["python", "JAVA"])] == ["A", "C"]
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["python", "django"], match_all=True)] == ["A"]
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["python"], prefix=True)] == ["A", "B"]
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["thon"], substring=True)] == ["A", "B"]
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["РАЗРАБОТКА"])] == ["C"]
+
+
+def test_filter_vacancies_index_updated_incrementally(indexed_saver: JSONFileHandler) -> None:
+    """Тестирует обновление индекса при изменении и удалении вакансий."""
+    indexed_saver.add_vacancy({"title": "C", "link": "https://example.com/c", "salary": 3, "description": "Kotlin"})
+    assert indexed_saver.filter_vacancies(["java"]) == []
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["kotlin"])] == ["C"]
+
+    indexed_saver.delete_vacancy("local-1")
+    assert [v["title"] for v in indexed_saver.filter_vacancies(["python"], prefix=True)] == ["B"]
+
+
+def test_term_index_persisted(indexed_saver: JSONFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что индекс описаний сохраняется рядом с данными и не перестраивается после перезапуска."""
+    assert (tmp_path / "vacancies.terms.idx").exists()
+
+    with patch("src.file_handler.InvertedIndex.build") as mock_build:
+        reopened = JSONFileHandler(str(tmp_path / "vacancies.json"))
+        assert [v["title"] for v in reopened.filter_vacancies(["django"])] == ["A"]
+    mock_build.assert_not_called()
+
+
+def test_filter_vacancies_by_salary_sorted_and_paged(json_saver: JSONFileHandler) -> None:
+    """Тестирует фильтр по зарплате: сортировка по зарплате, offset/limit и обновление индекса."""
+    json_saver.add_vacancies(
+        [{"title": f"V{salary}", "link": f"https://example.com/{salary}", "salary": salary, "description": "x"}
+         for salary in [300000, 100000, 200000, 150000]]
+        + [{"title": "Без зарплаты", "link": "https://example.com/none", "salary": "Зарплата не указана",
+            "description": "x"}]
+    )
+    assert [v["salary"] for v in json_saver.filter_vacancies_by_salary((100000, 250000))] == [100000, 150000, 200000]
+    assert [v["salary"] for v in json_saver.filter_vacancies_by_salary((0, float("inf")), offset=1, limit=2)] == [
+        150000,
+        200000,
+    ]
+
+    json_saver.add_vacancy({"title": "V100000", "link": "https://example.com/100000", "salary": 500000,
+                            "description": "x"})
+    json_saver.delete_vacancy("local-4")  # V150000
+    assert [v["salary"] for v in json_saver.filter_vacancies_by_salary((0, float("inf")))] == [
+        200000,
+        300000,
+        500000,
+    ]
+
+
+def test_cached_mode_skips_reparsing(tmp_path: Path) -> None:
+    """Тестирует, что в кэширующем режиме неизменённый файл не разбирается повторно."""
+    saver = JSONFileHandler(str(tmp_path / "vacancies.json"), cached=True)
+    saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "x"})
+    version = saver.version
+
+    with patch("src.file_handler.json.load") as mock_load:
+        assert [v["title"] for v in saver.filter_vacancies([])] == ["A"]
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((0, 10))] == ["A"]
+    mock_load.assert_not_called()
+    assert saver.version == version
+
+
+def test_cached_mode_detects_external_writer(tmp_path: Path) -> None:
+    """Тестирует сброс кэша и рост версии после изменения файла другим процессом."""
+    filename = tmp_path / "vacancies.json"
+    saver = JSONFileHandler(str(filename), cached=True)
+    saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "x"})
+    version = saver.version
+
+    other = JSONFileHandler(str(filename))
+    other.add_vacancy({"title": "B", "link": "https://example.com/b", "salary": 2, "description": "x"})
+
+    assert saver.version > version
+    assert [v["title"] for v in saver.filter_vacancies([])] == ["A", "B"]
+    saver.delete_vacancy("local-1")
+    assert [v["title"] for v in other.filter_vacancies([])] == ["B"]
+
+
+def test_cached_mode_failed_save_keeps_file_state(tmp_path: Path) -> None:
+    """Тестирует, что после ошибки записи кэш и индексы не содержат несохранённых вакансий."""
+    filename = tmp_path / "vacancies.json"
+    saver = JSONFileHandler(str(filename), cached=True)
+    saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "Python"})
+
+    with patch.object(JSONFileHandler, "_save_data", side_effect=OSError("No space left on device")):
+        with pytest.raises(OSError):
+            saver.add_vacancies([{"title": "B", "link": "https://example.com/b", "salary": 2, "description": "Go"}])
+        with pytest.raises(OSError):
+            saver.delete_vacancies(["local-1"])
+    assert [v["title"] for v in saver.filter_vacancies([])] == ["A"]
+    assert saver.filter_vacancies(["go"]) == []
+    assert [v["title"] for v in saver.filter_vacancies_by_salary((0, 10))] == ["A"]
+
+    saver.add_vacancy({"title": "C", "link": "https://example.com/c", "salary": 3, "description": "Rust"})
+    assert [v["title"] for v in json.loads(filename.read_text(encoding="utf-8"))] == ["A", "C"]
+
+
+def test_query_cache_hits_and_invalidation(tmp_path: Path) -> None:
+    """Тестирует кэш результатов фильтров: нормализацию ключа и сброс после изменения данных."""
+    saver = JSONFileHandler(str(tmp_path / "vacancies.json"), query_cache=QueryCache())
+    saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 100, "description": "Python Django"})
+
+    assert [v["title"] for v in saver.filter_vacancies(["python", "Django"])] == ["A"]
+    with patch.object(JSONFileHandler, "_load_data") as mock_load:
+        assert [v["title"] for v in saver.filter_vacancies(["django", "PYTHON"])] == ["A"]
+    mock_load.assert_not_called()
+
+    saver.add_vacancy({"title": "B", "link": "https://example.com/b", "salary": 200, "description": "Python"})
+    assert [v["title"] for v in saver.filter_vacancies(["Python"])] == ["A", "B"]
+    assert [v["title"] for v in saver.filter_vacancies_by_salary((0, 1000))] == ["A", "B"]
+    saver.delete_vacancy("local-1")
+    assert [v["title"] for v in saver.filter_vacancies_by_salary((0, 1000))] == ["B"]
+    assert saver.query_cache_stats == {"hits": 1, "misses": 4, "evictions": 0, "size": 1}
+
+
+def test_iter_json_array_small_chunks() -> None:
+    """Тестирует разбор массива порциями меньше одного элемента, в том числе чисел на границе порции."""
+    items = [{"title": "Python «разработчик»", "salary": 123456}, 7890123, {"nested": [1, {"a": "]"}]}, "x"]
+    text = json.dumps(items, ensure_ascii=False, indent=4)
+    for chunk_size in (1, 3, 7, 64):
+        assert list(iter_json_array(io.StringIO(text), chunk_size)) == items
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+    assert list(iter_json_array(io.StringIO('[{"a": 1}, {"b": '), 4)) == [{"a": 1}]
+    assert list(iter_json_array(io.StringIO('{"a": 1}'))) == []
+
+
+def test_iter_json_array_bare_numbers() -> None:
+    """Тестирует числа верхнего уровня, которые порция обрывает на точке, экспоненте или середине цифр."""
+    for text, expected in [("[1.5, 2, 300]", [1.5, 2, 300]), ("[1.5,2,300]", [1.5, 2, 300]),
+                           ("[-1e5, 0.25 , true, null]", [-100000.0, 0.25, True, None])]:
+        for chunk_size in (1, 2, 3):
+            assert list(iter_json_array(io.StringIO(text), chunk_size)) == expected
+
+
+def test_iter_filter_matches_indexed_filters(json_saver: JSONFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что потоковые фильтры дают те же вакансии, что и индексные."""
+    json_saver.add_vacancies(
+        [{"title": "A", "link": "https://example.com/a", "salary": 100000, "description": "Python и Django"},
+         {"title": "B", "link": "https://example.com/b", "salary": "Зарплата не указана", "description": "Python"},
+         {"title": "C", "link": "https://example.com/c", "salary": 300000, "description": "Ёлка, Java"}]
+    )
+    assert list(json_saver.iter_vacancies()) == json_saver.filter_vacancies([])
+    for words, match_all, prefix in [(["python"], False, False), (["python", "java"], True, False),
+                                     (["елка"], False, False), (["pyth"], False, True), (["C++"], False, False)]:
+        assert list(json_saver.iter_filter(words, match_all=match_all, prefix=prefix)) == json_saver.filter_vacancies(
+            words, match_all, prefix
+        )
+    assert [v["title"] for v in json_saver.iter_filter(["python"], salary_range=(0, 200000))] == ["A"]
+    assert list(JSONFileHandler(str(tmp_path / "missing" / "none.json")).iter_vacancies()) == []
+
+
+def test_save_is_atomic(json_saver: JSONFileHandler, tmp_path: Path) -> None:
+    """Тестирует, что сбой посреди записи оставляет прежнюю версию файла и не оставляет временных файлов."""
+    json_saver.add_vacancy({"title": "A", "link": "https://example.com/a", "salary": 1, "description": "x"})
+    before = (tmp_path / "vacancies.json").read_text(encoding="utf-8")
+
+    with patch("src.file_handler.json.dump", side_effect=OSError("диск заполнен")), pytest.raises(OSError):
+        json_saver.add_vacancy({"title": "B", "link": "https://example.com/b", "salary": 2, "description": "x"})
+
+    assert (tmp_path / "vacancies.json").read_text(encoding="utf-8") == before
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_corrupt_file_is_not_overwritten(tmp_path: Path) -> None:
+    """Тестирует, что запись в повреждённый файл не затирает его, а чтение возвращает пустой список."""
+    filename = tmp_path / "vacancies.json"
+    filename.write_text('[{"title": "A", "link": ', encoding="utf-8")
+    saver = JSONFileHandler(str(filename))
+
+    assert saver.filter_vacancies([]) == []
+    with pytest.raises(ValueError, match="повреждён"):
+        saver.add_vacancy({"title": "B", "link": "https://example.com/b", "salary": 2, "description": "x"})
+    assert filename.read_text(encoding="utf-8") == '[{"title": "A", "link": '
+
+
+def _add_from_process(filename: str, worker: int) -> None:
+    """Добавляет вакансии из отдельного процесса (для теста блокировки)."""
+    saver = JSONFileHandler(filename)
+    for number in range(10):
+        saver.add_vacancies([{"title": f"{worker}-{number}", "link": f"https://example.com/{worker}/{number}",
+                              "salary": number, "description": "x"}])
+
+
+def test_concurrent_processes_do_not_lose_updates(tmp_path: Path) -> None:
+    """Тестирует, что параллельные процессы не теряют изменения друг друга."""
+    filename = str(tmp_path / "vacancies.json")
+    JSONFileHandler(filename)
+    context = multiprocessing.get_context("fork" if sys.platform != "win32" else "spawn")
+    processes = [context.Process(target=_add_from_process, args=(filename, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert len(JSONFileHandler(filename).filter_vacancies([])) == 40
+
+
+def test_group_commit_writer(json_saver: JSONFileHandler) -> None:
+    """Тестирует объединение операций из многих потоков в небольшое число записей файла."""
+    with GroupCommitWriter(json_saver, max_delay=0.05) as writer:
+
+        def worker(number: int) -> List[str]:
+            futures = [
+                writer.add({"title": f"{number}-{i}", "link": f"https://example.com/{number}/{i}", "salary": i,
+                            "description": "x"})
+                for i in range(25)
+            ]
+            return [future.result() for future in futures]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = [status for result in executor.map(worker, range(8)) for status in result]
+        assert statuses == ["added"] * 200
+        assert writer.commits < 50
+
+        invalid = writer.add({"title": "Без ссылки"})
+        deleted = writer.delete("local-1")
+        missing = writer.delete("local-1")
+        writer.flush()
+        assert (invalid.result(), deleted.result(), missing.result()) == ("invalid", True, False)
+
+    assert len(json_saver.filter_vacancies([])) == 199
+
+
+def test_filter_vacancies_by_salary_range_overlap(tmp_path: Path) -> None:
+    """Тестирует фильтр по пересечению диапазонов в рублях: по индексу, по журналу и потоковый."""
+    records = [
+        {"title": "Wide", "link": "https://example.com/wide", "salary": 50000, "salary_to": 400000,
+         "currency": "RUR", "description": "x"},
+        {"title": "Dollars", "link": "https://example.com/usd", "salary": 1000, "salary_to": 2000,
+         "currency": "USD", "description": "x"},
+        {"title": "Point", "link": "https://example.com/point", "salary": 300000, "description": "x"},
+    ]
+    json_saver = JSONFileHandler(str(tmp_path / "vacancies.json"))
+    jsonl_saver = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    for saver in (json_saver, jsonl_saver):
+        saver.add_vacancies([dict(record) for record in records])
+        assert {v["title"] for v in saver.filter_vacancies_by_salary((100000, 150000))} == {"Wide", "Dollars"}
+        assert {v["title"] for v in saver.filter_vacancies_by_salary((250000, 500000))} == {"Wide", "Point"}
+        assert saver.filter_vacancies_by_salary((400001, 500000)) == []
+
+    # Индекс возвращает вакансии по возрастанию нижней границы в рублях
+    titles = [v["title"] for v in json_saver.filter_vacancies_by_salary((0, float("inf")))]
+    assert titles == ["Wide", "Dollars", "Point"]
+    assert [v["title"] for v in json_saver.iter_filter(salary_range=(100000, 150000))] == ["Wide", "Dollars"]
+
+
+def test_upsert_replaces_salary_fields_together(tmp_path: Path) -> None:
+    """Тестирует, что при обновлении вакансии поля зарплаты прежней версии не остаются в записи."""
+    ranged = {"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7", "salary": 150000, "salary_to": 200000,
+              "currency": "RUR", "gross": True, "description": "x"}
+    json_saver = JSONFileHandler(str(tmp_path / "vacancies.json"))
+    jsonl_saver = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    for saver in (json_saver, jsonl_saver):
+        saver.add_vacancies([dict(ranged)])
+        saver.add_vacancies([dict(ranged, salary=170000, salary_to=None, currency="RUR", gross=None)])
+        saver.add_vacancy({"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7",
+                           "salary": "Зарплата не указана", "description": "x"})
+        stored = saver.filter_vacancies([])
+        assert [(v["salary"], "salary_to" in v, "currency" in v, "gross" in v) for v in stored] == [
+            ("Зарплата не указана", False, False, False)
+        ]
+        assert saver.filter_vacancies_by_salary((150000, 300000)) == []
+
+    reopened = JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))
+    assert "salary_to" not in reopened.filter_vacancies([])[0]  # Журнал воспроизводится так же
+
+
+def test_legacy_records_get_ids_on_load(tmp_path: Path) -> None:
+    """Тестирует файл прежнего формата без поля id: ID из ссылки hh.ru или локальный, удаление по ID."""
+    filename = tmp_path / "vacancies.json"
+    legacy = [
+        {"title": "Python", "link": "https://hh.ru/vacancy/117015393", "salary": "Зарплата не указана",
+         "description": "Python"},
+        {"title": "Сайт", "link": "https://example.com/job", "salary": 100000, "description": "PHP"},
+        {"title": "Go", "link": "https://hh.ru/vacancy/117015394?from=main", "salary": 150000,
+         "description": "Go"},
+    ]
+    filename.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+    # Индекс ключей, сохранённый до появления версии формата, не используется
+    (tmp_path / "vacancies.keys.idx").write_text(
+        json.dumps({"stamp": [filename.stat().st_size, filename.stat().st_mtime_ns],
+                    "index": {"count": 3, "keys": {}, "ids": {}}}),
+        encoding="utf-8",
+    )
+
+    saver = JSONFileHandler(str(filename))
+    assert [v["id"] for v in saver.filter_vacancies([])] == ["117015393", "local-1", "117015394"]
+    assert [v["id"] for v in saver.iter_vacancies()] == ["117015393", "local-1", "117015394"]
+    assert json.loads(filename.read_text(encoding="utf-8")) == legacy  # Чтение файл не меняет
+    assert convert_json_to_jsonl(str(filename), str(tmp_path / "vacancies.jsonl")) == 3
+    assert JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl")).delete_vacancies(["local-1"]) == 1
+
+    assert saver.delete_vacancies(["117015394"]) == 1
+    stored = json.loads(filename.read_text(encoding="utf-8"))
+    assert [v["id"] for v in stored] == ["117015393", "local-1"]  # ID сохранены при записи
+    saver.add_vacancy({"title": "Новая", "link": "https://example.com/new", "salary": 1, "description": "x"})
+    assert saver.delete_vacancies(["local-1", "local-2"]) == 2
+
+
+def test_legacy_duplicates_merged_on_load(tmp_path: Path) -> None:
+    """Тестирует, что копии одной вакансии в файле прежнего формата сливаются и удаляются по ID целиком."""
+    filename = tmp_path / "vacancies.json"
+    legacy = [
+        {"title": "Python", "link": "https://hh.ru/vacancy/117015393", "salary": "Зарплата не указана",
+         "description": "Python"},
+        {"title": "Go", "link": "https://hh.ru/vacancy/2", "salary": 1, "description": "Go"},
+        {"title": "Python", "link": "https://hh.ru/vacancy/117015393?query=django", "salary": 120000,
+         "description": "Python, Django"},
+    ]
+    filename.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+    saver = JSONFileHandler(str(filename), cached=True)
+    stored = saver.filter_vacancies([])
+    assert [(v["id"], v["salary"]) for v in stored] == [("117015393", 120000), ("2", 1)]
+    assert [v["id"] for v in saver.iter_vacancies()] == ["117015393", "2"]
+    assert saver.delete_vacancies(["117015393"]) == 1
+    assert [v["id"] for v in JSONFileHandler(str(filename)).filter_vacancies([])] == ["2"]
+
+
+def test_add_vacancies_skips_cleaning_clean_descriptions(tmp_path: Path) -> None:
+    """Тестирует, что уже очищенные описания (clean=False) сохраняются без повторной очистки."""
+    cleaned = {"title": "Web", "link": "https://example.com/web", "salary": 1, "description": "Знание <b>HTML</b>"}
+    for saver in (JSONFileHandler(str(tmp_path / "vacancies.json")),
+                  JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl"))):
+        saver.add_vacancies([dict(cleaned)], clean=False)
+        saver.add_vacancies([dict(cleaned, link="https://example.com/raw")])
+        assert [v["description"] for v in saver.filter_vacancies([])] == ["Знание <b>HTML</b>", "Знание HTML"]
+
+
+def test_legacy_descriptions_cleaned_once(tmp_path: Path) -> None:
+    """Тестирует, что разметка в описаниях файла прежнего формата убирается при загрузке ровно один раз."""
+    filename = tmp_path / "vacancies.json"
+    legacy = [
+        {"title": "Python", "link": "https://hh.ru/vacancy/1", "salary": 1,
+         "description": "Знание <highlighttext>Python</highlighttext> и &lt;b&gt;HTML&lt;/b&gt;"},
+    ]
+    filename.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+    saver = JSONFileHandler(str(filename))
+    expected = "Знание Python и <b>HTML</b>"
+    assert [v["description"] for v in saver.iter_vacancies()] == [expected]
+    assert saver.filter_vacancies(["highlighttext"]) == []
+    assert [v["title"] for v in saver.filter_vacancies(["python"])] == ["Python"]
+
+    saver.add_vacancy({"title": "Go", "link": "https://hh.ru/vacancy/2", "salary": 2, "description": "Go"})
+    reopened = JSONFileHandler(str(filename))
+    assert reopened.filter_vacancies([])[0]["description"] == expected  # Сохранённая запись не очищается снова
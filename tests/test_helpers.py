@@ -1,4 +1,4 @@
-from src.helpers import clean_html, parse_salary_range
+from src.helpers import clean_html, clean_html_many, parse_salary_range
 
 
 def test_clean_html() -> None:
@@ -35,3 +35,23 @@ def test_parse_salary_range() -> None:
         0,
         float("inf"),
     )  # Функция должна игнорировать отрицательные числа <button class="citation-flag" data-index="1">
+
+
+def test_clean_html_entities_and_whitespace() -> None:
+    """Тестирует декодирование сущностей, блочные теги и нормализацию пробелов."""
+    assert clean_html("Опыт&nbsp;от 3 лет &amp; знание&nbsp;SQL") == "Опыт от 3 лет & знание SQL"
+    assert clean_html("<p>Python</p><p>Django</p><ul><li>SQL</li></ul>") == "Python Django SQL"
+    assert clean_html("  <b>Senior</b>\n\t QA  ") == "Senior QA"
+    assert clean_html("опыт &lt;3 лет, a < b > c") == "опыт <3 лет, a < b > c"
+    # Декодированная разметка остаётся текстом, поэтому описание очищается только один раз
+    assert clean_html("Знание &lt;b&gt;HTML&lt;/b&gt;") == "Знание <b>HTML</b>"
+    assert clean_html(None) == "Описание отсутствует"
+
+
+def test_clean_html_many() -> None:
+    """Тестирует пакетную очистку."""
+    assert clean_html_many(["<highlighttext>Python</highlighttext>", None, "SQL"]) == [
+        "Python",
+        "Описание отсутствует",
+        "SQL",
+    ]
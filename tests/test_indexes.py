@@ -0,0 +1,107 @@
+from typing import Any, Dict, List
+
+from src.indexes import InvertedIndex, KeyIndex, SalaryIndex, canonical_link, numeric_salary, tokenize, vacancy_key
+
+
+def test_tokenize_casefolds_cyrillic() -> None:
+    """Тестирует разбиение на токены с приведением регистра кириллицы и «ё»."""
+    assert tokenize("Опыт работы с PYTHON, Django; Ёлка") == ["опыт", "работы", "с", "python", "django", "елка"]
+    assert tokenize(None) == []
+
+
+def test_vacancy_key() -> None:
+    """Тестирует выбор ключа вакансии: ID hh.ru, затем каноническая ссылка."""
+    assert vacancy_key({"id": "5", "link": "https://example.com"}) == "id:5"
+    assert vacancy_key({"link": "https://www.hh.ru/vacancy/5?from=main"}) == "id:5"
+    assert vacancy_key({"id": "local-3", "link": "HTTPS://Example.com/job/"}) == "link:example.com/job"
+    assert canonical_link("http://www.Example.com/a/#top") == "example.com/a"
+    assert vacancy_key({"title": "x"}).startswith("raw:")
+
+
+def test_key_index_ids_and_removal() -> None:
+    """Тестирует поиск по ID и сдвиг позиций после удаления."""
+    data: List[Dict[str, Any]] = [{"id": f"local-{i}", "link": f"https://example.com/{i}"} for i in range(1, 4)]
+    index = KeyIndex.build(data)
+    assert index.position_of_id("local-2") == 1
+    assert index.next_local_id() == "local-4"
+
+    del data[0]
+    index.remove_positions(data, 0)
+    assert index.position_of_id("local-1") is None
+    assert index.position_of_id("local-3") == 1
+    assert index.get("link:example.com/3") == 1
+
+
+def test_inverted_index_search_modes() -> None:
+    """Тестирует поиск любого и всех слов, а также поиск по префиксу."""
+    index = InvertedIndex()
+    index.add("a", "Опыт работы с <b>Python</b> и Django")
+    index.add("b", "Python 3, FastAPI")
+    index.add("c", "Разработка на Java")
+
+    assert index.search(["python"]) == {"a", "b"}
+    assert index.search(["PYTHON", "java"]) == {"a", "b", "c"}
+    assert index.search(["python", "django"], match_all=True) == {"a"}
+    assert index.search(["fast"]) == set()
+    assert index.search(["fast"], prefix=True) == {"b"}
+    assert index.search(["++"]) is None
+
+    index.remove("a", "Опыт работы с <b>Python</b> и Django")
+    assert index.search(["django"]) == set()
+    assert index.search(["python"]) == {"b"}
+
+
+def test_inverted_index_payload_roundtrip() -> None:
+    """Тестирует сохранение и восстановление индекса."""
+    data: List[Dict[str, Any]] = [{"link": "https://example.com/1", "description": "Python"}]
+    payload = InvertedIndex.build(data).to_payload()
+
+    restored = InvertedIndex.from_payload(payload, 1)
+    assert restored is not None
+    assert restored.search(["python"]) == {"link:example.com/1"}
+    assert InvertedIndex.from_payload(payload, 2) is None
+    assert InvertedIndex.from_payload([], 1) is None
+
+
+def test_salary_index_range_queries() -> None:
+    """Тестирует запросы диапазона зарплат с сортировкой и постраничным выводом."""
+    data: List[Dict[str, Any]] = [
+        {"link": f"https://example.com/{name}", "salary": salary}
+        for name, salary in [("300", 300), ("100", 100), ("200", 200), ("100", 100.0), ("none", "Зарплата не указана"),
+                             ("null", None), ("400", 400)]
+    ]
+    index = SalaryIndex.build(data)
+    assert len(index) == 4  # Дубликат по ссылке и вакансии без зарплаты не индексируются
+
+    assert [salary for salary, _ in index.range(100, 300)] == [100, 200, 300]
+    assert [salary for salary, _ in index.range(0, float("inf"), offset=1, limit=2)] == [200, 300]
+    assert index.count(150, 1000) == 3
+
+    index.add("new", 250.0)
+    index.remove("link:example.com/200", 200.0)
+    assert index.range(150, 260) == [(250.0, "new")]
+    assert numeric_salary({"salary": True}) is None
+
+
+def test_salary_index_interval_overlap() -> None:
+    """Тестирует поиск диапазонов зарплат, пересекающихся с запросом, в том числе широких и в валюте."""
+    data: List[Dict[str, Any]] = [
+        {"link": "https://example.com/narrow", "salary": 100000, "salary_to": 110000, "currency": "RUR"},
+        {"link": "https://example.com/wide", "salary": 50000, "salary_to": 400000, "currency": "RUR"},
+        {"link": "https://example.com/point", "salary": 250000},
+        {"link": "https://example.com/upper", "salary": None, "salary_to": 90000, "currency": "RUR"},
+        {"link": "https://example.com/unknown", "salary": 1000, "currency": "XXX"},
+    ]
+    index = SalaryIndex.build(data)
+    assert len(index) == 4
+
+    keys = [key for _, key in index.range(200000, 260000)]
+    assert keys == ["link:example.com/wide", "link:example.com/point"]  # По возрастанию нижней границы
+    assert index.count(105000, 105000) == 2
+    assert index.count(0, 95000) == 2
+    assert index.count(500000, float("inf")) == 0
+
+    index.remove("link:example.com/wide", (50000, 400000))
+    index.add("late", (300000, 350000))
+    assert [key for _, key in index.range(200000, 320000)] == ["link:example.com/point", "late"]
+    assert numeric_salary({"salary": 1000, "salary_to": 2000, "currency": "RUR"}) == 1000
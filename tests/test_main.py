@@ -1,12 +1,19 @@
+import json
+import os
+from datetime import datetime, timezone
+import subprocess
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import pytest
 
-from main import display_vacancies, user_interaction
+from main import display_vacancies, fetch_keywords, get_file_handler, main, read_keywords, user_interaction
 from src.api_handler import HeadHunterAPI
-from src.file_handler import JSONFileHandler
+from src.file_handler import JSONFileHandler, JSONLinesFileHandler
 from src.helpers import parse_salary_range
+from src.salary import CurrencyRates
+from src.sqlite_handler import SQLiteFileHandler
 
 
 @pytest.fixture
@@ -115,14 +122,24 @@ def test_user_interaction(
     )
 
     # Имитация сохранения данных в файл
-    monkeypatch.setattr(JSONFileHandler, "add_vacancy", lambda self, vacancy_data: None)
+    saved: List[Dict[str, Any]] = []
+
+    def fake_add_vacancies(
+        self: JSONFileHandler, vacancies: List[Dict[str, Any]], clean: bool = True
+    ) -> Dict[str, int]:
+        assert not clean  # Описания из API уже очищены
+        saved.extend(vacancies)
+        return {"added": len(vacancies), "updated": 0, "skipped": 0, "invalid": 0}
+
+    monkeypatch.setattr(JSONFileHandler, "add_vacancies", fake_add_vacancies)
 
     # Запуск функции user_interaction()
     user_interaction()
 
     # Проверка вывода
     captured = capsys.readouterr()
-    assert "Вакансия «Test Vacancy» успешно добавлена." in captured.out
+    assert [v["title"] for v in saved] == ["Test Vacancy"]
+    assert "Добавлено вакансий: 1, обновлено: 0, без изменений: 0, некорректных: 0." in captured.out
     assert "Выход из программы." in captured.out
 
 
@@ -171,3 +188,261 @@ def test_user_interaction_empty_search_query(
     captured = capsys.readouterr()
     assert "Поисковый запрос не может быть пустым." in captured.out
     assert "Выход из программы." in captured.out
+
+
+def test_display_vacancies_with_id(capsys: pytest.CaptureFixture) -> None:
+    """Тестирует вывод ID вакансии, если он известен."""
+    display_vacancies(
+        [{"id": "123", "title": "Python Developer", "link": "https://hh.ru/vacancy/123", "salary": 1,
+          "description": "x"}]
+    )
+    assert capsys.readouterr().out.startswith("ID: 123\nНазвание: Python Developer\n")
+
+
+def test_display_vacancies_salary_range(capsys: pytest.CaptureFixture) -> None:
+    """Тестирует вывод диапазона зарплаты с валютой и признаком gross."""
+    display_vacancies(
+        [{"title": "Python", "link": "https://hh.ru/vacancy/1", "salary": 2000, "salary_to": 3000,
+          "currency": "USD", "gross": False, "description": "x"}]
+    )
+    assert "Зарплата: от 2000 до 3000 USD (на руки)\n" in capsys.readouterr().out
+
+
+def test_user_interaction_delete_by_ids(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    tmp_path: Path,
+) -> None:
+    """
+    Тестирует удаление одной и нескольких вакансий по ID через меню.
+    """
+    saver = JSONFileHandler(filename=str(tmp_path / "vacancies.json"))
+    saver.add_vacancies(
+        [{"title": f"V{i}", "link": f"https://example.com/{i}", "salary": i, "description": "x"} for i in range(3)]
+    )
+    monkeypatch.setattr("main.JSONFileHandler", lambda **kwargs: saver)
+    inputs = iter(["2", "local-1", "2", "local-2 local-3 local-9", "2", "", "6"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    user_interaction()
+
+    captured = capsys.readouterr()
+    assert "Вакансия с ID local-1 удалена." in captured.out
+    assert "Удалено вакансий: 2." in captured.out
+    assert "Некорректный ID." in captured.out
+    assert saver._load_data() == []
+
+
+def test_get_file_handler(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Тестирует выбор хранилища параметром и переменной окружения VACANCIES_STORAGE."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("VACANCIES_STORAGE", raising=False)
+    assert isinstance(get_file_handler(), JSONFileHandler)
+    assert isinstance(get_file_handler("jsonl"), JSONLinesFileHandler)
+
+    monkeypatch.setenv("VACANCIES_STORAGE", "sqlite")
+    handler = get_file_handler()
+    assert isinstance(handler, SQLiteFileHandler)
+    handler.close()
+
+    with pytest.raises(ValueError):
+        get_file_handler("xml")
+
+
+@pytest.fixture
+def cli_storage(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> JSONFileHandler:
+    """Фикстура: хранилище JSON во временном каталоге с тремя вакансиями для команд CLI."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("VACANCIES_STORAGE", raising=False)
+    monkeypatch.setattr("main.currency_rates", CurrencyRates(str(tmp_path / "data" / "currency_rates.json")))
+    (tmp_path / "data").mkdir()
+    saver = JSONFileHandler()
+    saver.add_vacancies(
+        [
+            {"id": "1", "title": "Python", "link": "https://hh.ru/vacancy/1", "salary": 150000,
+             "description": "Python\tDjango"},
+            {"id": "2", "title": "Java", "link": "https://hh.ru/vacancy/2", "salary": 90000,
+             "description": "Java Spring"},
+            {"id": "3", "title": "Go", "link": "https://hh.ru/vacancy/3", "salary": "Зарплата не указана",
+             "description": "Go Python"},
+        ]
+    )
+    return saver
+
+
+def test_cli_filter_salary_top_export(cli_storage: JSONFileHandler, capsys: pytest.CaptureFixture) -> None:
+    """Тестирует команды чтения: вывод JSON Lines и TSV и коды завершения."""
+    assert main(["filter", "python"]) == 0
+    assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["1", "3"]
+
+    assert main(["filter", "python", "django", "--all", "--format", "tsv"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "id\ttitle\tlink\tsalary\tsalary_to\tcurrency\tgross\tdescription"
+    assert lines[1].split("\t") == ["1", "Python", "https://hh.ru/vacancy/1", "150000", "", "", "", "Python Django"]
+    assert len(lines) == 2
+
+    assert main(["salary", "100000-200000"]) == 0
+    assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["1"]
+    assert main(["salary", "abc"]) == 2
+    assert "Некорректный формат" in capsys.readouterr().err
+
+    assert main(["top", "2"]) == 0
+    assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["1", "2"]
+
+    assert main(["export"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 3
+
+
+def test_cli_delete_exit_code(cli_storage: JSONFileHandler, capsys: pytest.CaptureFixture) -> None:
+    """Тестирует, что delete возвращает 1, если не все ID найдены."""
+    assert main(["delete", "1"]) == 0
+    assert main(["delete", "2", "42"]) == 1
+    assert "Удалено вакансий: 1 из 2." in capsys.readouterr().err
+    assert [vacancy["id"] for vacancy in cli_storage.filter_vacancies([])] == ["3"]
+
+
+def test_read_keywords(tmp_path: Path) -> None:
+    """Тестирует чтение запросов: пропуск пустых строк и комментариев, удаление повторов."""
+    path = tmp_path / "keywords.txt"
+    path.write_text("python\n\n# комментарий\n  java  \npython\n", encoding="utf-8")
+    assert read_keywords(str(path)) == ["python", "java"]
+
+
+class FakeAPI:
+    """Заглушка HeadHunterAPI: запрос "down" завершается ошибкой подключения."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self.closed = False
+
+    def fetch_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
+        if keyword == "down":
+            raise ConnectionError("timeout")
+        return [
+            {"title": f"{keyword} dev", "link": f"https://hh.ru/vacancy/{keyword}", "salary": 100000,
+             "description": keyword},
+            {"title": "Shared", "link": "https://hh.ru/vacancy/shared", "salary": 50000, "description": "shared"},
+        ]
+
+    def sync_vacancies(self, keyword: str, state: Any) -> List[Dict[str, Any]]:
+        state.update(keyword, {f"{keyword}-old": datetime(2020, 1, 1, tzinfo=timezone.utc)})
+        return [
+            {"id": f"{keyword}-old", "title": "Old", "link": f"https://example.com/{keyword}-old", "salary": 1,
+             "description": "old"},
+        ]
+
+    def get_currency_rates(self) -> Dict[str, float]:
+        return {"RUR": 1.0, "USD": 0.01}
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_fetch_keywords_keeps_order() -> None:
+    """Тестирует, что параллельная загрузка возвращает результаты в порядке запросов и не прерывается ошибкой."""
+    keywords = [f"kw{i}" for i in range(20)] + ["down"]
+    results = fetch_keywords(FakeAPI(), keywords, jobs=4)  # type: ignore[arg-type]
+    assert [keyword for keyword, _, _ in results] == keywords
+    assert results[-1] == ("down", [], "timeout")
+    assert all(len(vacancies) == 2 for _, vacancies, _ in results[:-1])
+
+
+def test_cli_fetch(
+    cli_storage: JSONFileHandler, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Тестирует fetch: запросы из файла, одна запись в хранилище, код 1 при ошибке запроса."""
+    monkeypatch.setattr("main.HeadHunterAPI", FakeAPI)
+    (tmp_path / "keywords.txt").write_text("rust\nscala\n", encoding="utf-8")
+
+    assert main(["fetch", "-f", "keywords.txt", "--no-cache"]) == 0
+    assert (tmp_path / "data" / "currency_rates.json").exists()  # Курсы обновлены при загрузке
+    out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert out == [{"keyword": "rust", "fetched": 2, "error": None}, {"keyword": "scala", "fetched": 2, "error": None}]
+    links = {vacancy["link"] for vacancy in cli_storage.filter_vacancies([])}
+    assert {"https://hh.ru/vacancy/rust", "https://hh.ru/vacancy/scala", "https://hh.ru/vacancy/shared"} <= links
+
+    assert main(["fetch", "down", "--no-cache", "--format", "tsv"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[1] == "down\t0\ttimeout"
+    assert "с ошибкой: 1" in captured.err
+
+    assert main(["fetch", "--no-cache"]) == 2
+
+
+def test_cli_incremental_fetch_and_stale(
+    cli_storage: JSONFileHandler, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    """Тестирует fetch --incremental: состояние синхронизации рядом с данными и удаление устаревших вакансий."""
+    monkeypatch.setattr("main.HeadHunterAPI", FakeAPI)
+    assert main(["fetch", "rust", "--incremental", "--no-cache"]) == 0
+    assert Path(cli_storage.filename + ".sync.json").exists()
+    capsys.readouterr()
+
+    assert main(["stale"]) == 0
+    assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["rust-old"]
+
+    assert main(["stale", "--delete"]) == 0
+    assert "Удалено устаревших вакансий: 1." in capsys.readouterr().err
+    assert "rust-old" not in {vacancy["id"] for vacancy in cli_storage.filter_vacancies([])}
+    assert main(["stale"]) == 0
+    assert capsys.readouterr().out == ""
+
+
+ROOT = Path(__file__).resolve().parent.parent
+# Бюджет импорта для локальных команд, мс, с запасом на медленные машины; с сетевым стеком старт занимал
+# 120-160 мс, после ленивой загрузки — 25-40 мс
+IMPORT_BUDGET_MS = 100
+NETWORK_MODULES = ("requests", "urllib3", "charset_normalizer", "aiohttp", "hashlib", "sqlite3")
+# Импортирует main в новом интерпретаторе, выполняет команду и записывает загруженные модули в файл
+LOADED_MODULES_SCRIPT = """
+import json, sys
+import main
+code = main.main(sys.argv[2:])
+with open(sys.argv[1], "w", encoding="utf-8") as file:
+    json.dump({"code": code, "modules": sorted(sys.modules)}, file)
+"""
+
+
+def _run_command(args: List[str], cwd: Path, stdin: str = "") -> Tuple[int, List[str], int]:
+    """
+    Запускает команду main.py в новом интерпретаторе с -X importtime.
+    :param stdin: Ввод для интерактивного меню.
+    :return: Код завершения команды, имена модулей, загруженных к её окончанию, и суммарное время импорта
+             модулей верхнего уровня без site (мкс).
+    """
+    report = cwd / "modules.json"
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONPYCACHEPREFIX=str(cwd / "pycache"))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # замеряем запуск с готовым байт-кодом, как в cron
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOADED_MODULES_SCRIPT, str(report), *args],
+        cwd=cwd, env=env, input=stdin, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") and name.strip() != "site":
+            total += int(cumulative)
+    report_data = json.loads(report.read_text(encoding="utf-8"))
+    return report_data["code"], report_data["modules"], total
+
+
+def test_local_command_skips_network_stack(tmp_path: Path) -> None:
+    """
+    Тестирует, что импорт main, локальные команды и интерактивный сеанс без загрузки с hh.ru не загружают
+    сетевой стек и sqlite3, а время импорта укладывается в бюджет.
+    """
+    data = tmp_path / "data"
+    data.mkdir()
+    JSONFileHandler(str(data / "vacancies.json")).add_vacancies(
+        [{"title": "Python", "link": "https://hh.ru/vacancy/1", "salary": 100000, "description": "Python"}]
+    )
+    runs = [(["top", "1"], ""), (["filter", "python"], ""), (["salary", "0-200000"], ""), ([], "3\npython\n5\n6\n")]
+    for args, stdin in runs:
+        code, modules, _ = _run_command(args, tmp_path, stdin)
+        assert code == 0 and "src.file_handler" in modules
+        assert [name for name in NETWORK_MODULES if name in modules] == []
+
+    timings = [_run_command(["top", "1"], tmp_path)[2] for _ in range(3)]
+    assert min(timings) / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.api_handler import HeadHunterAPI
+from src.file_handler import JSONFileHandler
+from src.metrics import Metrics, metrics
+
+
+@pytest.fixture
+def enabled_metrics() -> Iterator[Metrics]:
+    """Фикстура, включающая общий реестр метрик на время теста."""
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_registry_records_nothing() -> None:
+    """Тестирует, что выключенный реестр ничего не накапливает."""
+    registry = Metrics()
+    registry.increment("requests_total")
+    registry.observe("load", 0.5)
+    with registry.timer("block"):
+        pass
+    assert registry.timed("call")(lambda x: x * 2)(21) == 42
+    assert registry.to_dict() == {"counters": [], "histograms": {}}
+
+
+def test_histograms_counters_and_export(tmp_path: Path) -> None:
+    """Тестирует гистограммы, счётчики с метками и выгрузку в JSON и формат Prometheus."""
+    registry = Metrics(enabled=True)
+    registry.observe("load", 0.003)
+    registry.observe("load", 0.2)
+    registry.observe("load", 20.0)
+    registry.increment("http_responses_total", status=200)
+    registry.increment("http_responses_total", 2, status=503)
+
+    snapshot = registry.to_dict()
+    assert snapshot["histograms"]["load"]["count"] == 3
+    assert snapshot["histograms"]["load"]["buckets"]["0.005"] == 1
+    assert snapshot["histograms"]["load"]["buckets"]["+Inf"] == 1
+    assert {"name": "http_responses_total", "labels": {"status": "503"}, "value": 2} in snapshot["counters"]
+
+    text = registry.to_prometheus()
+    assert "# TYPE vacancies_http_responses_total counter" in text
+    assert 'vacancies_http_responses_total{status="200"} 1' in text
+    assert 'vacancies_operation_seconds_bucket{le="0.25",operation="load"} 2' in text
+    assert 'vacancies_operation_seconds_bucket{le="+Inf",operation="load"} 3' in text
+    assert 'vacancies_operation_seconds_count{operation="load"} 3' in text
+    assert 'vacancies_operation_seconds_sum{operation="load"} 20.203' in text
+
+    registry.export(str(tmp_path / "metrics.prom"))
+    registry.export(str(tmp_path / "metrics.json"))
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+    assert json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8")) == snapshot
+
+    registry.increment("file_written_bytes_total", 123456789)
+    registry.increment("retry_delay_seconds_total", 0.1234567891)
+    text = registry.to_prometheus()
+    assert "vacancies_file_written_bytes_total 123456789\n" in text
+    assert "vacancies_retry_delay_seconds_total 0.1234567891\n" in text
+
+
+def test_storage_and_http_instrumentation(enabled_metrics: Metrics, tmp_path: Path) -> None:
+    """Тестирует метрики хранилища и HTTP-клиента."""
+    saver = JSONFileHandler(str(tmp_path / "vacancies.json"))
+    saver.add_vacancies([{"title": "A", "link": "https://example.com/a", "salary": 1, "description": "Python"}])
+    saver.filter_vacancies(["python"])
+
+    hh_api = HeadHunterAPI(max_retries=1)
+    responses = [Mock(status_code=503, headers={}, content=b""), Mock(status_code=200, headers={}, content=b"{}")]
+    responses[1].json.return_value = {}
+    with patch.object(hh_api._session, "get", side_effect=responses), patch("src.api_handler.time.sleep"):
+        hh_api.connect("https://api.hh.ru/vacancies", {})
+
+    snapshot = enabled_metrics.to_dict()
+    counters = {(item["name"], tuple(item["labels"].items())): item["value"] for item in snapshot["counters"]}
+    assert {"json_load", "json_save", "filter_vacancies", "http_connect"} <= set(snapshot["histograms"])
+    assert counters[("records_saved_total", ())] == 1
+    assert counters[("file_written_bytes_total", ())] == (tmp_path / "vacancies.json").stat().st_size
+    assert counters[("http_responses_total", (("status", "503"),))] == 1
+    assert counters[("http_retries_total", ())] == 1
+    assert counters[("http_received_bytes_total", ())] == 2
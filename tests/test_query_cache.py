@@ -0,0 +1,40 @@
+import pytest
+
+from src.query_cache import QueryCache, normalize_words
+
+
+def test_normalize_words_ignores_order_and_case() -> None:
+    """Тестирует, что ключ не зависит от порядка, регистра, повторов и пробелов."""
+    assert normalize_words(["Python", " django "]) == normalize_words(["DJANGO", "python", "Python"])
+    assert normalize_words(["", "  "]) == ()
+
+
+def test_get_put_and_lru_eviction() -> None:
+    """Тестирует попадания, промахи и вытеснение давно не использованной записи."""
+    cache = QueryCache(max_entries=2)
+    assert cache.get(1, "a") is None
+    cache.put(1, "a", [1])
+    cache.put(1, "b", [2])
+    assert cache.get(1, "a") == [1]  # «a» становится самой свежей
+    cache.put(1, "c", [3])
+
+    assert cache.get(1, "b") is None
+    assert cache.get(1, "c") == [3]
+    assert cache.stats == {"hits": 2, "misses": 2, "evictions": 1, "size": 2}
+
+
+def test_version_change_drops_results() -> None:
+    """Тестирует, что результаты прежней версии данных не возвращаются."""
+    cache = QueryCache()
+    cache.put(1, "a", [1])  # Версия ещё не видна кэшу: результат не сохраняется
+    assert cache.get(1, "a") is None
+    cache.put(1, "a", [1])
+    assert cache.get(2, "a") is None
+    cache.put(1, "a", [1])  # Вычислен по устаревшим данным
+    assert len(cache) == 0
+
+
+def test_invalid_size() -> None:
+    """Тестирует проверку размера кэша."""
+    with pytest.raises(ValueError):
+        QueryCache(max_entries=0)
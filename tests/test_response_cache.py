@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResponseCache:
+    """Фикстура для создания кэша во временном каталоге."""
+    return ResponseCache(str(tmp_path / "cache"), ttl=60, max_entries=2)
+
+
+def test_make_key_normalizes_params() -> None:
+    """Тестирует, что ключ не зависит от порядка и типа параметров."""
+    url = "https://api.hh.ru/vacancies"
+    assert ResponseCache.make_key(url, {"text": "Python", "page": 0}) == ResponseCache.make_key(
+        url, {"page": "0", "text": "Python"}
+    )
+    assert ResponseCache.make_key(url, {"text": "Python"}) != ResponseCache.make_key(url, {"text": "Java"})
+
+
+def test_lookup_and_store(cache: ResponseCache) -> None:
+    """Тестирует сохранение ответа и попадание в кэш."""
+    url = "https://api.hh.ru/vacancies"
+    assert cache.lookup(url, {"text": "Python"}) == (None, {})
+
+    cache.store(url, {"text": "Python"}, {"items": []}, {"ETag": '"abc"'})
+    assert cache.lookup(url, {"text": "Python"}) == ({"items": []}, {})
+    assert cache.stats == {"hits": 1, "misses": 1, "revalidations": 0}
+
+
+def test_stale_entry_returns_validators(tmp_path: Path) -> None:
+    """Тестирует, что для устаревшей записи возвращаются заголовки условного запроса."""
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.store("https://example.com", {}, {"items": []}, {"ETag": '"abc"'})
+
+    assert cache.lookup("https://example.com", {}) == (None, {"If-None-Match": '"abc"'})
+    assert cache.revalidate("https://example.com", {}) == {"items": []}
+    assert cache.revalidate("https://example.com/other", {}) is None
+    assert cache.stats["revalidations"] == 1
+
+
+def test_lru_eviction(cache: ResponseCache, tmp_path: Path) -> None:
+    """Тестирует вытеснение наименее недавно использованной записи."""
+    for index, name in enumerate(["a", "b"]):
+        cache.store("https://example.com", {"q": name}, name, {})
+        path = tmp_path / "cache" / f"{ResponseCache.make_key('https://example.com', {'q': name})}.json"
+        os.utime(path, ns=(index * 10**9, index * 10**9))
+
+    # Обращение к «a» делает её самой свежей, поэтому вытесняется «b»
+    cache.lookup("https://example.com", {"q": "a"})
+    cache.store("https://example.com", {"q": "c"}, "c", {})
+
+    assert cache.lookup("https://example.com", {"q": "a"})[0] == "a"
+    assert cache.lookup("https://example.com", {"q": "b"})[0] is None
+    assert cache.lookup("https://example.com", {"q": "c"})[0] == "c"
+
+
+def test_invalid_settings(tmp_path: Path) -> None:
+    """Тестирует проверку параметров конструктора."""
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), ttl=-1)
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), max_entries=0)
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.salary import (CurrencyRates, format_salary, merge_vacancy, normalize_currency, parse_salary_text,
+                        salary_interval, salary_overlaps)
+
+
+@pytest.fixture
+def rates(tmp_path: Path) -> CurrencyRates:
+    """Фикстура таблицы курсов во временном файле."""
+    return CurrencyRates(str(tmp_path / "rates.json"))
+
+
+def test_salary_interval_bounds_and_legacy_records(rates: CurrencyRates) -> None:
+    """Тестирует диапазон зарплаты: обе границы, одна граница и записи без валюты."""
+    assert salary_interval({"salary": 100000, "salary_to": 150000, "currency": "RUR"}, rates) == (100000, 150000)
+    assert salary_interval({"salary": 100000}, rates) == (100000, 100000)
+    assert salary_interval({"salary": None, "salary_to": 90000}, rates) == (90000, 90000)
+    assert salary_interval({"salary": 200000, "salary_to": 100000}, rates) == (200000, 200000)
+    assert salary_interval({"salary": "Зарплата не указана"}, rates) is None
+    assert salary_interval({"salary": True}, rates) is None
+
+
+def test_salary_interval_converts_currency(rates: CurrencyRates) -> None:
+    """Тестирует приведение к рублям по таблице курсов и отказ для неизвестной валюты."""
+    rates.update({"RUR": 1, "USD": 0.01})
+    assert salary_interval({"salary": 1000, "salary_to": 2000, "currency": "USD"}, rates) == (100000, 200000)
+    assert salary_interval({"salary": 1000, "currency": "RUB"}, rates) == (1000, 1000)
+    assert salary_interval({"salary": 1000, "currency": "XXX"}, rates) is None
+    assert normalize_currency(" byn ") == "BYR"
+    assert normalize_currency("") is None
+
+
+def test_currency_rates_persist_and_expire(rates: CurrencyRates, tmp_path: Path) -> None:
+    """Тестирует сохранение таблицы курсов, её повторное чтение и устаревание."""
+    assert rates.is_stale()
+    assert rates.to_rub(110, "USD") == pytest.approx(10000)  # Курс по умолчанию
+
+    rates.update({"USD": 0.0125, "EUR": 0})
+    assert not rates.is_stale()
+    assert rates.is_stale(ttl=-1)
+
+    restored = CurrencyRates(str(tmp_path / "rates.json"))
+    assert restored.to_rub(100, "USD") == pytest.approx(8000)
+    assert restored.rate("EUR") == pytest.approx(0.0103)  # Нулевой курс не заменяет известный
+    assert restored.rate("RUR") == 1.0
+    assert not restored.is_stale()
+
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    broken = CurrencyRates(str(tmp_path / "broken.json"))
+    assert broken.rate("USD") == pytest.approx(0.011)
+    assert json.loads((tmp_path / "rates.json").read_text(encoding="utf-8"))["rates"]["USD"] == 0.0125
+
+
+def test_salary_overlaps() -> None:
+    """Тестирует пересечение диапазона зарплаты вакансии с диапазоном фильтра."""
+    vacancy = {"salary": 100000, "salary_to": 150000, "currency": "RUR"}
+    assert salary_overlaps(vacancy, (140000, 300000))
+    assert salary_overlaps(vacancy, (50000, 100000))
+    assert not salary_overlaps(vacancy, (150001, 300000))
+    assert not salary_overlaps({"salary": "Зарплата не указана"}, (0, float("inf")))
+
+
+def test_parse_salary_text() -> None:
+    """Тестирует разбор зарплаты, записанной строкой."""
+    assert parse_salary_text("100 000-150 000 руб.") == (100000, 150000, "RUR")
+    assert parse_salary_text("от 1500 до 2000 USD") == (1500, 2000, "USD")
+    assert parse_salary_text("до 90000") == (None, 90000, None)
+    assert parse_salary_text("от 120000,5 ₽") == (120000.5, None, "RUR")
+    assert parse_salary_text("по договорённости") == (None, None, None)
+
+
+def test_format_salary() -> None:
+    """Тестирует вывод зарплаты: диапазон, валюта, налоги и прежний формат записей."""
+    assert format_salary({"salary": 100000}) == "100000 руб."
+    assert format_salary({"salary": 100000.0, "salary_to": 150000, "currency": "RUR", "gross": True}) == (
+        "от 100000 до 150000 RUR (до вычета налогов)"
+    )
+    assert format_salary({"salary": None, "salary_to": 2000, "currency": "USD", "gross": False}) == (
+        "до 2000 USD (на руки)"
+    )
+    assert format_salary({"salary": 1500.5, "currency": "EUR"}) == "1500.5 EUR"
+    assert format_salary({"salary": "Зарплата не указана", "currency": "EUR"}) == "Зарплата не указана"
+
+
+def test_merge_vacancy_replaces_salary_group() -> None:
+    """Тестирует, что поля зарплаты замещаются вместе, а остальные поля сохраняются."""
+    current = {"title": "Go", "salary": 1000, "salary_to": 2000, "currency": "USD", "gross": True, "id": "7"}
+    assert merge_vacancy(current, {"salary": "Зарплата не указана"}) == {
+        "title": "Go", "salary": "Зарплата не указана", "id": "7"
+    }
+    assert merge_vacancy(current, {"salary": 1500, "currency": "EUR"}) == {
+        "title": "Go", "salary": 1500, "currency": "EUR", "id": "7"
+    }
+    assert merge_vacancy(current, {"title": "Golang"})["salary_to"] == 2000  # Зарплата не передана — не меняется
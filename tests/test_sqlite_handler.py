@@ -0,0 +1,202 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from src.file_handler import JSONFileHandler, JSONLinesFileHandler
+from src.salary import CurrencyRates
+from src.sqlite_handler import SQLiteFileHandler
+
+
+@pytest.fixture
+def sqlite_saver(tmp_path: Path) -> Iterator[SQLiteFileHandler]:
+    """Фикстура для создания временной базы SQLite."""
+    with SQLiteFileHandler(filename=str(tmp_path / "vacancies.db")) as saver:
+        yield saver
+
+
+@pytest.fixture
+def test_vacancies() -> List[Dict[str, Any]]:
+    return [
+        {"id": "1", "title": "Python Developer", "link": "https://hh.ru/vacancy/1", "salary": 150000.0,
+         "description": "Опыт работы с <b>Python</b> и Django"},
+        {"title": "Data Scientist", "link": "https://example.com/data", "salary": 200000,
+         "description": "Машинное обучение"},
+        {"title": "Junior Developer", "link": "https://example.com/junior", "salary": "Зарплата не указана",
+         "description": "Без опыта работы"},
+    ]
+
+
+def test_add_and_filter(sqlite_saver: SQLiteFileHandler, test_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует добавление вакансий и полнотекстовую фильтрацию."""
+    summary = sqlite_saver.add_vacancies(test_vacancies + [{"title": "Без ссылки"}])
+    assert summary == {"added": 3, "updated": 0, "skipped": 0, "invalid": 1}
+
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["python"])] == ["Python Developer"]
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["машин", "django"])] == ["Python Developer"]
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["машин", "django"], prefix=True)] == [
+        "Python Developer",
+        "Data Scientist",
+    ]
+    assert [v["id"] for v in sqlite_saver.filter_vacancies([])] == ["1", "local-1", "local-2"]
+    assert sqlite_saver.filter_vacancies([])[0]["description"] == "Опыт работы с Python и Django"
+
+
+def test_filter_by_salary(sqlite_saver: SQLiteFileHandler, test_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует фильтрацию по зарплате: вакансии без зарплаты не попадают в диапазон."""
+    sqlite_saver.add_vacancies(test_vacancies)
+    assert [v["title"] for v in sqlite_saver.filter_vacancies_by_salary((100000, 180000))] == ["Python Developer"]
+    assert len(sqlite_saver.filter_vacancies_by_salary((0, float("inf")))) == 2
+
+
+def test_upsert_and_delete(sqlite_saver: SQLiteFileHandler, test_vacancies: List[Dict[str, Any]],
+                           capsys: pytest.CaptureFixture) -> None:
+    """Тестирует обновление существующей вакансии и удаление по ID."""
+    sqlite_saver.add_vacancies(test_vacancies)
+    sqlite_saver.add_vacancy(
+        {"title": "Senior Python Developer", "link": "https://hh.ru/vacancy/1", "salary": 250000,
+         "description": "Rust"}
+    )
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["rust"])] == ["Senior Python Developer"]
+    assert sqlite_saver.filter_vacancies(["django"]) == []
+
+    assert sqlite_saver.delete_vacancies(["1", "local-2", "missing"]) == 2
+    sqlite_saver.delete_vacancy("missing")
+    assert [v["id"] for v in sqlite_saver.filter_vacancies([])] == ["local-1"]
+    assert "Вакансия с ID missing не найдена." in capsys.readouterr().out
+
+
+def test_data_persists_and_local_ids_not_reused(tmp_path: Path, test_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует сохранность данных после переоткрытия базы и уникальность локальных ID."""
+    filename = str(tmp_path / "vacancies.db")
+    with SQLiteFileHandler(filename) as saver:
+        saver.add_vacancies(test_vacancies)
+        saver.delete_vacancy("local-2")
+
+    with SQLiteFileHandler(filename) as saver:
+        saver.add_vacancy({"title": "New", "link": "https://example.com/new", "salary": 1, "description": "x"})
+        assert [v["id"] for v in saver.filter_vacancies([])] == ["1", "local-1", "local-3"]
+        journal_mode = saver._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+
+def test_filter_options(sqlite_saver: SQLiteFileHandler, test_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует параметры фильтров, общие для всех хранилищ: все слова и постраничный вывод."""
+    sqlite_saver.add_vacancies(test_vacancies)
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["python", "django"], match_all=True)] == [
+        "Python Developer"
+    ]
+    assert sqlite_saver.filter_vacancies(["python", "машин"], match_all=True) == []
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["pyth"], prefix=True)] == ["Python Developer"]
+    everything = (0, float("inf"))
+    assert [v["id"] for v in sqlite_saver.filter_vacancies_by_salary(everything, offset=1)] == ["local-1"]
+    assert [v["id"] for v in sqlite_saver.filter_vacancies_by_salary(everything, limit=1)] == ["1"]
+
+
+def test_word_filter_matches_other_storages(tmp_path: Path) -> None:
+    """Тестирует, что фильтр по словам даёт те же вакансии, что и хранилища JSON и JSON Lines."""
+    vacancies = [
+        {"title": "Python Developer", "link": "https://example.com/a", "salary": 1, "description": "Опыт Java"},
+        {"title": "B", "link": "https://example.com/b", "salary": 1, "description": "Знание python3 и Django"},
+        {"title": "C", "link": "https://example.com/c", "salary": 1, "description": "Python, C++, Ёлка"},
+    ]
+    sqlite_saver = SQLiteFileHandler(str(tmp_path / "vacancies.db"))
+    savers = [JSONFileHandler(str(tmp_path / "vacancies.json")),
+              JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl")), sqlite_saver]
+    for saver in savers:
+        saver.add_vacancies([dict(vacancy) for vacancy in vacancies])
+    queries = [(["python"], False, False), (["python"], False, True), (["python", "django"], True, True),
+               (["елка"], False, False), (["c++"], False, False), (["++"], False, False), (["java"], False, False)]
+    for words, match_all, prefix in queries:
+        results = [[v["title"] for v in saver.filter_vacancies(words, match_all=match_all, prefix=prefix)]
+                   for saver in savers]
+        assert results[0] == results[1] == results[2], words
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["python"])] == ["C"]  # Название не учитывается
+    assert [v["title"] for v in sqlite_saver.filter_vacancies(["python"], prefix=True)] == ["B", "C"]
+    sqlite_saver.close()
+
+
+def test_filter_words_are_escaped(sqlite_saver: SQLiteFileHandler, test_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует, что спецсимволы FTS5 в словах фильтра не вызывают ошибок."""
+    sqlite_saver.add_vacancies(test_vacancies)
+    assert sqlite_saver.filter_vacancies(['"python', "AND", "c++"])[0]["title"] == "Python Developer"
+
+
+def test_filter_by_salary_range_overlap(sqlite_saver: SQLiteFileHandler) -> None:
+    """Тестирует поиск по пересечению диапазонов зарплат в рублях, в том числе в валюте и после обновления."""
+    sqlite_saver.add_vacancies([
+        {"id": "1", "title": "Wide", "link": "https://hh.ru/vacancy/1", "salary": 50000, "salary_to": 400000,
+         "currency": "RUR", "description": "x"},
+        {"id": "2", "title": "Dollars", "link": "https://hh.ru/vacancy/2", "salary": 1000, "salary_to": 2000,
+         "currency": "USD", "description": "x"},
+        {"id": "3", "title": "Unknown", "link": "https://hh.ru/vacancy/3", "salary": 1000, "currency": "XXX",
+         "description": "x"},
+    ])
+    assert [v["title"] for v in sqlite_saver.filter_vacancies_by_salary((300000, 500000))] == ["Wide"]
+    assert [v["title"] for v in sqlite_saver.filter_vacancies_by_salary((100000, 150000))] == ["Wide", "Dollars"]
+    assert sqlite_saver.filter_vacancies_by_salary((400000.5, 500000)) == []
+
+    sqlite_saver.add_vacancy({"id": "1", "title": "Wide", "link": "https://hh.ru/vacancy/1", "salary": 60000,
+                              "salary_to": 70000, "currency": "RUR", "description": "x"})
+    assert [v["title"] for v in sqlite_saver.filter_vacancies_by_salary((300000, 500000))] == []
+
+
+def test_salary_filter_follows_rate_updates(tmp_path: Path) -> None:
+    """Тестирует пересчёт рублёвых границ зарплат в валюте после обновления курсов."""
+    rates = CurrencyRates(str(tmp_path / "currency_rates.json"))
+    rates.update({"USD": 0.01})
+    with SQLiteFileHandler(str(tmp_path / "vacancies.db"), rates=rates) as saver:
+        saver.add_vacancies([
+            {"id": "1", "title": "Dollars", "link": "https://hh.ru/vacancy/1", "salary": 1000, "salary_to": 2000,
+             "currency": "USD", "description": "x"},
+            {"id": "2", "title": "Roubles", "link": "https://hh.ru/vacancy/2", "salary": 150000, "description": "x"},
+        ])
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((100000, 200000))] == ["Dollars", "Roubles"]
+
+        rates.update({"USD": 0.02})  # 1000-2000 USD = 50 000-100 000 руб.
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((60000, 90000))] == ["Dollars"]
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((120000, 200000))] == ["Roubles"]
+
+    # Версия курсов, по которой посчитаны границы, хранится в базе: с тем же файлом курсов пересчёта нет
+    reopened_rates = CurrencyRates(str(tmp_path / "currency_rates.json"))
+    with SQLiteFileHandler(str(tmp_path / "vacancies.db"), rates=reopened_rates) as saver:
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((60000, 90000))] == ["Dollars"]
+
+
+def test_old_database_is_migrated(tmp_path: Path) -> None:
+    """Тестирует, что база без верхней границы зарплаты и R*-дерева дополняется при открытии."""
+    filename = str(tmp_path / "old.db")
+    connection = sqlite3.connect(filename)
+    connection.executescript(
+        "CREATE TABLE vacancies (rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, key TEXT NOT NULL UNIQUE, "
+        "title TEXT NOT NULL, description TEXT NOT NULL, salary REAL, data TEXT NOT NULL);"
+    )
+    connection.execute(
+        "INSERT INTO vacancies (id, key, title, description, salary, data) VALUES (?, ?, ?, ?, ?, ?)",
+        ("1", "id:1", "Old", "x", 120000.0, json.dumps({"id": "1", "title": "Old", "salary": 120000.0})),
+    )
+    connection.commit()
+    connection.close()
+
+    with SQLiteFileHandler(filename) as saver:
+        assert [v["title"] for v in saver.filter_vacancies_by_salary((100000, 130000))] == ["Old"]
+        assert saver.filter_vacancies_by_salary((130000, 200000)) == []
+
+
+def test_upsert_replaces_salary_fields_together(sqlite_saver: SQLiteFileHandler) -> None:
+    """Тестирует, что обновление без зарплаты убирает прежний диапазон из записи и из R*-дерева."""
+    ranged = {"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7", "salary": 150000, "salary_to": 200000,
+              "currency": "RUR", "gross": True, "description": "x"}
+    sqlite_saver.add_vacancy(dict(ranged))
+    sqlite_saver.add_vacancy({"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7", "salary": 160000,
+                              "description": "x"})
+    assert sqlite_saver.filter_vacancies_by_salary((180000, 300000)) == []
+
+    sqlite_saver.add_vacancy({"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7",
+                              "salary": "Зарплата не указана", "description": "x"})
+    stored = sqlite_saver.filter_vacancies([])[0]
+    assert stored == {"id": "7", "title": "Go", "link": "https://hh.ru/vacancy/7", "salary": "Зарплата не указана",
+                      "description": "x"}
+    assert sqlite_saver.filter_vacancies_by_salary((0, float("inf"))) == []
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from src.sync_state import SyncState, format_hh_date, parse_hh_date
+
+
+@pytest.fixture
+def state_path(tmp_path: Path) -> str:
+    """Фикстура: путь к файлу состояния во временном каталоге."""
+    return str(tmp_path / "vacancies.json.sync.json")
+
+
+def test_parse_and_format_hh_date() -> None:
+    """Тестирует разбор дат hh.ru и приведение их к UTC."""
+    moment = parse_hh_date("2024-05-01T12:00:00+0300")
+    assert moment == datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+    assert format_hh_date(moment) == "2024-05-01T09:00:00+0000"
+    assert parse_hh_date("вчера") is None
+    assert parse_hh_date(None) is None
+
+
+def test_watermark_only_moves_forward(state_path: str) -> None:
+    """Тестирует, что водяной знак — самая поздняя дата публикации и не уменьшается."""
+    state = SyncState(state_path)
+    assert state.watermark("Python") is None
+
+    late = datetime(2024, 5, 2, tzinfo=timezone.utc)
+    state.update("Python", {"1": late - timedelta(days=1), "2": late})
+    state.update("python", {"3": late - timedelta(days=3)})
+    assert state.watermark("  PYTHON ") == late
+    state.update("Java", {})
+    assert state.watermark("Java") is None
+
+
+def test_save_and_reload(state_path: str) -> None:
+    """Тестирует сохранение состояния и его загрузку новым экземпляром."""
+    state = SyncState(state_path)
+    moment = datetime(2024, 5, 2, tzinfo=timezone.utc)
+    state.update("Python", {"1": moment})
+    assert SyncState(state_path).watermark("Python") is None  # До save() на диске ничего нет
+
+    state.save()
+    reloaded = SyncState(state_path)
+    assert reloaded.watermark("Python") == moment
+    assert reloaded.published_at(1) == moment
+    assert list(Path(state_path).parent.glob("*.tmp")) == []
+
+
+def test_stale_ids_and_forget(state_path: str) -> None:
+    """Тестирует поиск вакансий, которые не публиковались дольше заданного срока."""
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    state = SyncState(state_path)
+    state.update("Python", {"old": now - timedelta(days=40), "fresh": now - timedelta(days=2)})
+    # Повторная публикация обновляет дату вакансии
+    state.update("Django", {"renewed": now - timedelta(days=1)})
+    state.update("Python", {"renewed": now - timedelta(days=50)})
+
+    assert state.stale_ids(30, now=now) == ["old"]
+    assert sorted(state.stale_ids(1.5, now=now)) == ["fresh", "old"]
+    state.forget(["old"])
+    assert state.stale_ids(30, now=now) == []
+
+
+def test_corrupt_state_is_reset(state_path: str, capsys: pytest.CaptureFixture) -> None:
+    """Тестирует, что повреждённый файл состояния приводит к полной синхронизации, а не к ошибке."""
+    Path(state_path).write_text("{oops", encoding="utf-8")
+    state = SyncState(state_path)
+    assert state.watermark("Python") is None
+    captured = capsys.readouterr()
+    assert "повреждено" in captured.err and captured.out == ""
@@ -1,10 +1,10 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import pytest
 
 from src.file_handler import JSONFileHandler
-from src.utils import save_vacancy_to_file
+from src.utils import save_vacancy_to_file, sort_vacancies
 
 
 @pytest.fixture
@@ -36,3 +36,33 @@ def test_save_vacancy_to_file(json_saver: JSONFileHandler) -> None:
     # Проверяем обработку некорректных данных
     with pytest.raises(ValueError, match="Вакансия должна содержать поле 'title'."):
         save_vacancy_to_file({"invalid": "data"}, json_saver)  # Передаем словарь без 'title'
+
+
+@pytest.fixture
+def unsorted_vacancies() -> List[Dict[str, Any]]:
+    """Фикстура с вакансиями с одинаковыми и отсутствующими зарплатами."""
+    return [
+        {"title": "Б", "salary": 100000},
+        {"title": "Без зарплаты", "salary": "Зарплата не указана"},
+        {"title": "В", "salary": 200000},
+        {"title": "А", "salary": 100000},
+        {"title": "Г", "salary": 50000.5},
+    ]
+
+
+def test_sort_vacancies_missing_salary_last(unsorted_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует порядок по зарплате, затем по названию, и вакансии без зарплаты в конце."""
+    assert [v["title"] for v in sort_vacancies(unsorted_vacancies)] == ["В", "А", "Б", "Г", "Без зарплаты"]
+    assert [v["title"] for v in sort_vacancies(unsorted_vacancies, reverse=False)] == [
+        "Г", "А", "Б", "В", "Без зарплаты"
+    ]
+
+
+def test_sort_vacancies_top_n_and_pages(unsorted_vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует top_n и постраничный вывод, в том числе для генератора."""
+    assert [v["title"] for v in sort_vacancies(iter(unsorted_vacancies), top_n=2)] == ["В", "А"]
+    assert [v["title"] for v in sort_vacancies((v for v in unsorted_vacancies), offset=2, limit=2)] == ["Б", "Г"]
+    assert [v["title"] for v in sort_vacancies(unsorted_vacancies, offset=4)] == ["Без зарплаты"]
+    assert sort_vacancies(unsorted_vacancies, top_n=0) == []
+    with pytest.raises(ValueError):
+        sort_vacancies(unsorted_vacancies, offset=-1)
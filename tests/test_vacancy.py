@@ -1,5 +1,6 @@
 import pytest
 
+from src.api_handler import parse_vacancies
 from src.file_handler import JSONFileHandler
 from src.vacancy import Vacancy
 
@@ -59,6 +60,11 @@ def test_vacancy_to_dict() -> None:
     assert vacancy_dict["link"] == "https://example.com/python-dev"
     assert vacancy_dict["salary"] == 100000
     assert vacancy_dict["description"] == "Требуется опыт работы с Python."
+    assert "id" not in vacancy_dict  # ID назначает хранилище
+
+    hh_vacancy = Vacancy("Python Developer", "https://hh.ru/vacancy/1", 100000, "Python", vacancy_id="1")
+    assert hh_vacancy.vacancy_id == "1"
+    assert hh_vacancy.to_dict()["id"] == "1"
 
 
 def test_validate_salary() -> None:
@@ -100,3 +106,76 @@ def test_vacancy_creation() -> None:
         description="Требуется знание машинного обучения.",
     )
     assert vacancy_none_salary._salary == "Зарплата не указана"
+
+
+def test_from_dicts_collects_errors() -> None:
+    """Тестирует пакетное создание вакансий: результат как у конструктора и ошибки по каждой записи."""
+    records = [
+        {"id": "1", "title": "Python", "link": "https://hh.ru/vacancy/1", "salary": 100000,
+         "description": "<b>Python</b>"},
+        {"title": "", "link": "https://hh.ru/vacancy/2", "salary": None, "description": "x"},
+        {"title": "Без ссылки", "salary": None, "description": "x"},
+        {"title": "Java", "link": "ftp://example.com", "salary": None, "description": "x"},
+        {"title": "SQL", "link": "https://hh.ru/vacancy/5", "salary": "Зарплата не указана", "description": ""},
+    ]
+    vacancies, errors = Vacancy.from_dicts(records)
+
+    expected = [
+        Vacancy("Python", "https://hh.ru/vacancy/1", 100000, "<b>Python</b>", vacancy_id="1"),
+        Vacancy("SQL", "https://hh.ru/vacancy/5", "Зарплата не указана", ""),
+    ]
+    assert [v.to_dict() for v in vacancies] == [v.to_dict() for v in expected]
+    assert errors == [
+        (1, "Название вакансии не может быть пустым."),
+        (2, "Отсутствует поле 'link'."),
+        (3, "Некорректная ссылка."),
+    ]
+
+    cleaned, _ = Vacancy.from_dicts(records[:1], clean=False)
+    assert cleaned[0].to_dict()["description"] == "<b>Python</b>"  # Очистка пропущена по запросу
+
+
+def test_from_api_items_matches_parse_vacancies() -> None:
+    """Тестирует, что вакансии из элементов API совпадают с путём parse_vacancies → Vacancy."""
+    items = [
+        {"id": "1", "name": "Python", "alternate_url": "https://hh.ru/vacancy/1", "salary": {"from": 150000},
+         "snippet": {"requirement": "<highlighttext>Python</highlighttext>"}},
+        {"id": "2", "name": "Java", "alternate_url": "https://hh.ru/vacancy/2", "salary": {"from": None, "to": 1},
+         "snippet": {"requirement": None}},
+        {"id": "3", "name": "Без ссылки", "salary": None, "snippet": {}},
+    ]
+    vacancies, errors = Vacancy.from_api_items(items)
+
+    expected = []
+    for record in parse_vacancies({"items": items}):
+        try:
+            expected.append(
+                Vacancy(
+                    record["title"], record["link"], record["salary"], record["description"], record["id"],
+                    salary_to=record.get("salary_to"), currency=record.get("currency"), gross=record.get("gross"),
+                )
+            )
+        except ValueError:
+            pass
+    assert [v.to_dict() for v in vacancies] == [v.to_dict() for v in expected]
+    assert errors == [(2, "Некорректная ссылка.")]
+
+
+def test_vacancy_salary_range_and_currency() -> None:
+    """Тестирует зарплату диапазоном: строкой, словарём API и отдельными полями с пересчётом в рубли."""
+    text = Vacancy("Python", "https://example.com/1", "100 000-150 000 руб.", "x")
+    assert (text.salary, text.salary_to, text.currency) == (100000, 150000, "RUR")
+    assert text.salary_rub == (100000, 150000)
+
+    api = Vacancy("Java", "https://example.com/2", {"from": None, "to": 2000, "currency": "USD", "gross": True}, "x")
+    assert (api.salary, api.salary_to, api.currency, api.gross) == (2000, 2000, "USD", True)
+    assert api.to_dict()["salary_to"] == 2000
+    assert "до вычета налогов" in str(api)
+
+    plain = Vacancy("SQL", "https://example.com/3", 90000, "x")
+    assert "salary_to" not in plain.to_dict()
+    assert plain < text and not plain > text
+
+    unknown = Vacancy("Go", "https://example.com/4", 1000, "x", currency="XXX")
+    assert unknown.salary_rub is None
+    assert not unknown < plain and not unknown > plain
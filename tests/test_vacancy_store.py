@@ -0,0 +1,87 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.file_handler import JSONFileHandler, JSONLinesFileHandler
+from src.vacancy_store import VacancyStore
+
+
+@pytest.fixture
+def vacancies() -> List[Dict[str, Any]]:
+    """Фикстура с вакансиями, в том числе без зарплаты и с дробной зарплатой."""
+    return [
+        {"title": "A", "link": "https://example.com/a", "salary": 150000, "description": "Python и Django",
+         "id": "1"},
+        {"title": "B", "link": "https://example.com/b", "salary": "Зарплата не указана", "description": "Python",
+         "id": "local-1"},
+        {"title": "C", "link": "https://example.com/c", "salary": 99999.5, "description": "Java, SQL", "id": "2"},
+        {"title": "D", "link": "https://example.com/d", "salary": 300000, "description": "PYTHON, sql", "id": "3"},
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["stdlib", "numpy"])
+def store(request: pytest.FixtureRequest, vacancies: List[Dict[str, Any]]) -> VacancyStore:
+    """Фикстура хранилища в обоих режимах; режим NumPy пропускается, если он не установлен."""
+    if request.param:
+        pytest.importorskip("numpy")
+    return VacancyStore.from_dicts(vacancies, use_numpy=request.param)
+
+
+def test_columns_and_round_trip(store: VacancyStore, vacancies: List[Dict[str, Any]]) -> None:
+    """Тестирует раскладку по столбцам и обратную сборку словарей."""
+    assert len(store) == 4
+    assert math.isnan(store.salaries[1])
+    assert store.salaries[2] == 99999.5
+    assert store.to_dicts() == vacancies
+
+
+def test_masks_and_filter(store: VacancyStore) -> None:
+    """Тестирует маски по зарплате и словам, их пересечение и сортировку."""
+    assert store.rows(store.salary_mask(100000, 300000)) == [0, 3]
+    assert store.rows(store.keyword_mask(["python"])) == [0, 1, 3]
+    assert store.rows(store.keyword_mask(["Python", "sql"], match_all=True)) == [3]
+    assert store.rows(store.keyword_mask([" "])) == [0, 1, 2, 3]
+    both = store.combine(store.keyword_mask(["sql", "django"]), store.salary_mask(0, 200000))
+    assert store.rows(both) == [0, 2]
+
+    assert store.argsort_salary() == [2, 0, 3, 1]
+    assert store.argsort_salary(descending=True) == [3, 0, 2, 1]
+    assert [v["title"] for v in store.filter(["python"], sort_by_salary="desc")] == ["D", "A", "B"]
+    assert [v["title"] for v in store.filter(salary_range=(0, 200000), sort_by_salary=True)] == ["C", "A"]
+
+
+def test_load_and_save_existing_formats(vacancies: List[Dict[str, Any]], tmp_path: Path) -> None:
+    """Тестирует загрузку из JSON и JSON Lines и сохранение в формате JSONFileHandler."""
+    json_path = tmp_path / "vacancies.json"
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(vacancies, file, ensure_ascii=False, indent=4)
+    expected_text = json_path.read_text(encoding="utf-8")
+
+    store = VacancyStore.from_json(str(json_path), use_numpy=False)
+    store.save_json(str(tmp_path / "copy.json"))
+    assert (tmp_path / "copy.json").read_text(encoding="utf-8") == expected_text
+
+    store.save_jsonl(str(tmp_path / "vacancies.jsonl"))
+    reloaded = VacancyStore.from_handler(JSONLinesFileHandler(str(tmp_path / "vacancies.jsonl")), use_numpy=False)
+    assert reloaded.to_dicts() == vacancies
+
+    VacancyStore(use_numpy=False).save_json(str(tmp_path / "empty.json"))
+    assert JSONFileHandler(str(tmp_path / "empty.json")).filter_vacancies([]) == []
+
+
+def test_salary_ranges_and_currency(store: VacancyStore) -> None:
+    """Тестирует диапазоны и валюту: маска по пересечению в рублях и сохранение исходных полей."""
+    ranged = [
+        {"title": "E", "link": "https://example.com/e", "salary": 1000, "salary_to": 2000, "currency": "USD",
+         "gross": True, "description": "Go", "id": "4"},
+        {"title": "F", "link": "https://example.com/f", "salary": 50000, "salary_to": 400000, "currency": "RUR",
+         "description": "Go", "id": "5"},
+    ]
+    for vacancy_data in ranged:
+        store.append(vacancy_data)
+    assert store.to_dicts()[4:] == ranged
+    assert store.rows(store.salary_mask(350000, 500000)) == [5]
+    assert store.rows(store.salary_mask(100000, 150000)) == [0, 4, 5]